@@ -0,0 +1,217 @@
+"""Async streaming answers for the RAG chat loop.
+
+    rag = StreamingRAG(vectorstore, embeddings, llm, chunks, k=3)
+    asyncio.run(chat(rag))
+
+Per question, embedding the query (an API round trip) runs concurrently
+with the local pre-work: `key:value` metadata filters are parsed from the
+question (e.g. `source:notes.txt`) and a keyword lookup runs over the
+chunks. The vector search follows, the two hit lists are merged by
+reciprocal rank, and the answer is streamed token by token. Questions are
+read in the background. A question typed while the previous answer is
+still printing has its retrieval started at once, so it is usually done
+by the time that answer ends. Each answer reports retrieval time,
+time-to-first-token and total latency, measured from when the question
+was entered.
+"""
+import asyncio
+import math
+import re
+import statistics
+import time
+from dataclasses import dataclass
+
+from local_embeddings import STOPWORDS
+
+ANSWER_TEMPLATE = """Use the following pieces of context to answer the question at the end. If you don't know the answer, just say that you don't know, don't try to make up an answer.
+
+{context}
+
+Question: {question}
+Helpful Answer:"""
+
+_TOKEN = re.compile(r"\w+")
+_FILTER = re.compile(r"\b(\w+):(\S+)")
+
+
+def _terms(text):
+    return [word for word in _TOKEN.findall(text.lower()) if word not in STOPWORDS]
+
+
+def parse_filters(question, keys):
+    """Pulls `key:value` metadata filters for known metadata keys out of the question."""
+    filters = {}
+
+    def take(match):
+        if match.group(1) not in keys:
+            return match.group(0)
+        filters[match.group(1)] = match.group(2)
+        return ""
+
+    return " ".join(_FILTER.sub(take, question).split()), filters
+
+
+class KeywordIndex:
+    """Inverted index with BM25 scoring over the chunks' text."""
+
+    def __init__(self, documents, k1=1.2, b=0.75):
+        self.documents = documents
+        self.k1, self.b = k1, b
+        self.postings = {}
+        self.lengths = []
+        self.metadata_keys = set()
+        for position, doc in enumerate(documents):
+            terms = _terms(doc.page_content)
+            self.lengths.append(len(terms))
+            self.metadata_keys.update(doc.metadata)
+            counts = {}
+            for term in terms:
+                counts[term] = counts.get(term, 0) + 1
+            for term, count in counts.items():
+                self.postings.setdefault(term, []).append((position, count))
+        self.average_length = sum(self.lengths) / len(self.lengths) if self.lengths else 0.0
+
+    def search(self, query, k=4, filters=None):
+        """Returns [(position, score)] of the best k chunks matching every filter."""
+        total = len(self.documents)
+        scores = {}
+        for term in set(_terms(query)):
+            postings = self.postings.get(term, ())
+            if not postings:
+                continue
+            idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for position, count in postings:
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[position] / self.average_length)
+                scores[position] = scores.get(position, 0.0) + idf * count * (self.k1 + 1) / (count + norm)
+        if filters:
+            scores = {
+                position: score for position, score in scores.items()
+                if all(str(self.documents[position].metadata.get(key)) == value for key, value in filters.items())
+            }
+        return sorted(scores.items(), key=lambda item: -item[1])[:k]
+
+
+def fuse(ranked_lists, k, constant=60):
+    """Reciprocal-rank fusion of several ranked Document lists, de-duplicated by text."""
+    scores, docs = {}, {}
+    for ranked in ranked_lists:
+        for rank, doc in enumerate(ranked):
+            docs.setdefault(doc.page_content, doc)
+            scores[doc.page_content] = scores.get(doc.page_content, 0.0) + 1.0 / (constant + rank + 1)
+    return [docs[text] for text in sorted(scores, key=lambda text: -scores[text])[:k]]
+
+
+def _write(text):
+    print(text, end="", flush=True)
+
+
+@dataclass
+class QueryTiming:
+    question: str
+    retrieval_ms: float
+    first_token_ms: float
+    total_ms: float
+    tokens: int
+
+
+class StreamingRAG:
+    def __init__(self, vectorstore, embeddings, llm, documents, k=3, template=ANSWER_TEMPLATE):
+        self.vectorstore = vectorstore
+        self.embeddings = embeddings
+        self.llm = llm
+        self.k = k
+        self.template = template
+        self.keywords = KeywordIndex(documents)
+
+    async def _search_by_vector(self, vector, filters):
+        kwargs = {}
+        if filters:
+            # Chroma's where-syntax: numeric metadata compares as numbers, several keys need $and
+            clauses = [{key: int(value) if value.isdigit() else value} for key, value in filters.items()]
+            kwargs["filter"] = clauses[0] if len(clauses) == 1 else {"$and": clauses}
+        search = getattr(self.vectorstore, "asimilarity_search_by_vector", None)
+        if search is not None:
+            return await search(vector, k=self.k, **kwargs)
+        return await asyncio.to_thread(self.vectorstore.similarity_search_by_vector, vector, self.k, **kwargs)
+
+    async def retrieve(self, question):
+        query, filters = parse_filters(question, self.keywords.metadata_keys)
+        # The embedding call is network-bound; the keyword lookup runs in a thread meanwhile
+        vector, lexical = await asyncio.gather(
+            self.embeddings.aembed_query(query),
+            asyncio.to_thread(self.keywords.search, query, self.k, filters),
+        )
+        semantic = await self._search_by_vector(vector, filters)
+        return fuse([semantic, [self.keywords.documents[position] for position, _ in lexical]], self.k)
+
+    async def _timed_retrieve(self, question):
+        docs = await self.retrieve(question)
+        return docs, time.perf_counter()
+
+    def start(self, question):
+        """Starts retrieval in the background; hand the result to answer(pending=...)."""
+        return asyncio.ensure_future(self._timed_retrieve(question))
+
+    def prompt(self, question, docs):
+        return self.template.format(context="\n\n".join(doc.page_content for doc in docs), question=question)
+
+    async def answer(self, question, pending=None, submitted=None, write=_write):
+        """Streams the answer through `write`; `pending` is a retrieval already begun with start()."""
+        submitted = submitted or time.perf_counter()
+        docs, retrieved = await (pending or self._timed_retrieve(question))
+        first_token, tokens = None, 0
+        async for chunk in self.llm.astream(self.prompt(question, docs)):
+            text = getattr(chunk, "content", chunk)
+            if not text:
+                continue
+            if first_token is None:
+                first_token = time.perf_counter()
+            tokens += 1
+            write(text)
+        done = time.perf_counter()
+        return QueryTiming(
+            question=question,
+            retrieval_ms=(retrieved - submitted) * 1000,
+            first_token_ms=((first_token or done) - submitted) * 1000,
+            total_ms=(done - submitted) * 1000,
+            tokens=tokens,
+        )
+
+
+async def chat(rag, read_line=input, exit_words=("exit", "quit")):
+    """Interactive loop; questions entered while an answer streams are retrieved right away."""
+    questions = asyncio.Queue()
+
+    async def reader():
+        while True:
+            try:
+                line = await asyncio.to_thread(read_line)
+            except EOFError:
+                break
+            if line.strip().lower() in exit_words:
+                break
+            if line.strip():
+                questions.put_nowait((line.strip(), time.perf_counter(), rag.start(line.strip())))
+        questions.put_nowait(None)
+
+    print("Ask me anything about your docs (type 'exit' to quit):")
+    print("\n> ", end="", flush=True)
+    reading = asyncio.ensure_future(reader())
+    timings = []
+    while True:
+        item = await questions.get()
+        if item is None:
+            break
+        question, submitted, pending = item
+        print("\n📘 Answer:")
+        timing = await rag.answer(question, pending, submitted)
+        timings.append(timing)
+        print(f"\n[retrieval {timing.retrieval_ms:.0f} ms | first token {timing.first_token_ms:.0f} ms | "
+              f"total {timing.total_ms / 1000:.2f} s]")
+        print("\n> ", end="", flush=True)
+    await reading
+    if timings:
+        first = [t.first_token_ms for t in timings]
+        print(f"\n{len(timings)} answers: mean first token {statistics.mean(first):.0f} ms, "
+              f"mean total {statistics.mean(t.total_ms for t in timings) / 1000:.2f} s")
+    return timings
@@ -1,44 +1,130 @@
-from langchain_community.document_loaders import PyMuPDFLoader, WebBaseLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.embeddings import OpenAIEmbeddings
-from langchain_community.vectorstores import Chroma
-from langchain_community.chat_models import ChatOpenAI
-from langchain.chains import RetrievalQA
 from dotenv import load_dotenv
+import argparse
+import functools
+import hashlib
+import json
 import os
 
+from chunk_dedup import dedup_documents
+from pdf_extract import ParallelPDFLoader
+from web_cache import CachedWebLoader
+
 # Load API keys
 load_dotenv()
 openai_api_key = os.getenv("OPENAI_API_KEY")
 
-# Load PDF document
-pdf_docs = PyMuPDFLoader("logic_test_hc.pdf").load()
-print(f"PDF Content: {pdf_docs}")  # Debug PDF content
-
-# Load website content
-web_docs = WebBaseLoader(["https://www.geeksforgeeks.org/architecture-of-8085-microprocessor/"]).load()
-print(f"Website Content: {web_docs}")  # Debug website content
-
-# Combine documents
-all_docs = pdf_docs + web_docs
-print(f"Loaded {len(all_docs)} documents.")  # Debug loaded documents
-
-# Split and embed
-splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
-docs = splitter.split_documents(all_docs)
-print(f"Created {len(docs)} document chunks.")  # Debug document chunks
-
-# Embed and store in vector database
-embedding_model = OpenAIEmbeddings()
-vectorstore = Chroma.from_documents(docs, embedding=embedding_model)
-print("Vectorstore initialized with embeddings.")  # Debug vectorstore
-
-# Create retriever and QA chain
-retriever = vectorstore.as_retriever(search_kwargs={"k": 3})
-qa = RetrievalQA.from_chain_type(llm=ChatOpenAI(model='gpt-4o-mini', temperature=0), retriever=retriever)
-
-# Query the documents
-query = "How much bits of register does the website talk about?"
-response = qa.invoke({"query": query})  # Use invoke instead of run
-result = response.get("result", "No answer found.")  # Safely extract the result
-print(f"\n📘 Answer:\n{result}")
+PDF_PATH = "logic_test_hc.pdf"
+WEB_URLS = ["https://www.geeksforgeeks.org/architecture-of-8085-microprocessor/"]
+PERSIST_DIR = ".chroma_multi_source"
+
+def _file_sha256(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def _load_index_manifest(persist_dir):
+    path = os.path.join(persist_dir, "sources.json")
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+def _save_index_manifest(persist_dir, manifest):
+    os.makedirs(persist_dir, exist_ok=True)
+    with open(os.path.join(persist_dir, "sources.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+def _chroma_shard(persist_dir, shard_id):
+    from langchain_community.embeddings import OpenAIEmbeddings
+    from langchain_community.vectorstores import Chroma
+    return Chroma(collection_name=f"shard_{shard_id}", persist_directory=persist_dir, embedding_function=OpenAIEmbeddings())
+
+def build_qa_chain(pdf_path=PDF_PATH, urls=WEB_URLS, offline=False, persist_dir=PERSIST_DIR, dedup_threshold=0.85, shards=1):
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+    from langchain_community.embeddings import OpenAIEmbeddings
+    from langchain_community.vectorstores import Chroma
+    from langchain_community.chat_models import ChatOpenAI
+    from langchain.chains import RetrievalQA
+    from langchain_core.documents import Document
+    # sharded_index pulls in langchain_core.retrievers, so it is imported here rather than for --help
+    from sharded_index import ShardedRetriever, ShardedVectorStore
+    from rate_limiter import scheduler_rate_limiter
+
+    # The index persists between runs; only sources whose content changed are re-embedded
+    embedding_model = OpenAIEmbeddings()
+    if shards > 1:
+        # One Chroma collection per shard, partitioned by source, so a changed source re-embeds into one shard.
+        # Each shard count gets its own directory and manifest, since changing it moves sources between shards.
+        persist_dir = os.path.join(persist_dir, f"{shards}_shards")
+        vectorstore = ShardedVectorStore(functools.partial(_chroma_shard, persist_dir), shards, embedding_model)
+    else:
+        vectorstore = Chroma(persist_directory=persist_dir, embedding_function=embedding_model)
+    indexed = _load_index_manifest(persist_dir)
+    changed_docs = []
+
+    # Load PDF document, unless this exact file is already indexed
+    pdf_sha = _file_sha256(pdf_path)
+    if indexed.get(pdf_path) != pdf_sha:
+        # Pages are extracted across all cores and cached per (file hash, page)
+        pdf_docs = ParallelPDFLoader(pdf_path).load()
+        print(f"PDF Content: {pdf_docs}")  # Debug PDF content
+        changed_docs.append((pdf_path, pdf_sha, pdf_docs))
+
+    # Load website content through the conditional-GET cache; a 304 skips parsing and embedding
+    loader = CachedWebLoader(urls, offline=offline)
+    for result in loader.fetch_all():
+        if result.url in indexed and not result.changed:
+            continue
+        web_doc = Document(page_content=result.text, metadata={"source": result.url, "title": result.title})
+        print(f"Website Content: {web_doc}")  # Debug website content
+        changed_docs.append((result.url, hashlib.sha256(result.text.encode("utf-8")).hexdigest(), [web_doc]))
+    print(f"Web sources: {loader.stats}")
+
+    # Split changed sources, replacing their previous chunks
+    splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
+    docs = []
+    for source, digest, source_docs in changed_docs:
+        if shards > 1:
+            vectorstore.delete_source(source)
+        else:
+            stale_ids = vectorstore.get(where={"source": source})["ids"]
+            if stale_ids:
+                vectorstore.delete(stale_ids)
+        docs.extend(splitter.split_documents(source_docs))
+        indexed[source] = digest
+    print(f"Created {len(docs)} document chunks.")  # Debug document chunks
+
+    # Collapse exact and near-duplicate chunks (boilerplate, overlaps) before paying to embed them.
+    # Only within a source: chunks are replaced per source, so a chunk kept for one source must not
+    # stand in for another's text that would then vanish when the first source changes.
+    if dedup_threshold and docs:
+        docs, report = dedup_documents(docs, threshold=dedup_threshold, within="source")
+        print(report)
+    if docs:
+        vectorstore.add_documents(docs)
+    _save_index_manifest(persist_dir, indexed)
+    print(f"Vectorstore ready: {len(changed_docs)} sources re-embedded, {len(indexed) - len(changed_docs)} reused.")
+
+    # Create retriever and QA chain
+    if shards > 1:
+        retriever = ShardedRetriever(store=vectorstore, k=3)
+    else:
+        retriever = vectorstore.as_retriever(search_kwargs={"k": 3})
+    return RetrievalQA.from_chain_type(llm=ChatOpenAI(model='gpt-4o-mini', temperature=0, rate_limiter=scheduler_rate_limiter("openai")), retriever=retriever)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Answer a question over a PDF and a web page.")
+    parser.add_argument("--query", default="How much bits of register does the website talk about?")
+    parser.add_argument("--offline", action="store_true", help="Serve web sources from the local cache without network access.")
+    parser.add_argument("--dedup-threshold", type=float, default=0.85, help="MinHash Jaccard threshold for collapsing chunks; 0 disables.")
+    parser.add_argument("--shards", type=int, default=1, help="Split the index into this many Chroma collections searched in parallel.")
+    args = parser.parse_args(argv)
+
+    qa = build_qa_chain(offline=args.offline, dedup_threshold=args.dedup_threshold, shards=args.shards)
+
+    # Query the documents
+    response = qa.invoke({"query": args.query})  # Use invoke instead of run
+    result = response.get("result", "No answer found.")  # Safely extract the result
+    print(f"\n📘 Answer:\n{result}")
+
+if __name__ == "__main__":
+    main()
@@ -1,39 +1,74 @@
 import os
+import argparse
+import asyncio
+from functools import lru_cache
 from dotenv import load_dotenv
-from langchain_community.document_loaders import TextLoader
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_openai import OpenAIEmbeddings, ChatOpenAI
-from langchain_community.vectorstores import Chroma
-from langchain.chains import RetrievalQA
 
+from chunk_store import ChunkStore
 
 # Load API keys
 load_dotenv()
 openai_api_key = os.getenv("OPENAI_API_KEY")
 
-# Load your documents
-loader = TextLoader("./sample_meeting.txt")  # or PDFLoader, etc.
-docs = loader.load()
-
-# Split the docs into chunks
-splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=100)
-chunks = splitter.split_documents(docs)
-
-# Embed and store in vector database (Chroma)
-embedding_model = OpenAIEmbeddings()
-vectorstore = Chroma.from_documents(chunks, embedding_model)
-
-# Create the retrieval-based QA chain
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
-retriever = vectorstore.as_retriever(search_kwargs={"k": 3})
-qa_chain = RetrievalQA.from_chain_type(llm, retriever=retriever)
-
-# Main loop
-print("Ask me anything about your docs (type 'exit' to quit):")
-while True:
-    query = input("\n> ")
-    if query.lower() in ['exit', 'quit']:
-        break
-    answer = qa_chain.invoke(query)
-    result = answer.get("result", answer)
-    print(f"\n📘 Answer:\n{result}")
+# The index is built on the first question, so the prompt shows up immediately
+@lru_cache(maxsize=None)
+def get_index(source_path="./sample_meeting.txt"):
+    from langchain_community.document_loaders import TextLoader
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+    from langchain_openai import OpenAIEmbeddings
+    from langchain_community.vectorstores import Chroma
+
+    # Load your documents
+    loader = TextLoader(source_path)  # or PDFLoader, etc.
+    docs = loader.load()
+
+    # Split the docs into chunks. The index lives for the whole session, so chunks are kept as offsets
+    # into each source's text; Documents are built only while embedding and for the hits of a search.
+    splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=100)
+    chunks = ChunkStore.from_documents(docs, splitter).lazy_documents()
+
+    # Embed and store in vector database (Chroma)
+    embedding_model = OpenAIEmbeddings()
+    vectorstore = Chroma.from_documents(chunks, embedding_model)
+    return vectorstore, embedding_model, chunks
+
+@lru_cache(maxsize=None)
+def get_llm():
+    from langchain_openai import ChatOpenAI
+    from rate_limiter import scheduler_rate_limiter
+    return ChatOpenAI(model="gpt-4o-mini", temperature=0, rate_limiter=scheduler_rate_limiter("openai"))
+
+@lru_cache(maxsize=None)
+def get_qa_chain(source_path="./sample_meeting.txt"):
+    from langchain.chains import RetrievalQA
+
+    # Create the retrieval-based QA chain
+    vectorstore, _, _ = get_index(source_path)
+    llm = get_llm()
+    retriever = vectorstore.as_retriever(search_kwargs={"k": 3})
+    return RetrievalQA.from_chain_type(llm, retriever=retriever)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ask questions about a local document.")
+    parser.add_argument("source", nargs="?", default="./sample_meeting.txt", help="Text file to index.")
+    parser.add_argument("--stream", action="store_true", help="Stream answers and report time-to-first-token per question.")
+    args = parser.parse_args(argv)
+
+    if args.stream:
+        from async_rag import StreamingRAG, chat
+        vectorstore, embedding_model, chunks = get_index(args.source)
+        asyncio.run(chat(StreamingRAG(vectorstore, embedding_model, get_llm(), chunks, k=3)))
+        return
+
+    # Main loop
+    print("Ask me anything about your docs (type 'exit' to quit):")
+    while True:
+        query = input("\n> ")
+        if query.lower() in ['exit', 'quit']:
+            break
+        answer = get_qa_chain(args.source).invoke(query)
+        result = answer.get("result", answer)
+        print(f"\n📘 Answer:\n{result}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Resumable JSONL batch mode for the LCEL chains.
+
+Each input line is a JSON object with an `id` and the chain's input
+variables (or an `input` object holding them). Results are appended to the
+output JSONL in completion order and every finished ID is recorded in a
+checkpoint file, so a restarted run skips what is already done.
+
+A line that is not a JSON object gets an error record (its id is the line
+number) instead of stopping the batch. Failed items are retried on the next
+run, so until a run finishes the output can hold an earlier error record and
+a later result for the same id: the last record per id is the one that
+counts. A run that finishes rewrites the output down to those.
+
+    python tweet_chain.py --batch inputs.jsonl --output tweets.jsonl --concurrency 32
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+
+
+class InvalidLine:
+    def __init__(self, line_number, error):
+        self.id = str(line_number)
+        self.error = f"line {line_number}: {error}"
+
+
+def read_jsonl(path):
+    """Yields each line's object, or an InvalidLine for a line that does not hold one."""
+    with open(path, "r") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield InvalidLine(line_number, f"invalid JSON: {e}")
+                continue
+            if not isinstance(record, dict):
+                yield InvalidLine(line_number, f"expected a JSON object, got {type(record).__name__}")
+                continue
+            record.setdefault("id", str(line_number))
+            yield record
+
+
+def load_checkpoint(path):
+    if not os.path.exists(path):
+        return set()
+    with open(path, "r") as f:
+        return {line.rstrip("\n") for line in f if line.strip()}
+
+
+def compact_output(path):
+    """Rewrites the output JSONL keeping only the last record for each id; returns how many were dropped."""
+    last, lines = {}, 0
+    with open(path, "r") as f:
+        for position, line in enumerate(f):
+            lines += 1
+            if line.strip():
+                last[str(json.loads(line)["id"])] = position
+    keep = set(last.values())
+    if len(keep) == lines:
+        return 0
+    tmp_path = path + ".tmp"
+    with open(path, "r") as f, open(tmp_path, "w") as out:
+        out.writelines(line for position, line in enumerate(f) if position in keep)
+    os.replace(tmp_path, path)
+    return lines - len(keep)
+
+
+def _output_value(result):
+    content = getattr(result, "content", None)
+    return content if content is not None else result
+
+
+class BatchStats:
+    def __init__(self, report_every=10.0):
+        self.started = time.perf_counter()
+        self.done = 0
+        self.failed = 0
+        self.skipped = 0
+        self.report_every = report_every
+        self.last_report = self.started
+
+    @property
+    def rate(self):
+        elapsed = time.perf_counter() - self.started
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+    def maybe_report(self):
+        now = time.perf_counter()
+        if now - self.last_report >= self.report_every:
+            self.last_report = now
+            print(f"[batch] {self.done} done, {self.failed} failed, {self.rate:.2f} items/sec", file=sys.stderr)
+
+
+async def run_batch(chain, input_path, output_path, checkpoint_path=None, concurrency=16, report_every=10.0):
+    """Runs `chain.ainvoke` over every unfinished input with at most `concurrency` in flight."""
+    checkpoint_path = checkpoint_path or output_path + ".checkpoint"
+    finished = load_checkpoint(checkpoint_path)
+    stats = BatchStats(report_every)
+
+    records = iter(read_jsonl(input_path))
+    with open(output_path, "a") as out, open(checkpoint_path, "a") as checkpoint:
+
+        def next_record():
+            for record in records:
+                if isinstance(record, InvalidLine):
+                    stats.failed += 1
+                    out.write(json.dumps({"id": record.id, "error": record.error}) + "\n")
+                    out.flush()
+                    continue
+                if str(record["id"]) in finished:
+                    stats.skipped += 1
+                    continue
+                return record
+            return None
+
+        async def worker():
+            # Workers pull lines lazily, so 100k-line inputs never sit in memory
+            while True:
+                record = next_record()
+                if record is None:
+                    return
+                item_id = str(record["id"])
+                payload = record.get("input", {k: v for k, v in record.items() if k != "id"})
+                try:
+                    result = await chain.ainvoke(payload)
+                except Exception as e:
+                    stats.failed += 1
+                    # Not checkpointed, so the next run retries it
+                    out.write(json.dumps({"id": item_id, "error": str(e)}) + "\n")
+                    out.flush()
+                    continue
+                out.write(json.dumps({"id": item_id, "output": _output_value(result)}) + "\n")
+                out.flush()
+                checkpoint.write(item_id + "\n")
+                checkpoint.flush()
+                stats.done += 1
+                stats.maybe_report()
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    # Drops the error records of items this run retried successfully
+    compact_output(output_path)
+
+    print(
+        f"[batch] finished: {stats.done} done, {stats.failed} failed, {stats.skipped} skipped "
+        f"(already checkpointed), {stats.rate:.2f} items/sec",
+        file=sys.stderr,
+    )
+    return stats
+
+
+def add_batch_arguments(parser):
+    parser.add_argument("--batch", metavar="INPUT_JSONL", help="Run over every line of a JSONL file instead of a single input.")
+    parser.add_argument("--output", metavar="OUTPUT_JSONL", help="Where batch results are appended (default: <input>.out.jsonl).")
+    parser.add_argument("--checkpoint", help="File of completed IDs (default: <output>.checkpoint).")
+    parser.add_argument("--concurrency", type=int, default=16, help="Maximum chain invocations in flight.")
+
+
+def run_from_args(chain, args):
+    output = args.output or os.path.splitext(args.batch)[0] + ".out.jsonl"
+    return asyncio.run(run_batch(chain, args.batch, output, args.checkpoint, args.concurrency))
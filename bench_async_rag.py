@@ -0,0 +1,134 @@
+"""Time-to-first-token: blocking RetrievalQA-style loop vs async streaming chat.
+
+Retrieval is real: hashing embeddings, an in-memory index and the keyword
+index over the synthetic meeting minutes from bench_retrieval_sweep. Network
+latency is simulated. The query embedding call sleeps --embed-ms, and the
+stub chat model waits --first-token-ms before streaming --answer-tokens at
+--tokens-per-s. Questions arrive every --gaps seconds, as if typed while the
+previous answer is still being read. With a gap shorter than an answer,
+questions queue up. Latencies count from when a question is entered.
+
+    python bench_async_rag.py --questions 12 --gaps 3.0 1.0
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import statistics
+import time
+
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from async_rag import StreamingRAG, chat
+from bench_retrieval_sweep import synthetic_workload
+from local_embeddings import HashingEmbeddings, InMemoryIndex
+
+
+class SlowEmbeddings(HashingEmbeddings):
+    def __init__(self, delay):
+        super().__init__()
+        self.delay = delay
+
+    def embed_query(self, text):
+        time.sleep(self.delay)
+        return super().embed_query(text)
+
+    async def aembed_query(self, text):
+        await asyncio.sleep(self.delay)
+        return super().embed_query(text)
+
+
+class StubChunk:
+    def __init__(self, content):
+        self.content = content
+
+
+class StubChatModel:
+    def __init__(self, first_token_s, tokens, tokens_per_s):
+        self.first_token_s = first_token_s
+        self.tokens = tokens
+        self.tokens_per_s = tokens_per_s
+
+    def invoke(self, prompt):
+        time.sleep(self.first_token_s + self.tokens / self.tokens_per_s)
+        return StubChunk("word " * self.tokens)
+
+    async def astream(self, prompt):
+        start = time.perf_counter()
+        for position in range(self.tokens):
+            # Sleep to each token's due time, so scheduler overhead does not accumulate
+            await asyncio.sleep(max(0.0, start + self.first_token_s + position / self.tokens_per_s - time.perf_counter()))
+            yield StubChunk("word ")
+        await asyncio.sleep(max(0.0, start + self.first_token_s + self.tokens / self.tokens_per_s - time.perf_counter()))
+
+
+def percentile(values, q):
+    return sorted(values)[int(q * (len(values) - 1))]
+
+
+def run_blocking(index, embeddings, llm, questions, gap, k):
+    """The current loop: embed, search, wait for the full completion, print, then read the next line."""
+    first_tokens, totals = [], []
+    start = time.perf_counter()
+    for position, question in enumerate(questions):
+        submitted = start + position * gap
+        # A line typed ahead sits in the terminal buffer until input() is called again
+        time.sleep(max(0.0, submitted - time.perf_counter()))
+        docs = index.similarity_search_by_vector(embeddings.embed_query(question), k)
+        llm.invoke("\n\n".join(doc.page_content for doc in docs) + question)
+        done = time.perf_counter()
+        first_tokens.append(done - submitted)  # nothing is shown until the whole answer is back
+        totals.append(done - submitted)
+    return first_tokens, totals
+
+
+def run_async(index, embeddings, llm, chunks, questions, gap, k):
+    rag = StreamingRAG(index, embeddings, llm, chunks, k=k)
+    pending = iter(questions)
+    start = time.perf_counter()
+    arrivals = iter(range(len(questions) + 1))
+
+    def read_line():
+        position = next(arrivals)
+        time.sleep(max(0.0, start + position * gap - time.perf_counter()))
+        return next(pending, "exit")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        timings = asyncio.run(chat(rag, read_line=read_line))
+    return [t.first_token_ms / 1000 for t in timings], [t.total_ms / 1000 for t in timings]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare blocking and streaming RAG chat latency.")
+    parser.add_argument("--questions", type=int, default=12)
+    parser.add_argument("--gaps", type=float, nargs="+", default=[3.0, 1.0], help="Seconds between questions being entered.")
+    parser.add_argument("--embed-ms", type=float, default=150.0)
+    parser.add_argument("--first-token-ms", type=float, default=400.0)
+    parser.add_argument("--answer-tokens", type=int, default=60)
+    parser.add_argument("--tokens-per-s", type=float, default=80.0)
+    parser.add_argument("--k", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    docs, labeled = synthetic_workload()
+    chunks = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=100).split_documents(docs)
+    embeddings = SlowEmbeddings(args.embed_ms / 1000)
+    index = InMemoryIndex(embeddings)
+    index.add_documents(chunks)
+    questions = [item["question"] for item in labeled[:args.questions]]
+    llm = StubChatModel(args.first_token_ms / 1000, args.answer_tokens, args.tokens_per_s)
+    print(f"{len(chunks)} chunks, {len(questions)} questions, "
+          f"answers take {args.first_token_ms / 1000 + args.answer_tokens / args.tokens_per_s:.2f}s to generate")
+
+    print(f"{'gap s':>6} {'mode':16} {'TTFT mean s':>12} {'TTFT p95 s':>11} {'total mean s':>13} {'total p95 s':>12}")
+    for gap in args.gaps:
+        results = [
+            ("blocking", *run_blocking(index, embeddings, llm, questions, gap, args.k)),
+            ("async streaming", *run_async(index, embeddings, llm, chunks, questions, gap, args.k)),
+        ]
+        for label, first, total in results:
+            print(f"{gap:>6.1f} {label:16} {statistics.mean(first):>12.2f} {percentile(first, 0.95):>11.2f} "
+                  f"{statistics.mean(total):>13.2f} {percentile(total, 0.95):>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""Duplicate checks before scheduling: blind inserts vs full calendar scans vs the synced local index.
+
+A fake Calendar holds --events existing events. A series of meetings each
+schedules one follow-up, and every strategy sees the same calendar and
+the same sequence. Between meetings other clients add and delete events.
+The meetings come in three kinds:
+
+- new: a follow-up with its own topic and description
+- re-run (--repeat-share): an earlier meeting processed again. The title
+  is reworded and the start is up to 30 minutes off. Half carry the
+  meeting's source key, as the pipelines set it. Half have none, like
+  v3's CalendarCreateEvent, and must be matched on content.
+- generic (--generic-share): a different meeting whose follow-up is just
+  "Follow-up Meeting" / "Let's follow up on Thursday.", at the same
+  default 10:00 as an earlier generic one. Skipping it is a wrong skip.
+
+The strategies:
+
+- blind: insert every time (what the pipelines did before)
+- title overlap: the first index matcher, shared words over the shorter title
+  (compared linearly here, so its check µs says nothing about the index)
+- full scan: list the whole calendar, then apply the index's matching rule
+- index: EventIndex, an incremental sync plus a local lookup per meeting
+
+The fake answers instantly. API time is therefore requests × --latency-ms,
+and "check µs" is the measured local comparison per meeting. For the
+index, the local cost of each incremental sync (applying changes and
+rewriting the JSON file) is reported on its own line.
+
+    python bench_calendar_sync.py --events 20000 --meetings 40
+"""
+import argparse
+import datetime
+import os
+import random
+import re
+import tempfile
+import time
+from zoneinfo import ZoneInfo
+
+from calendar_sync import DEFAULT_WINDOW, EventIndex, content_words, event_source, event_start, match_score, with_source
+from fake_calendar import FakeCalendarService
+from google_services import insert_event
+
+TOPICS = ["Campaign launch", "Budget", "Hiring plan", "Q3 roadmap", "Vendor contract", "Design system", "Pricing",
+          "Onboarding flow", "Data retention", "Partner program", "Office move", "Security audit"]
+REWORDINGS = ["{} follow-up", "Follow-up: {}", "{} meeting", "{} sync", "Re: {}"]
+
+
+def _body(title, start, description=""):
+    return {"summary": title, "description": description, "start": {"dateTime": start.isoformat()},
+            "end": {"dateTime": (start + datetime.timedelta(hours=1)).isoformat()}}
+
+
+def make_calendar(n_events, now, seed):
+    rng = random.Random(seed)
+    service = FakeCalendarService()
+    for i in range(n_events):
+        start = now + datetime.timedelta(minutes=rng.randrange(-20 * 24 * 60, 60 * 24 * 60))
+        service.events().insert(body=_body(f"Standup {i}", start)).execute()
+    service.requests.clear()
+    return service
+
+
+def make_meetings(n_meetings, repeat_share, generic_share, now, seed):
+    """Returns [(kind, body, source)] where kind is "new", "re-run" or "generic"."""
+    rng = random.Random(seed)
+    meetings, originals = [], []
+    generic_day = now.replace(hour=10, minute=0, second=0) + datetime.timedelta(days=3)
+    for i in range(n_meetings):
+        roll = rng.random()
+        if originals and roll < repeat_share:
+            title, start, description, source = rng.choice(originals)
+            body = _body(rng.choice(REWORDINGS).format(title), start + datetime.timedelta(minutes=rng.randrange(-30, 31)), description)
+            meetings.append(("re-run", body, source if rng.random() < 0.5 else None))
+        elif roll < repeat_share + generic_share:
+            meetings.append(("generic", _body("Follow-up Meeting", generic_day, "Let's follow up on Thursday."), f"meeting-{i}"))
+        else:
+            topic = f"{TOPICS[i % len(TOPICS)]} {'ABCDEFGH'[i // len(TOPICS) % 8]}"
+            start = now.replace(minute=0, second=0) + datetime.timedelta(days=rng.randrange(1, 30), hours=rng.randrange(0, 8))
+            description = f"Let's follow up on the {topic.lower()} {rng.choice(['numbers', 'draft', 'owners', 'timeline'])} next week."
+            originals.append((topic, start, description, f"meeting-{i}"))
+            meetings.append(("new", _body(topic, start, description), f"meeting-{i}"))
+    return meetings
+
+
+def churn(service, rng, now, changes):
+    """Other clients' edits between meetings."""
+    for _ in range(changes):
+        live = [e for e in service._events.values() if e.get("status") != "cancelled" and e["summary"].startswith("Standup")]
+        if rng.random() < 0.5 and live:
+            service.events().delete(eventId=rng.choice(live)["id"]).execute()
+        else:
+            start = now + datetime.timedelta(minutes=rng.randrange(0, 60 * 24 * 60))
+            service.events().insert(body=_body(f"Standup x{rng.random():.6f}", start)).execute()
+
+
+_OLD_FILLER = frozenset("meeting meetings call sync session the a an with on for of and to re".split())
+
+
+def title_overlap(a, b):
+    """The matcher this index started with: shared words over the shorter title's word count."""
+    words_a, words_b = ({w for w in re.findall(r"\w+", t.lower()) if w not in _OLD_FILLER} for t in (a, b))
+    return len(words_a & words_b) / min(len(words_a), len(words_b)) if words_a and words_b else 0.0
+
+
+def scan_duplicate(service, body, source, tz):
+    """The slow way: page through every event, then compare each one locally."""
+    events, page_token = [], None
+    since = (datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=30)).isoformat()
+    while True:
+        response = service.events().list(pageToken=page_token, timeMin=since, singleEvents=True, maxResults=250).execute()
+        events += response.get("items", [])
+        page_token = response.get("nextPageToken")
+        if not page_token:
+            break
+    t0 = time.perf_counter()
+    start = event_start(body, tz)
+    title_words, description_words = content_words(body["summary"]), content_words(body["description"])
+    found = None
+    for event in events:
+        other = event_start(event, tz)
+        if other is None or abs(other - start) > DEFAULT_WINDOW:
+            continue
+        if source and event_source(event):
+            same = event_source(event) == source
+        else:
+            same = match_score(title_words, description_words, content_words(event.get("summary")),
+                               content_words(event.get("description"))) is not None
+        if same:
+            found = event
+            break
+    return found, time.perf_counter() - t0
+
+
+def run(strategy, args, now, tz):
+    service = make_calendar(args.events, now, args.seed)
+    meetings = make_meetings(args.meetings, args.repeat_share, args.generic_share, now, args.seed + 1)
+    rng = random.Random(args.seed + 2)
+    index = None
+    setup_requests = 0
+    if strategy in ("index", "title overlap"):
+        path = os.path.join(tempfile.mkdtemp(), "index.json")
+        index = EventIndex(path, service=service, tz=tz)
+        index.sync()
+        setup_requests = sum(service.requests.values())
+    service.requests.clear()
+    dupes = wrong_skips = 0
+    check_s = sync_s = 0.0
+    for kind, body, source in meetings:
+        if source:
+            body = with_source(body, source)
+        # Other clients' writes are not part of the strategy's request count
+        before = service.requests.copy()
+        churn(service, rng, now, args.churn)
+        service.requests = before
+        if strategy == "blind":
+            existing = None
+        elif strategy == "full scan":
+            existing, seconds = scan_duplicate(service, body, source, tz)
+            check_s += seconds
+        else:
+            t0 = time.perf_counter()
+            index.sync()
+            t1 = time.perf_counter()
+            start = event_start(body, tz)
+            if strategy == "index":
+                existing = index.find_duplicate(body["summary"], start, description=body["description"], source=source)
+            else:
+                existing = next((
+                    entry for entry in index.events.values()
+                    if abs(datetime.datetime.fromisoformat(entry["start"]) - start) <= DEFAULT_WINDOW
+                    and title_overlap(body["summary"], entry["summary"]) >= 0.6
+                ), None)
+            check_s += time.perf_counter() - t1
+            sync_s += t1 - t0
+        if existing is None:
+            created = insert_event(body, service=service)
+            if index is not None:
+                index.record(created)
+        dupes += existing is None and kind == "re-run"
+        wrong_skips += existing is not None and kind != "re-run"
+    return {
+        "requests": dict(service.requests), "setup": setup_requests, "dupes": dupes, "wrong_skips": wrong_skips,
+        "check_us": check_s / len(meetings) * 1e6, "sync_ms": sync_s / len(meetings) * 1e3,
+        "kinds": {kind: sum(1 for m in meetings if m[0] == kind) for kind in ("new", "re-run", "generic")},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare duplicate-check strategies against a fake Calendar.")
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--meetings", type=int, default=40)
+    parser.add_argument("--repeat-share", type=float, default=0.4)
+    parser.add_argument("--generic-share", type=float, default=0.2, help="Different meetings with a generic follow-up at 10:00.")
+    parser.add_argument("--churn", type=int, default=5, help="Changes by other clients between meetings.")
+    parser.add_argument("--latency-ms", type=float, default=100.0, help="Assumed Calendar API round trip.")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    tz = "Asia/Jakarta"
+    now = datetime.datetime.now(ZoneInfo(tz)).replace(microsecond=0)
+    print(f"{args.events} events, {args.meetings} meetings, {args.latency_ms:.0f} ms/request")
+    header_printed = False
+    for strategy in ("blind", "title overlap", "full scan", "index"):
+        result = run(strategy, args, now, tz)
+        if not header_printed:
+            print(", ".join(f"{count} {kind}" for kind, count in result["kinds"].items()))
+            print(f"{'strategy':13} {'list':>6} {'insert':>7} {'API s/meeting':>14} {'check µs':>10} {'duplicates':>11} {'wrong skips':>12}")
+            header_printed = True
+        requests = result["requests"]
+        api_s = sum(requests.values()) * args.latency_ms / 1000 / args.meetings
+        print(f"{strategy:13} {requests.get('list', 0):>6} {requests.get('insert', 0):>7} {api_s:>14.2f} "
+              f"{result['check_us']:>10.0f} {result['dupes']:>11} {result['wrong_skips']:>12}")
+        if strategy == "index":
+            print(f"{'':13} (+{result['setup']} list requests once for the initial full sync; "
+                  f"{result['sync_ms']:.1f} ms local work per incremental sync, mostly saving the index)")
+
+
+if __name__ == "__main__":
+    main()
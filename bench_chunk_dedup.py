@@ -0,0 +1,104 @@
+"""Embedding savings and retrieval quality of chunk deduplication.
+
+Builds a synthetic crawl: pages that repeat the same site boilerplate (nav,
+cookie banner, footer) with small per-page differences, some pages
+syndicated twice, and one unique fact per page. It splits the crawl the way
+basic_multi_source_rag.py does, dedups at several thresholds and checks
+recall@k of the fact questions with deterministic local embeddings. A
+last line shows within-source dedup, which is what the script uses.
+
+    python bench_chunk_dedup.py --pages 300
+"""
+import argparse
+import random
+import time
+
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from chunk_dedup import dedup_documents
+from local_embeddings import InMemoryIndex
+
+NAV = (
+    "Home | Tutorials | Microprocessors | Digital Logic | Interview Questions | Practice | Jobs | Courses. "
+    "We use cookies to ensure you have the best browsing experience on our website. By using our site, you "
+    "acknowledge that you have read and understood our Cookie Policy and Privacy Policy. "
+)
+FOOTER = (
+    "Company: About Us, Legal, Careers, In Media, Contact Us, Advertise with us, Campus Training Program. "
+    "Explore: Job-A-Thon, Offline Classes, DSA in JAVA/C++, Master System Design, Master CP, Videos. "
+    "Languages: Python, Java, C++, PHP, GoLang, SQL, R Language, Android Tutorial. All rights reserved. "
+)
+FILLER = [
+    "The control unit generates timing and control signals for every operation.",
+    "Instructions are fetched from memory, decoded and then executed in sequence.",
+    "Interrupts let external devices request the attention of the processor.",
+    "The address bus is unidirectional while the data bus is bidirectional.",
+    "Flags are set or reset according to the result of arithmetic operations.",
+    "Machine cycles are grouped into instruction cycles of varying length.",
+]
+SYLLABLES = ["ka", "zor", "vel", "mi", "tran", "quo", "sil", "dex", "ru", "pha", "nim", "oth"]
+SUBJECTS = ["accumulator", "stack pointer", "program counter", "flag register", "timer", "latch", "decoder", "bus buffer"]
+
+
+def make_crawl(pages, seed=0):
+    rng = random.Random(seed)
+    docs, questions = [], []
+    for index in range(pages):
+        codename = "".join(rng.choice(SYLLABLES) for _ in range(3))
+        subject = f"{rng.choice(SUBJECTS)} {codename}"
+        value = rng.randint(2, 512)
+        fact = f"The {subject} of the reference board is exactly {value} bits wide."
+        body = " ".join(rng.sample(FILLER, 4)) + " " + fact + " " + " ".join(rng.sample(FILLER, 3))
+        # Boilerplate differs slightly per page (date stamp, view counter)
+        page = f"{NAV} Last Updated: {rng.randint(1, 28)} Apr, 2025. Views: {rng.randint(100, 9999)}. {body} {FOOTER}"
+        docs.append(Document(page_content=page, metadata={"source": f"https://example.test/page{index}"}))
+        if rng.random() < 0.2:
+            docs.append(Document(page_content=page, metadata={"source": f"https://mirror.example.test/page{index}"}))
+        questions.append((f"How many bits wide is the {subject} of the reference board?", f"exactly {value} bits"))
+    return docs, questions
+
+
+def recall_at_k(index, questions, k):
+    hits = 0
+    for question, answer in questions:
+        if any(answer in doc.page_content for doc in index.similarity_search(question, k)):
+            hits += 1
+    return hits / len(questions)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure chunk dedup savings and retrieval recall.")
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--k", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    pages, questions = make_crawl(args.pages)
+    splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
+    chunks = splitter.split_documents(pages)
+    print(f"{len(pages)} pages -> {len(chunks)} chunks, {len(questions)} questions")
+    print(f"{'threshold':>9} {'chunks':>7} {'saved':>7} {'dedup ms':>9} {'index KiB':>10} {'recall@' + str(args.k):>9}")
+
+    baseline = InMemoryIndex()
+    baseline.add_documents(chunks)
+    print(f"{'none':>9} {len(chunks):>7} {0:>7} {0:>9} {baseline.nbytes() / 1024:>10.0f} {recall_at_k(baseline, questions, args.k):>9.3f}")
+
+    for threshold in (0.95, 0.85, 0.7, 0.5):
+        start = time.perf_counter()
+        kept, report = dedup_documents(chunks, threshold=threshold, embedding_dim=baseline.embeddings.dim)
+        ms = (time.perf_counter() - start) * 1000
+        index = InMemoryIndex()
+        index.add_documents(kept)
+        recall = recall_at_k(index, questions, args.k)
+        print(f"{threshold:>9} {len(kept):>7} {report.embedding_calls_saved:>7} {ms:>9.0f} {index.nbytes() / 1024:>10.0f} {recall:>9.3f}")
+    print(report)
+
+    # What basic_multi_source_rag.py does: its index replaces chunks per source, so it dedups within each one
+    kept, source_report = dedup_documents(chunks, threshold=0.85, embedding_dim=baseline.embeddings.dim, within="source")
+    index = InMemoryIndex()
+    index.add_documents(kept)
+    print(f"within source, 0.85: {source_report}; recall@{args.k} {recall_at_k(index, questions, args.k):.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Memory per chunk: split_documents vs ChunkStore.
+
+Splits a synthetic corpus with the RAG scripts' settings (1000/200 by
+default). It measures the Python heap held by the resulting chunks with
+tracemalloc, once as a list of Documents and once as a ChunkStore, and
+scales both to a million chunks. The source Documents exist before
+measurement starts, so only the chunk representation is counted; the
+source text the store keeps alive is reported on its own line.
+
+    python bench_chunk_store.py --chunks 100000
+"""
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from chunk_store import ChunkStore
+
+WORDS = (
+    "register accumulator opcode interrupt latch decoder timer bus address data flag carry parity zero sign "
+    "instruction memory stack pointer counter cycle fetch decode execute control signal clock"
+).split()
+
+
+def make_corpus(chunks, chunk_size, overlap, seed=0):
+    rng = random.Random(seed)
+    # Each chunk advances by roughly chunk_size - overlap characters of fresh text
+    target = chunks * (chunk_size - overlap)
+    docs, size, index = [], 0, 0
+    while size < target:
+        sentences = []
+        for _ in range(rng.randint(40, 120)):
+            sentences.append(" ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 18))).capitalize() + ".")
+        text = "\n\n".join(" ".join(sentences[i:i + 5]) for i in range(0, len(sentences), 5))
+        docs.append(Document(page_content=text, metadata={"source": f"manual_{index // 50}.pdf", "page": index % 50}))
+        size += len(text)
+        index += 1
+    return docs
+
+
+def measure(label, build):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    seconds = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, seconds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare memory per chunk of Documents and ChunkStore.")
+    parser.add_argument("--chunks", type=int, default=100000, help="Approximate number of chunks to build.")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--overlap", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    docs = make_corpus(args.chunks, args.chunk_size, args.overlap)
+    splitter = RecursiveCharacterTextSplitter(chunk_size=args.chunk_size, chunk_overlap=args.overlap)
+    source_chars = sum(len(doc.page_content) for doc in docs)
+    print(f"{len(docs)} source documents, {source_chars / 1024 / 1024:.0f} MB of text")
+
+    chunks, doc_bytes, doc_seconds = measure("documents", lambda: splitter.split_documents(docs))
+    count = len(chunks)
+    sample = [chunks[i].page_content for i in range(0, count, max(1, count // 1000))]
+    del chunks
+    store, store_bytes, store_seconds = measure("store", lambda: ChunkStore.from_documents(docs, splitter))
+    assert len(store) == count, (len(store), count)
+    assert [store.text(i) for i in range(0, count, max(1, count // 1000))] == sample
+
+    scale = 1_000_000 / count
+    print(f"{count} chunks from {len(docs)} sources, {store.stats()['unique_metadata']} distinct metadata dicts")
+    print(f"{'representation':16} {'split s':>8} {'heap MB':>9} {'B/chunk':>8} {'GB per 1M chunks':>17}")
+    for label, heap, seconds in (("Documents", doc_bytes, doc_seconds), ("ChunkStore", store_bytes, store_seconds)):
+        print(f"{label:16} {seconds:>8.2f} {heap / 1024 / 1024:>9.1f} {heap / count:>8.0f} {heap * scale / 1024 ** 3:>17.2f}")
+    # The store keeps the source texts alive, whereas Documents let them be freed after splitting
+    retained = store_bytes + store.stats()["buffer_bytes"]
+    print(f"{'+ source buffers':16} {'':>8} {retained / 1024 / 1024:>9.1f} {retained / count:>8.0f} {retained * scale / 1024 ** 3:>17.2f}")
+    print(f"ChunkStore holds {100 * store_bytes / doc_bytes:.1f}% of the Documents' memory, "
+          f"{100 * retained / doc_bytes:.1f}% counting the source text it retains")
+
+
+if __name__ == "__main__":
+    main()
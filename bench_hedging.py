@@ -0,0 +1,100 @@
+"""Tail-latency benchmark for HedgedChatModel using stub providers.
+
+The primary stub answers quickly most of the time but stalls on a fraction
+of requests; the backup is a little slower but steady. A third stub fails
+outright to exercise the circuit breaker.
+
+    python bench_hedging.py --requests 300
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from hedging import HedgedChatModel, get_circuit_breaker
+
+
+class StubMessage:
+    def __init__(self, content):
+        self.content = content
+
+
+class StubChatModel:
+    def __init__(self, name, base_latency, slow_latency=0.0, slow_rate=0.0, error_rate=0.0, seed=0):
+        self.name = name
+        self.base_latency = base_latency
+        self.slow_latency = slow_latency
+        self.slow_rate = slow_rate
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.calls = 0
+
+    async def ainvoke(self, input, config=None):
+        self.calls += 1
+        if self.rng.random() < self.error_rate:
+            await asyncio.sleep(self.base_latency / 2)
+            raise RuntimeError(f"{self.name}: 503 Service Unavailable")
+        slow = self.rng.random() < self.slow_rate
+        await asyncio.sleep(self.slow_latency if slow else self.base_latency * self.rng.uniform(0.8, 1.2))
+        return StubMessage(f"{self.name}: {input}")
+
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    pick = lambda p: ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000
+    return pick(0.5), pick(0.95), pick(0.99)
+
+
+async def run(model, requests, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(i):
+        async with semaphore:
+            start = time.perf_counter()
+            await model.ainvoke(f"request {i}")
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return latencies
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare tail latency with and without hedging.")
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--percentile", type=float, default=0.9)
+    args = parser.parse_args(argv)
+
+    def primary():
+        return StubChatModel("primary", base_latency=0.05, slow_latency=1.0, slow_rate=0.08, seed=1)
+
+    def backup():
+        return StubChatModel("backup", base_latency=0.08, seed=2)
+
+    baseline = primary()
+    base = asyncio.run(run(baseline, args.requests, args.concurrency))
+
+    hedged_primary, hedged_backup = primary(), backup()
+    hedged = HedgedChatModel(
+        [("primary", hedged_primary), ("backup", hedged_backup)],
+        hedge_percentile=args.percentile,
+        initial_hedge_delay=0.1,
+    )
+    with_hedge = asyncio.run(run(hedged, args.requests, args.concurrency))
+
+    print(f"{'mode':10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'extra calls':>12}")
+    print(f"{'primary':10} {percentiles(base)[0]:>8.1f} {percentiles(base)[1]:>8.1f} {percentiles(base)[2]:>8.1f} {0:>12}")
+    p50, p95, p99 = percentiles(with_hedge)
+    print(f"{'hedged':10} {p50:>8.1f} {p95:>8.1f} {p99:>8.1f} {hedged_backup.calls:>12}")
+
+    # A provider that always fails trips its breaker and stops being called
+    broken = StubChatModel("broken", base_latency=0.01, error_rate=1.0, seed=3)
+    fallback = HedgedChatModel([("broken", broken), ("fallback", backup())], initial_hedge_delay=0.1)
+    asyncio.run(run(fallback, 50, 1))
+    print(f"\nbroken provider called {broken.calls} times for 50 requests "
+          f"(breaker {get_circuit_breaker('broken').state})")
+
+
+if __name__ == "__main__":
+    main()
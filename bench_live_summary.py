@@ -0,0 +1,101 @@
+"""Time to final summary and tokens processed: batch vs live summarization.
+
+Transcript lines arrive at speaking pace (scaled down by --time-scale), as
+they would on stdin. The stub model bills tokens and sleeps following
+gpt-4o-mini's latency profile. Batch mode waits for the last line and then
+summarizes everything in one call. Live mode folds segments in as they
+arrive with LiveSummarizer, so after the last line only the final segment's
+update remains. Each meeting length reports the wait after the meeting
+ends and the input tokens per transcript token.
+
+    python bench_live_summary.py --minutes 15 30 60 120
+"""
+import argparse
+import random
+import time
+
+from live_summary import LiveSummarizer
+from model_router import DEFAULT_MODELS
+from rate_limiter import estimate_tokens
+
+PROFILE = DEFAULT_MODELS[0]
+WORDS_PER_MINUTE = 150
+SPEAKERS = ["Sarah", "Tom", "Priya", "Dan"]
+PHRASES = [
+    "we reviewed the launch checklist and the open risks",
+    "the vendor contract still needs legal sign-off",
+    "I will send the revised budget to finance",
+    "let's have a follow-up meeting on Friday at 3pm",
+    "support tickets dropped after the last release",
+    "the migration is blocked on the database upgrade",
+]
+
+
+class StubModel:
+    def __init__(self, time_scale, output_tokens=300):
+        self.time_scale = time_scale
+        self.output_tokens = output_tokens
+        self.input_tokens = 0
+        self.calls = 0
+
+    def __call__(self, prompt):
+        tokens = estimate_tokens(prompt)
+        self.input_tokens += tokens
+        self.calls += 1
+        time.sleep(PROFILE.estimate_latency(tokens, self.output_tokens) * self.time_scale)
+        return "SUMMARY:\n" + "The team discussed progress. " * 40 + "\nACTION ITEMS:\n- Tom to send the budget\nEVENTS:\n- none"
+
+
+def make_transcript(minutes, seed=0):
+    rng = random.Random(seed)
+    lines, words = [], 0
+    while words < minutes * WORDS_PER_MINUTE:
+        line = f"{rng.choice(SPEAKERS)}: {rng.choice(PHRASES).capitalize()}."
+        lines.append(line)
+        words += len(line.split())
+    return lines
+
+
+def spoken(lines, time_scale):
+    seconds_per_word = 60.0 / WORDS_PER_MINUTE * time_scale
+    for line in lines:
+        time.sleep(len(line.split()) * seconds_per_word)
+        yield line
+
+
+def run_batch(lines, time_scale):
+    model = StubModel(time_scale)
+    start = time.perf_counter()
+    model("Summarize this meeting transcript:\n\n" + "\n".join(lines))
+    return time.perf_counter() - start, model.input_tokens
+
+
+def run_live(lines, time_scale, segment_tokens):
+    model = StubModel(time_scale)
+    update = lambda summary, segment: model(f"Summary so far:\n{summary}\n\nNew part:\n{segment}")
+    summarizer = LiveSummarizer(update, segment_tokens=segment_tokens, max_wait=120.0 * time_scale)
+    summarizer.run(spoken(lines, time_scale))
+    return summarizer.final_lag, model.input_tokens, summarizer.notes.updates
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare batch and live summarization latency and token use.")
+    parser.add_argument("--minutes", type=float, nargs="+", default=[15, 30, 60, 120], help="Meeting lengths to simulate.")
+    parser.add_argument("--segment-tokens", type=int, default=600)
+    parser.add_argument("--time-scale", type=float, default=0.002, help="Real seconds per simulated second.")
+    args = parser.parse_args(argv)
+
+    print(f"{'minutes':>7} {'tokens':>8} {'batch wait s':>13} {'live wait s':>12} {'updates':>8} "
+          f"{'batch in/tok':>13} {'live in/tok':>12}")
+    for minutes in args.minutes:
+        lines = make_transcript(minutes)
+        transcript_tokens = sum(estimate_tokens(line) + 1 for line in lines)
+        batch_wait, batch_tokens = run_batch(lines, args.time_scale)
+        live_wait, live_tokens, updates = run_live(lines, args.time_scale, args.segment_tokens)
+        print(f"{minutes:>7.0f} {transcript_tokens:>8} {batch_wait / args.time_scale:>13.1f} "
+              f"{live_wait / args.time_scale:>12.1f} {updates:>8} {batch_tokens / transcript_tokens:>13.2f} "
+              f"{live_tokens / transcript_tokens:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
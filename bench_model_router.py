@@ -0,0 +1,132 @@
+"""Latency and cost per routing policy on a mixed transcript workload.
+
+Stub chat models follow each ModelProfile's latency curve (sleeping for a
+scaled-down time) and bill by tokens. They raise if a prompt overflows
+their context window, as the real API would. The workload mixes short
+stand-ups, long workshops and multi-hour recordings beyond 128k tokens
+across the router's task types. The fixed policies reproduce the scripts'
+previous behaviour, with the router's map-reduce fallback added. Calls go
+through a rate-limit scheduler with unlimited quotas, so only routing is
+measured.
+
+    python bench_model_router.py --requests 60
+"""
+import argparse
+import asyncio
+import logging
+import random
+import statistics
+import time
+
+from model_router import DEFAULT_MODELS, TASKS, Budget, ModelRouter, RoutedLLM
+from rate_limiter import ProviderLimits, RateLimitedScheduler, estimate_tokens
+
+TEMPLATE = "Process this meeting transcript:\n\n{transcript}\n"
+LINE = "Speaker {n}: we reviewed the launch checklist and agreed the owner will report back on Thursday."
+
+
+class StubMessage:
+    def __init__(self, content):
+        self.content = content
+
+
+class StubChatModel:
+    def __init__(self, profile, ledger, time_scale):
+        self.profile = profile
+        self.ledger = ledger
+        self.time_scale = time_scale
+
+    def _bill(self, prompt):
+        """Returns the simulated latency in seconds, after billing the call."""
+        input_tokens = estimate_tokens(prompt)
+        output_tokens = 300
+        if input_tokens + output_tokens > self.profile.context_window:
+            raise ValueError(f"{self.profile.name}: context length exceeded ({input_tokens} tokens)")
+        self.ledger.append(self.profile.estimate_cost(input_tokens, output_tokens))
+        return self.profile.estimate_latency(input_tokens, output_tokens) * self.time_scale
+
+    def invoke(self, prompt):
+        time.sleep(self._bill(prompt))
+        return StubMessage("Partial summary: " + "decision " * 300)
+
+    async def ainvoke(self, prompt, config=None):
+        # RoutedLLM calls through the scheduler, which awaits this on its loop
+        await asyncio.sleep(self._bill(prompt))
+        return StubMessage("Partial summary: " + "decision " * 300)
+
+
+def make_workload(count, seed=0):
+    rng = random.Random(seed)
+    sizes = [(0.6, 500, 3_000), (0.25, 8_000, 20_000), (0.1, 60_000, 100_000), (0.05, 200_000, 300_000)]
+    workload = []
+    for _ in range(count):
+        roll, cumulative = rng.random(), 0.0
+        for share, low, high in sizes:
+            cumulative += share
+            if roll <= cumulative:
+                break
+        tokens = rng.randint(low, high)
+        lines = [LINE.format(n=i % 7) for i in range(tokens // estimate_tokens(LINE + "\n"))]
+        workload.append((rng.choice(list(TASKS)), "\n".join(lines)))
+    return workload
+
+
+def run_policy(policy, workload, budget, time_scale):
+    ledger = []
+    models = {profile.name: StubChatModel(profile, ledger, time_scale) for profile in DEFAULT_MODELS}
+    router = ModelRouter(policy=policy, budget=budget)
+    scheduler = RateLimitedScheduler({profile.provider: ProviderLimits(10 ** 9, 10 ** 12) for profile in DEFAULT_MODELS})
+    llm = RoutedLLM(router, models.__getitem__, max_parallel=8, scheduler=scheduler)
+    latencies, failures = [], 0
+    for task, transcript in workload:
+        start = time.perf_counter()
+        try:
+            llm.invoke(TEMPLATE, transcript, task=task)
+        except ValueError:
+            failures += 1
+        latencies.append((time.perf_counter() - start) / time_scale)
+    scheduler.close()
+    decisions = router.decisions  # includes the reduce steps of map-reduce calls
+    return {
+        "cost": sum(ledger),
+        "mean": statistics.mean(latencies),
+        "p95": sorted(latencies)[int(0.95 * (len(latencies) - 1))],
+        "map_reduce": sum(1 for d in decisions if d.strategy == "map_reduce"),
+        "over_budget": sum(1 for d in decisions if not d.within_budget),
+        "mini_share": sum(1 for d in decisions if d.model == "gpt-4o-mini") / len(decisions),
+        "failures": failures,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare routing policies on stub models.")
+    parser.add_argument("--requests", type=int, default=60)
+    parser.add_argument("--time-scale", type=float, default=0.005, help="Real seconds slept per simulated second.")
+    parser.add_argument("--max-latency", type=float, default=20.0, help="Latency budget (s) for the *_slo policies.")
+    parser.add_argument("--verbose", action="store_true", help="Print every routing decision.")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format="%(message)s")
+
+    workload = make_workload(args.requests)
+    print(f"{len(workload)} requests, {sum(estimate_tokens(t) for _, t in workload) / 1e6:.2f}M transcript tokens")
+    policies = [
+        ("fixed:gpt-4o", Budget()),
+        ("fixed:gpt-4o-mini", Budget()),
+        ("balanced", Budget()),
+        ("cheapest", Budget()),
+        ("fastest", Budget()),
+        ("quality", Budget()),
+        ("quality_slo", Budget(max_latency_s=args.max_latency)),
+    ]
+    print(f"{'policy':18} {'cost $':>8} {'mean s':>7} {'p95 s':>7} {'map-reduce':>11} {'over SLO':>9} {'mini %':>7} {'failed':>7}")
+    for label, budget in policies:
+        policy = label.replace("_slo", "")
+        result = run_policy(policy, workload, budget, args.time_scale)
+        print(
+            f"{label:18} {result['cost']:>8.3f} {result['mean']:>7.1f} {result['p95']:>7.1f} {result['map_reduce']:>11} "
+            f"{result['over_budget']:>9} {100 * result['mini_share']:>6.0f}% {result['failures']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
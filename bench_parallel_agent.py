@@ -0,0 +1,92 @@
+"""Model round trips and wall time: one tool call per turn vs parallel tool calls.
+
+A scripted chat model stands in for gpt-4o-mini. Each turn costs
+--turn-ms. A request needs a fixed set of independent tool calls, which
+the model asks for either one per turn (the OPENAI_FUNCTIONS executor's
+behaviour) or all in its first turn. A final turn then writes the answer.
+The tools sleep for typical durations: LLM-backed summarize/extract take
+seconds, the mock Notion and Calendar calls a few hundred ms, and Notion
+writes are serialized. The "batched, 1 worker" row separates the
+round-trip savings from the concurrency savings.
+
+    python bench_parallel_agent.py --time-scale 0.1
+"""
+import argparse
+import time
+
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.tools import StructuredTool
+
+from parallel_agent import ParallelToolAgent
+
+TOOL_SECONDS = {"summarize_meeting": 2.5, "extract_tasks": 2.0, "add_task_to_notion": 0.4, "schedule_next_meeting": 0.3}
+
+REQUESTS = {
+    "summary + tasks": [("summarize_meeting", {"transcript": "..."}), ("extract_tasks", {"transcript": "..."})],
+    "full follow-up": [
+        ("summarize_meeting", {"transcript": "..."}),
+        ("extract_tasks", {"transcript": "..."}),
+        ("schedule_next_meeting", {"date": "Thursday 3PM"}),
+        ("add_task_to_notion", {"task": "Sarah designs the draft"}),
+        ("add_task_to_notion", {"task": "Tom reviews by Friday"}),
+        ("add_task_to_notion", {"task": "Launch next Monday"}),
+    ],
+}
+
+
+def make_tools(time_scale):
+    def make(name, seconds):
+        def run(**kwargs):
+            time.sleep(seconds * time_scale)
+            return f"{name} done"
+        return StructuredTool.from_function(run, name=name, description=f"Simulated {name}.",
+                                            args_schema={"type": "object", "properties": {}})
+    return [make(name, seconds) for name, seconds in TOOL_SECONDS.items()]
+
+
+class ScriptedChatModel:
+    def __init__(self, plan, turn_s, batched):
+        self.plan = plan
+        self.turn_s = turn_s
+        self.batched = batched
+        self.calls = 0
+
+    def bind_tools(self, tools):
+        return self
+
+    def invoke(self, messages):
+        self.calls += 1
+        time.sleep(self.turn_s)
+        done = sum(1 for message in messages if isinstance(message, ToolMessage))
+        remaining = self.plan[done:]
+        if not remaining:
+            return AIMessage(content="All done.")
+        batch = remaining if self.batched else remaining[:1]
+        return AIMessage(content="", tool_calls=[
+            {"name": name, "args": args, "id": f"call_{done + i}"} for i, (name, args) in enumerate(batch)
+        ])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare sequential and parallel tool-call execution.")
+    parser.add_argument("--turn-ms", type=float, default=800.0, help="Latency of one model turn.")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--time-scale", type=float, default=0.1, help="Real seconds per simulated second.")
+    args = parser.parse_args(argv)
+
+    tools = make_tools(args.time_scale)
+    modes = [("one call per turn", False, 1), ("batched, 1 worker", True, 1), (f"parallel, {args.workers} workers", True, args.workers)]
+    print(f"{'request':16} {'mode':22} {'model turns':>12} {'wall s':>7}")
+    for label, plan in REQUESTS.items():
+        for mode, batched, workers in modes:
+            model = ScriptedChatModel(plan, args.turn_ms / 1000 * args.time_scale, batched)
+            agent = ParallelToolAgent(tools, model, max_workers=workers, serial=("add_task_to_notion",), memory=False)
+            start = time.perf_counter()
+            result = agent.invoke("Handle this meeting.")
+            seconds = (time.perf_counter() - start) / args.time_scale
+            assert result["tool_calls"] == len(plan), result
+            print(f"{label:16} {mode:22} {result['llm_calls']:>12} {seconds:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
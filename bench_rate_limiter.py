@@ -0,0 +1,124 @@
+"""Load test for RateLimitedScheduler against a stub provider with quotas.
+
+The stub enforces requests- and tokens-per-window quotas that replenish
+continuously (the way OpenAI and Anthropic document theirs), answers 429
+with `retry-after` when a request does not fit and reports the remaining
+quota in headers on success. A time window of one second stands
+in for a minute so the run finishes quickly.
+
+    python bench_rate_limiter.py --requests 400
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from rate_limiter import BATCH, INTERACTIVE, ProviderLimits, RateLimitedScheduler, TokenBucket, estimate_tokens
+
+
+class StubRateLimitError(Exception):
+    status_code = 429
+
+    def __init__(self, headers):
+        super().__init__("429 Too Many Requests")
+        self.headers = headers
+
+
+class StubResponse:
+    def __init__(self, content, headers):
+        self.content = content
+        self.response_metadata = {"headers": headers}
+
+
+class StubProvider:
+    def __init__(self, rpm, tpm, window, latency=0.02):
+        self.requests = TokenBucket(rpm, window)
+        self.tokens = TokenBucket(tpm, window)
+        self.latency = latency
+        self.accepted = 0
+        self.rejected = 0
+
+    async def ainvoke(self, prompt, max_output_tokens=256):
+        tokens = estimate_tokens(prompt) + max_output_tokens
+        retry_after = max(self.requests.wait_time(1), self.tokens.wait_time(tokens))
+        if retry_after > 0:
+            self.rejected += 1
+            raise StubRateLimitError({"retry-after": f"{retry_after:.3f}"})
+        self.requests.consume(1)
+        self.tokens.consume(tokens)
+        self.accepted += 1
+        await asyncio.sleep(self.latency)
+        return StubResponse("ok", {
+            "x-ratelimit-remaining-requests": int(self.requests.tokens),
+            "x-ratelimit-remaining-tokens": int(self.tokens.tokens),
+        })
+
+
+def make_prompts(count, seed=0):
+    rng = random.Random(seed)
+    return ["lorem ipsum " * rng.randint(20, 200) for _ in range(count)]
+
+
+async def run_naive(stub, prompts):
+    # Fire everything at once and sleep-retry on 429, like the scripts do today
+    async def one(prompt):
+        while True:
+            try:
+                return await stub.ainvoke(prompt)
+            except StubRateLimitError:
+                await asyncio.sleep(0.05)
+    start = time.perf_counter()
+    await asyncio.gather(*(one(p) for p in prompts))
+    return time.perf_counter() - start
+
+
+async def run_scheduled(stub, prompts, limits, interactive_every=20):
+    scheduler = RateLimitedScheduler({"stub": limits})
+    interactive_waits = []
+
+    async def one(i, prompt):
+        priority = INTERACTIVE if i % interactive_every == 0 else BATCH
+        start = time.perf_counter()
+        await scheduler.submit("stub", lambda: stub.ainvoke(prompt), prompt=prompt, priority=priority)
+        if priority == INTERACTIVE:
+            interactive_waits.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i, p) for i, p in enumerate(prompts)))
+    elapsed = time.perf_counter() - start
+    scheduler.close()
+    return elapsed, interactive_waits, scheduler.stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare naive retries with the shared rate-limit scheduler.")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--rpm", type=int, default=100, help="Requests allowed per window.")
+    parser.add_argument("--tpm", type=int, default=40_000, help="Tokens allowed per window.")
+    parser.add_argument("--window", type=float, default=1.0, help="Window length in seconds.")
+    args = parser.parse_args(argv)
+
+    prompts = make_prompts(args.requests)
+    total_tokens = sum(estimate_tokens(p) + 256 for p in prompts)
+    # Both buckets start full, so the first window's worth goes out as a burst
+    ideal = max(0.0, max(args.requests / args.rpm, total_tokens / args.tpm) - 1) * args.window
+    print(f"{args.requests} requests, {total_tokens} tokens; quota-bound minimum ~{ideal:.1f}s\n")
+
+    naive_stub = StubProvider(args.rpm, args.tpm, args.window)
+    naive_elapsed = asyncio.run(run_naive(naive_stub, prompts))
+
+    # Leave a little headroom under the server quota
+    limits = ProviderLimits(int(args.rpm * 0.95), int(args.tpm * 0.95), args.window)
+    sched_stub = StubProvider(args.rpm, args.tpm, args.window)
+    sched_elapsed, waits, stats = asyncio.run(run_scheduled(sched_stub, prompts, limits))
+
+    print(f"{'mode':10} {'seconds':>8} {'req/s':>8} {'429s':>8} {'% of quota':>11}")
+    for name, elapsed, stub in (("naive", naive_elapsed, naive_stub), ("scheduled", sched_elapsed, sched_stub)):
+        print(f"{name:10} {elapsed:>8.2f} {args.requests / elapsed:>8.1f} {stub.rejected:>8} {100 * ideal / elapsed:>10.0f}%")
+    waits.sort()
+    print(f"\ninteractive requests: median wait {waits[len(waits) // 2] * 1000:.0f} ms, "
+          f"max {waits[-1] * 1000:.0f} ms (batch requests queue behind them)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""Sweep chunk_size, chunk_overlap and k against a labeled question set.
+
+Every configuration is ingested with deterministic local embeddings, so runs
+are free and repeatable. The sweep reports ingest time, index size, query
+latency, prompt tokens (question plus retrieved chunks) and recall@k, where
+a question counts as answered when a retrieved chunk contains its answer
+string. Settings that no other setting beats on both recall and prompt
+tokens are flagged as Pareto-optimal (--pareto-latency adds query latency
+as a third objective).
+
+    python bench_retrieval_sweep.py --corpus docs/ --questions questions.jsonl
+    python bench_retrieval_sweep.py          # synthetic corpus and questions
+
+questions.jsonl holds one {"question": ..., "answer": ...} per line.
+"""
+import argparse
+import csv
+import glob
+import json
+import os
+import random
+import statistics
+import time
+from itertools import product
+
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from chunk_store import ChunkStore
+from local_embeddings import InMemoryIndex
+from rate_limiter import estimate_tokens
+
+CHUNK_SIZES = [250, 500, 1000, 2000]
+OVERLAPS = [0, 100, 200]
+KS = [1, 3, 5, 8]
+
+TOPICS = ["budget", "hiring", "roadmap", "security", "marketing", "infrastructure", "support", "legal"]
+NAMES = ["Sarah", "Tom", "Priya", "Dan", "Mei", "Omar", "Lena", "Jorge"]
+
+
+def load_corpus(pattern):
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, "**", "*.txt")
+    docs = []
+    for path in sorted(glob.glob(pattern, recursive=True)):
+        with open(path, "r", encoding="utf-8") as f:
+            docs.append(Document(page_content=f.read(), metadata={"source": path}))
+    return docs
+
+
+def load_questions(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def synthetic_workload(documents=40, facts_per_doc=6, seed=0):
+    """Meeting-minutes style documents with facts buried in chatter, plus one question per fact."""
+    rng = random.Random(seed)
+    docs, questions = [], []
+    for doc_index in range(documents):
+        paragraphs = []
+        for fact_index in range(facts_per_doc):
+            topic, owner = rng.choice(TOPICS), rng.choice(NAMES)
+            code = f"{topic[:3].upper()}-{doc_index:02d}{fact_index}"
+            amount = rng.randint(10, 990)
+            chatter = " ".join(
+                f"{rng.choice(NAMES)} noted that the {rng.choice(TOPICS)} discussion should continue next cycle."
+                for _ in range(rng.randint(3, 12))
+            )
+            paragraphs.append(f"{chatter} For item {code}, {owner} committed to a {topic} allocation of {amount} thousand.")
+            questions.append({"question": f"What {topic} allocation was agreed for item {code}?", "answer": f"{amount} thousand"})
+        docs.append(Document(page_content="\n\n".join(paragraphs), metadata={"source": f"minutes_{doc_index:02d}.txt"}))
+    return docs, questions
+
+
+def pareto_front(rows, latency=False):
+    """Rows not dominated on recall (higher), prompt tokens (lower) and optionally query latency (lower)."""
+    def objectives(row):
+        values = (row["recall"], -row["prompt_tokens"])
+        return values + (-row["query_ms"],) if latency else values
+
+    def dominates(a, b):
+        a, b = objectives(a), objectives(b)
+        return all(x >= y for x, y in zip(a, b)) and a != b
+
+    return [row for row in rows if not any(dominates(other, row) for other in rows if other is not row)]
+
+
+def sweep(docs, questions, chunk_sizes=CHUNK_SIZES, overlaps=OVERLAPS, ks=KS, pareto_latency=False):
+    rows = []
+    question_tokens = [estimate_tokens(q["question"]) for q in questions]
+    for chunk_size, overlap in product(chunk_sizes, overlaps):
+        if overlap >= chunk_size:
+            continue
+        start = time.perf_counter()
+        splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=overlap)
+        chunks = ChunkStore.from_documents(docs, splitter)
+        index = InMemoryIndex.from_chunk_store(chunks)
+        ingest_seconds = time.perf_counter() - start
+
+        for k in ks:
+            latencies, tokens, hits = [], [], 0
+            for question, q_tokens in zip(questions, question_tokens):
+                query_start = time.perf_counter()
+                retrieved = index.similarity_search(question["question"], k)
+                latencies.append((time.perf_counter() - query_start) * 1000)
+                tokens.append(q_tokens + sum(estimate_tokens(doc.page_content) for doc in retrieved))
+                if any(question["answer"] in doc.page_content for doc in retrieved):
+                    hits += 1
+            rows.append({
+                "chunk_size": chunk_size,
+                "overlap": overlap,
+                "k": k,
+                "chunks": len(chunks),
+                "ingest_s": round(ingest_seconds, 3),
+                "index_kib": round(index.nbytes() / 1024, 1),
+                "query_ms": round(statistics.mean(latencies), 3),
+                "query_p95_ms": round(sorted(latencies)[int(0.95 * (len(latencies) - 1))], 3),
+                "prompt_tokens": round(statistics.mean(tokens), 1),
+                "recall": round(hits / len(questions), 3),
+            })
+    front = pareto_front(rows, pareto_latency)
+    for row in rows:
+        row["pareto"] = row in front
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep chunking and k for latency, cost and recall.")
+    parser.add_argument("--corpus", help="Directory or glob of .txt documents (default: synthetic meeting minutes).")
+    parser.add_argument("--questions", help="JSONL of {question, answer}; required with --corpus.")
+    parser.add_argument("--chunk-sizes", type=int, nargs="+", default=CHUNK_SIZES)
+    parser.add_argument("--overlaps", type=int, nargs="+", default=OVERLAPS)
+    parser.add_argument("--ks", type=int, nargs="+", default=KS)
+    parser.add_argument("--pareto-latency", action="store_true", help="Treat query latency as a Pareto objective too.")
+    parser.add_argument("--min-recall", type=float, default=0.0, help="Hide rows below this recall.")
+    parser.add_argument("--csv", help="Also write every row to this CSV file.")
+    args = parser.parse_args(argv)
+
+    if args.corpus:
+        if not args.questions:
+            parser.error("--questions is required with --corpus")
+        docs, questions = load_corpus(args.corpus), load_questions(args.questions)
+    else:
+        docs, questions = synthetic_workload()
+    print(f"{len(docs)} documents, {sum(len(d.page_content) for d in docs) / 1024:.0f} KiB, {len(questions)} questions")
+
+    rows = sweep(docs, questions, args.chunk_sizes, args.overlaps, args.ks, args.pareto_latency)
+    columns = ["chunk_size", "overlap", "k", "chunks", "ingest_s", "index_kib", "query_ms", "query_p95_ms", "prompt_tokens", "recall"]
+    print(" ".join(f"{column:>13}" for column in columns) + "  pareto")
+    for row in sorted(rows, key=lambda r: (-r["recall"], r["prompt_tokens"])):
+        if row["recall"] < args.min_recall:
+            continue
+        print(" ".join(f"{row[column]:>13}" for column in columns) + ("       *" if row["pareto"] else ""))
+
+    best = [row for row in rows if row["pareto"]]
+    objectives = "recall vs prompt tokens" + (" vs query latency" if args.pareto_latency else "")
+    print(f"\n{len(best)} Pareto-optimal settings ({objectives}):")
+    for row in sorted(best, key=lambda r: r["prompt_tokens"]):
+        print(f"  chunk_size={row['chunk_size']} overlap={row['overlap']} k={row['k']}: "
+              f"recall {row['recall']:.3f}, {row['prompt_tokens']:.0f} prompt tokens, {row['query_ms']:.2f} ms/query")
+
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=columns + ["pareto"])
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Ingest throughput and query latency as the shard count grows.
+
+Shards are InMemoryIndex instances (exact search over hashing embeddings).
+Ingest pays a simulated embedding API round trip per batch of chunks
+(--embed-ms per --batch), as Chroma does with OpenAIEmbeddings. Search is
+pure-Python CPU work, which only gets faster with more cores
+(--workers process). Each setting reports the share of queries whose top-k
+scores match the single-shard index. The synthetic corpus has many
+equal-scoring chunks, so the documents themselves may differ on ties.
+Then one shard is rebuilt, showing that only its chunks are re-indexed.
+
+    python bench_sharded_index.py --documents 400 --shards 1 2 4 8 --workers thread process
+"""
+import argparse
+import os
+import statistics
+import time
+
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from bench_retrieval_sweep import synthetic_workload
+from local_embeddings import HashingEmbeddings, InMemoryIndex
+from sharded_index import ShardedVectorStore
+
+
+class ApiIndex(InMemoryIndex):
+    def __init__(self, embed_s, batch):
+        super().__init__()
+        self.embed_s = embed_s
+        self.batch = batch
+
+    def add_documents(self, docs):
+        for start in range(0, len(docs), self.batch):
+            time.sleep(self.embed_s)  # one embeddings request per batch
+            super().add_documents(docs[start:start + self.batch])
+
+
+class ShardFactory:
+    """Picklable so process shards can build their own index."""
+
+    def __init__(self, embed_s, batch):
+        self.embed_s = embed_s
+        self.batch = batch
+
+    def __call__(self, shard_id):
+        return ApiIndex(self.embed_s, self.batch)
+
+
+def run(chunks, questions, shards, workers, by, factory, k, reference=None):
+    store = ShardedVectorStore(factory, shards, HashingEmbeddings(), by=by, workers=workers, scores="similarity")
+    try:
+        start = time.perf_counter()
+        store.add_documents(chunks)
+        ingest_s = time.perf_counter() - start
+
+        latencies, results = [], []
+        for question in questions:
+            start = time.perf_counter()
+            results.append([round(score, 9) for _, score in store.similarity_search_with_score(question, k)])
+            latencies.append((time.perf_counter() - start) * 1000)
+        agreement = None
+        if reference is not None:
+            agreement = statistics.mean(a == b for a, b in zip(results, reference))
+
+        sizes = [len(part) for part in store.partition(chunks)]
+        start = time.perf_counter()
+        rebuilt = store.rebuild_shard(0, chunks)
+        rebuild_s = time.perf_counter() - start
+        return {
+            "ingest_s": ingest_s,
+            "chunks_per_s": len(chunks) / ingest_s,
+            "query_ms": statistics.mean(latencies),
+            "query_p95_ms": sorted(latencies)[int(0.95 * (len(latencies) - 1))],
+            "agreement": agreement,
+            "largest_shard": max(sizes),
+            "rebuilt": rebuilt,
+            "rebuild_s": rebuild_s,
+        }, results
+    finally:
+        store.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark sharded fan-out search.")
+    parser.add_argument("--documents", type=int, default=400, help="Synthetic meeting-minute documents.")
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--workers", nargs="+", default=["thread", "process"], choices=["thread", "process"])
+    parser.add_argument("--by", default="hash", choices=["hash", "source"])
+    parser.add_argument("--embed-ms", type=float, default=100.0, help="Simulated latency of one embeddings request.")
+    parser.add_argument("--batch", type=int, default=256, help="Chunks per embeddings request.")
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    docs, labeled = synthetic_workload(documents=args.documents)
+    chunks = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=100).split_documents(docs)
+    questions = [item["question"] for item in labeled[:args.queries]]
+    factory = ShardFactory(args.embed_ms / 1000, args.batch)
+    print(f"{len(chunks)} chunks, {len(questions)} queries, {os.cpu_count()} CPU(s), shard key: {args.by}")
+
+    print(f"{'workers':8} {'shards':>6} {'ingest s':>9} {'chunks/s':>9} {'query ms':>9} {'p95 ms':>8} "
+          f"{'agree':>6} {'largest':>8} {'rebuild 0':>16}")
+    reference = None
+    for workers in args.workers:
+        for shards in args.shards:
+            result, results = run(chunks, questions, shards, workers, args.by, factory, args.k, reference)
+            if reference is None:
+                reference, result["agreement"] = results, 1.0
+            print(f"{workers:8} {shards:>6} {result['ingest_s']:>9.2f} {result['chunks_per_s']:>9.0f} "
+                  f"{result['query_ms']:>9.1f} {result['query_p95_ms']:>8.1f} {result['agreement']:>6.2f} "
+                  f"{result['largest_shard']:>8} {result['rebuilt']:>6} in {result['rebuild_s']:>5.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Startup benchmark for the entry-point scripts.
+
+For each script this runs `python -X importtime <script> --help` and reports
+wall time, the number of modules imported and the cumulative import time.
+Interactive scripts are also started for real and timed until their first
+prompt shows up on stdout.
+
+    python bench_startup.py
+    python bench_startup.py meeting_assistant_gdrive.py --runs 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SCRIPTS = [
+    "meeting_assistant_gdrive.py",
+    "multi-tool_agent_gdrive_v2.py",
+    "multi-tool_agent_gdrive_v3.py",
+    "multi-tool_agent_gdrive.py",
+    "multi-tool_agent_demo.py",
+    "tweet_chain.py",
+    "tweet_chain_mixed.py",
+    "second_langchain.py",
+    "basic_rag_chroma.py",
+    "basic_multi_source_rag.py",
+]
+
+# Scripts with an input() loop, and the text of the prompt they print
+PROMPTS = {
+    "multi-tool_agent_gdrive_v3.py": "Enter your command: ",
+    "basic_rag_chroma.py": "> ",
+}
+
+
+def parse_importtime(stderr):
+    """Returns (module count, top-level cumulative import time in ms)."""
+    modules = 0
+    total_us = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        modules += 1
+        # Top-level imports are the ones without indentation in the package column
+        if not fields[2].startswith("   "):
+            total_us += int(fields[1])
+    return modules, total_us / 1000
+
+
+def time_help(script, runs):
+    walls, modules, imports = [], 0, []
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", script, "--help"],
+            capture_output=True, text=True,
+        )
+        walls.append((time.perf_counter() - start) * 1000)
+        modules, import_ms = parse_importtime(proc.stderr)
+        imports.append(import_ms)
+        if proc.returncode != 0:
+            return None
+    return statistics.median(walls), modules, statistics.median(imports)
+
+
+def time_to_prompt(script, prompt, timeout=60):
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-u", script],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+    )
+    seen = b""
+    try:
+        while not seen.endswith(prompt.encode()):
+            chunk = proc.stdout.read(1)
+            if not chunk or time.perf_counter() - start > timeout:
+                return None
+            seen += chunk
+        return (time.perf_counter() - start) * 1000
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure import cost and time-to-prompt of the entry-point scripts.")
+    parser.add_argument("scripts", nargs="*", default=SCRIPTS)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    print(f"{'script':35} {'--help ms':>10} {'modules':>8} {'import ms':>10} {'prompt ms':>10}")
+    for script in args.scripts:
+        result = time_help(script, args.runs)
+        if result is None:
+            print(f"{script:35} {'failed':>10}")
+            continue
+        wall_ms, modules, import_ms = result
+        prompt_ms = ""
+        if script in PROMPTS:
+            measured = time_to_prompt(script, PROMPTS[script])
+            prompt_ms = f"{measured:.1f}" if measured is not None else "n/a"
+        print(f"{script:35} {wall_ms:>10.1f} {modules:>8} {import_ms:>10.1f} {prompt_ms:>10}")
+
+
+if __name__ == "__main__":
+    main()
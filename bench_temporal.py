@@ -0,0 +1,126 @@
+"""Accuracy and LLM-call savings of the local temporal resolver.
+
+Every phrase is resolved against a fixed reference (Wednesday 2025-04-16,
+09:00 Asia/Jakarta) and compared with the expected start time. The old
+two-format strptime helper is scored on the same phrases for comparison.
+A small set of transcripts shows how many calendar LLM calls are skipped
+because extract_events resolves the follow-up locally.
+
+    python bench_temporal.py
+"""
+import datetime
+import time
+from zoneinfo import ZoneInfo
+
+from temporal import extract_events, find_datetime, pick_event
+
+JAKARTA = ZoneInfo("Asia/Jakarta")
+REFERENCE = datetime.datetime(2025, 4, 16, 9, 0, tzinfo=JAKARTA)
+
+# (phrase, expected "YYYY-MM-DD HH:MM", or None when it must be left to the LLM)
+CORPUS = [
+    ("2025-04-20 10:00 AM", "2025-04-20 10:00"),
+    ("2025-04-20 14:00", "2025-04-20 14:00"),
+    ("2025-04-20 2:30 PM", "2025-04-20 14:30"),
+    ("2025/05/01 09:15", "2025-05-01 09:15"),
+    ("April 20, 2025 3:30 PM", "2025-04-20 15:30"),
+    ("April 20 at 3pm", "2025-04-20 15:00"),
+    ("Apr 22nd 11am", "2025-04-22 11:00"),
+    ("20th of May at noon", "2025-05-20 12:00"),
+    ("3 June 2025, 16:00", "2025-06-03 16:00"),
+    ("March 3", "2026-03-03 10:00"),
+    ("Sept 9 at 9 a.m.", "2025-09-09 09:00"),
+    ("today at 4pm", "2025-04-16 16:00"),
+    ("tonight", "2025-04-16 19:00"),
+    ("tomorrow", "2025-04-17 10:00"),
+    ("tomorrow morning", "2025-04-17 09:00"),
+    ("tomorrow at noon", "2025-04-17 12:00"),
+    ("day after tomorrow 9am", "2025-04-18 09:00"),
+    ("in 3 days", "2025-04-19 10:00"),
+    ("in two weeks", "2025-04-30 10:00"),
+    ("in a month", "2025-05-16 10:00"),
+    ("next week", "2025-04-23 10:00"),
+    ("let's follow up next week", "2025-04-23 10:00"),
+    ("next week on Thursday at 3PM", "2025-04-24 15:00"),
+    ("week after next", "2025-04-30 10:00"),
+    ("next month", "2025-05-16 10:00"),
+    ("Thursday at 3PM", "2025-04-17 15:00"),
+    ("on Friday", "2025-04-18 10:00"),
+    ("Friday afternoon", "2025-04-18 14:00"),
+    ("this Wednesday at 5pm", "2025-04-16 17:00"),
+    ("Wednesday", "2025-04-23 10:00"),
+    ("next Monday", "2025-04-21 10:00"),
+    ("next Monday at 9:30", "2025-04-21 09:30"),
+    ("coming Tuesday 13:00", "2025-04-22 13:00"),
+    ("Monday at 3", "2025-04-21 15:00"),
+    ("by Friday eod", "2025-04-18 17:00"),
+    ("end of the week", "2025-04-18 10:00"),
+    ("end of the month", "2025-04-30 10:00"),
+    ("Saturday evening", "2025-04-19 18:00"),
+    ("Sunday at midnight", "2025-04-20 00:00"),
+    ("May 2 at 10.30", "2025-05-02 10:30"),
+    ("tomorrow 10.30am", "2025-04-17 10:30"),
+    # Decimals, percentages, the verb "may" and absurd offsets are not dates or times
+    ("Revenue grew 1.25 percent, let's follow up next week.", "2025-04-23 10:00"),
+    ("Margins rose 3.50% so let's meet next week", "2025-04-23 10:00"),
+    ("I may 3D print it, let's follow up tomorrow", "2025-04-17 10:00"),
+    ("Let's follow up in 99999999 days", None),
+]
+
+TRANSCRIPTS = [
+    "Today we discussed the new marketing campaign. Sarah will design the draft, Tom will review by Friday, "
+    "and we aim to launch next Monday. Let's follow up on Thursday.",
+    "Budget review went fine. We'll meet again next week on Tuesday at 2pm to sign off.",
+    "Quick sync. Action item: Dan to send the deck. Follow-up call tomorrow at 11am.",
+    "Hiring update. Let's schedule a catch-up on April 28 at 9:30 AM with the panel.",
+    "Retro notes. Nothing scheduled yet; we will decide when to reconvene later.",
+    "Roadmap planning. We should get together again once the numbers are in.",
+    # Only the last sentence is a follow-up; "3 p.m." must not split it
+    "Thanks everyone for joining today's meeting.\nWe went through the Q3 numbers.\nDana will update the forecast.\n"
+    "Let's follow up next Thursday at 3 p.m. to review it.",
+    # Two equally likely follow-ups: left to the LLM
+    "Vendor review. Let's follow up with legal on Monday at 10am. Let's follow up with finance on Tuesday at 4pm.",
+]
+
+
+def legacy_parse(phrase):
+    # The helper from meeting_assistant_gdrive.py before the local resolver
+    for fmt in ("%Y-%m-%d %I:%M %p", "%Y-%m-%d %H:%M"):
+        try:
+            return datetime.datetime.strptime(phrase, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def main():
+    correct = legacy_correct = 0
+    start = time.perf_counter()
+    for phrase, expected in CORPUS:
+        resolved = find_datetime(phrase, REFERENCE)
+        got = resolved.strftime("%Y-%m-%d %H:%M") if resolved else None
+        if got == expected:
+            correct += 1
+        else:
+            print(f"MISS {phrase!r}: expected {expected}, got {got}")
+        legacy = legacy_parse(phrase)
+        if legacy and legacy.strftime("%Y-%m-%d %H:%M") == expected:
+            legacy_correct += 1
+    per_phrase_us = (time.perf_counter() - start) / len(CORPUS) * 1e6
+
+    print(f"local resolver: {correct}/{len(CORPUS)} correct ({per_phrase_us:.0f} us/phrase incl. legacy check)")
+    print(f"legacy strptime: {legacy_correct}/{len(CORPUS)} correct (everything else needed the LLM to normalise it)")
+
+    resolved_locally = 0
+    for transcript in TRANSCRIPTS:
+        event = pick_event(extract_events(transcript, REFERENCE))
+        if event:
+            resolved_locally += 1
+            print(f"  local: {event['start']:%Y-%m-%d %H:%M} <- {event['description']!r}")
+        else:
+            print(f"  LLM:   {transcript[:60]!r}...")
+    print(f"calendar LLM calls skipped: {resolved_locally}/{len(TRANSCRIPTS)} transcripts")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Benchmark the transcript relevance prefilter on a large synthetic transcript.
+
+Compares the original line-by-line `preprocess_transcript` from
+multi-tool_agent_gdrive_v2.py with transcript_filter.extract_relevant, on
+plain "Alice: ..." lines and on exported "[00:01:23] Speaker 2: ..." lines,
+whose timestamps and speaker numbers must not count as references.
+--workers 1 measures one core; the default uses all of them.
+
+    python bench_transcript_filter.py --mb 100
+"""
+import argparse
+import random
+import time
+
+from transcript_filter import extract_relevant
+
+SPEAKERS = ["Alice", "Bob", "Carol", "Dan", "Eve", "Frank"]
+CHATTER = [
+    "Maybe we should look at the numbers again.",
+    "I think the design is mostly fine as it is.",
+    "Goodbye for now, my other call is starting.",
+    "Standby, my screen share is frozen.",
+    "Can everyone hear me okay?",
+    "The customer feedback was broadly positive.",
+    "We saw a small dip in engagement last quarter.",
+    "Let me pull up the dashboard.",
+    "That sounds reasonable to me.",
+    "Nobody has strong objections to the plan.",
+]
+SIGNAL = [
+    "Tom will review the draft by Friday.",
+    "Let's follow up next week on Thursday at 3PM.",
+    "The deadline for the proposal is April 20.",
+    "Action item: Sarah to prepare the budget by end of month.",
+    "We meet again on 2025-05-02 at 10:00.",
+]
+
+
+def original_preprocess(transcript):
+    # Verbatim copy of the pre-filter logic being replaced
+    relevant_lines = []
+    for line in transcript.splitlines():
+        if "next week" in line.lower() or "by" in line.lower() or "date" in line.lower():
+            relevant_lines.append(line)
+    return "\n".join(relevant_lines)
+
+
+def make_transcript(megabytes, signal_rate=0.01, seed=0, timestamps=False):
+    rng = random.Random(seed)
+    target = megabytes * 1024 * 1024
+    lines, size = [], 0
+    while size < target:
+        text = rng.choice(SIGNAL) if rng.random() < signal_rate else rng.choice(CHATTER)
+        if timestamps:
+            seconds = len(lines) * 4 % 86400
+            line = f"[{seconds // 3600:02}:{seconds // 60 % 60:02}:{seconds % 60:02}] Speaker {rng.randrange(1, 7)}: {text}"
+        else:
+            line = f"{rng.choice(SPEAKERS)}: {text}"
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the transcript prefilter and report the prompt-token reduction.")
+    parser.add_argument("--mb", type=int, default=100, help="Size of the synthetic transcript in MB.")
+    parser.add_argument("--context-lines", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=None, help="Processes for large transcripts (default: all cores).")
+    args = parser.parse_args(argv)
+
+    for timestamps in (False, True):
+        transcript = make_transcript(args.mb, timestamps=timestamps)
+        print(f"\n{'timestamped' if timestamps else 'plain'} transcript: {len(transcript) / 1024 / 1024:.0f} MB, "
+              f"{transcript.count(chr(10)) + 1} lines")
+
+        start = time.perf_counter()
+        old = original_preprocess(transcript)
+        old_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        kept, report = extract_relevant(transcript, args.context_lines, workers=args.workers)
+        new_seconds = time.perf_counter() - start
+
+        mb = len(transcript) / 1024 / 1024
+        print(f"{'filter':22} {'seconds':>8} {'MB/s':>8} {'kept %':>8}")
+        print(f"{'substring (original)':22} {old_seconds:>8.2f} {mb / old_seconds:>8.1f} {100 * len(old) / len(transcript):>7.1f}%")
+        print(f"{'compiled windows':22} {new_seconds:>8.2f} {mb / new_seconds:>8.1f} {100 * len(kept) / len(transcript):>7.1f}%")
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
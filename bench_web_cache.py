@@ -0,0 +1,108 @@
+"""Bytes and time saved by the conditional-GET web cache.
+
+Serves generated HTML pages from a local http.server that honours
+If-None-Match and If-Modified-Since, then ingests them four times: cold,
+warm (everything 304), after editing one page, and offline.
+
+    python bench_web_cache.py --pages 20 --kb 200
+"""
+import argparse
+import email.utils
+import hashlib
+import http.server
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from web_cache import CachedWebLoader
+
+
+class ConditionalHandler(http.server.SimpleHTTPRequestHandler):
+    """SimpleHTTPRequestHandler plus strong ETags, with a count of body bytes sent."""
+
+    bytes_sent = 0
+
+    def do_GET(self):
+        path = self.translate_path(self.path)
+        if not os.path.isfile(path):
+            return super().do_GET()
+        with open(path, "rb") as f:
+            body = f.read()
+        etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+        last_modified = email.utils.formatdate(os.path.getmtime(path), usegmt=True)
+
+        not_modified = False
+        if "If-None-Match" in self.headers:
+            not_modified = self.headers["If-None-Match"] == etag
+        elif "If-Modified-Since" in self.headers:
+            since = email.utils.parsedate_to_datetime(self.headers["If-Modified-Since"])
+            not_modified = int(os.path.getmtime(path)) <= since.timestamp()
+
+        self.send_response(304 if not_modified else 200)
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", last_modified)
+        if not_modified:
+            self.end_headers()
+            return
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        ConditionalHandler.bytes_sent += len(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_page(index, kb, revision=0):
+    paragraph = f"<p>Register {index} of the 8085 holds 8 bits; revision {revision}. " + "Lorem ipsum dolor sit amet. " * 20 + "</p>\n"
+    body = paragraph * max(1, kb * 1024 // len(paragraph))
+    return f"<html><head><title>Page {index}</title><style>p {{}}</style></head><body>{body}</body></html>"
+
+
+def ingest(label, loader):
+    sent_before = ConditionalHandler.bytes_sent
+    start = time.perf_counter()
+    docs = loader.load()
+    seconds = time.perf_counter() - start
+    sent = ConditionalHandler.bytes_sent - sent_before
+    to_embed = sum(1 for result in loader.stats.results if result.changed)
+    print(f"{label:22} {seconds * 1000:>8.0f} {sent / 1024:>10.1f} {to_embed:>9} {len(docs):>6}   {loader.stats}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure conditional-GET savings on repeated web ingestion.")
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--kb", type=int, default=200, help="Approximate size of each page.")
+    args = parser.parse_args(argv)
+
+    root = tempfile.mkdtemp(prefix="bench_web_")
+    cache_dir = os.path.join(root, "cache")
+    site = os.path.join(root, "site")
+    os.makedirs(site)
+    for index in range(args.pages):
+        with open(os.path.join(site, f"page{index}.html"), "w") as f:
+            f.write(make_page(index, args.kb))
+
+    handler = lambda *a, **kw: ConditionalHandler(*a, directory=site, **kw)
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    urls = [f"http://127.0.0.1:{server.server_port}/page{index}.html" for index in range(args.pages)]
+
+    try:
+        print(f"{'run':22} {'ms':>8} {'KiB sent':>10} {'to embed':>9} {'docs':>6}")
+        ingest("cold", CachedWebLoader(urls, cache_dir=cache_dir))
+        ingest("warm (unchanged)", CachedWebLoader(urls, cache_dir=cache_dir))
+        with open(os.path.join(site, "page0.html"), "w") as f:
+            f.write(make_page(0, args.kb, revision=1))
+        ingest("one page edited", CachedWebLoader(urls, cache_dir=cache_dir))
+        ingest("offline", CachedWebLoader(urls, cache_dir=cache_dir, offline=True))
+    finally:
+        server.shutdown()
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
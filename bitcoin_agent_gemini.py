@@ -5,10 +5,12 @@ from dotenv import load_dotenv
 import requests
 import os
 
+from rate_limiter import scheduler_rate_limiter
+
 load_dotenv()
 os.environ["GOOGLE_API_KEY"] = os.getenv("GOOGLE_API_KEY")
 # Step 1: Initialize Gemini LLM
-llm = ChatGoogleGenerativeAI(model="gemini-2.0-pro-exp" , temperature=0.3)
+llm = ChatGoogleGenerativeAI(model="gemini-2.0-pro-exp" , temperature=0.3, rate_limiter=scheduler_rate_limiter("gemini"))
 
 # Step 2: Define a simple external tool (real-time Bitcoin price fetcher)
 def get_bitcoin_price():
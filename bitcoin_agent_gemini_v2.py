@@ -7,6 +7,8 @@ from dotenv import load_dotenv
 import requests
 import os
 
+from rate_limiter import scheduler_rate_limiter
+
 load_dotenv()
 os.environ["GOOGLE_API_KEY"] = os.getenv("GOOGLE_API_KEY")
 
@@ -18,7 +20,7 @@ def get_bitcoin_price():
     return data
 
 # Gemini chat model
-llm = ChatGoogleGenerativeAI(model="gemini-2.0-pro-exp", temperature=0)
+llm = ChatGoogleGenerativeAI(model="gemini-2.0-pro-exp", temperature=0, rate_limiter=scheduler_rate_limiter("gemini"))
 
 # Custom prompt
 prompt = ChatPromptTemplate.from_messages([
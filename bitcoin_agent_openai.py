@@ -6,6 +6,8 @@ from dotenv import load_dotenv
 import requests
 import os
 
+from rate_limiter import scheduler_rate_limiter
+
 load_dotenv()
 os.environ["OPENAI_API_KEY"] = os.getenv("OPENAI_API_KEY")
 
@@ -17,7 +19,7 @@ def get_bitcoin_price() -> str:
     return f"Bitcoin price is {data}"
     print(f"Bitcoin price is {data}")
 
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+llm = ChatOpenAI(model="gpt-4o-mini", temperature=0, rate_limiter=scheduler_rate_limiter("openai"))
 
 tools = [get_bitcoin_price]
 
@@ -0,0 +1,282 @@
+"""Local Calendar event index kept current with incremental sync.
+
+    index = get_event_index()
+    event, created = schedule_event(body, event_id=event_id(key, "event"), index=index)
+
+The first sync lists the calendar once from `lookback_days` ago and keeps
+the returned sync token. Later syncs send that token, so the API returns
+only the events created, changed or cancelled since then, usually one
+small page. If the server answers 410 Gone, the token has expired and the
+index re-syncs from scratch. The index is a JSON file (.calendar_index.json
+by default, or CALENDAR_INDEX_PATH), rewritten atomically after any sync
+that changed it.
+
+Before an insert, find_duplicate checks the buckets around the new event's
+start. An event with the same id, or created for the same `source` (the
+transcript key, kept in the event's private extendedProperties), is the
+same meeting. An event from a different source never is. Otherwise a
+candidate within `window` has to agree on content. Title and description
+are reduced to content words, dropping generic meeting words ("follow-up",
+"meeting", "sync"), dates and times. Every text both events have must
+reach `threshold` Jaccard similarity, and at least one must exist. So
+"Follow-up: Q3 roadmap" matches "Q3 roadmap meeting", but two
+"Follow-up Meeting" events that only say "let's follow up on Thursday"
+never match. Buckets hold one hour of starts in the index's timezone, so
+a check with the default one-hour window compares only the few events in
+three buckets. That takes microseconds and needs no API call. Inserts made
+through schedule_event are recorded immediately, so back-to-back runs see
+each other's events before the next sync.
+"""
+import calendar
+import datetime
+import json
+import os
+import re
+import threading
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+from google_services import get_calendar_service, insert_event
+from temporal import DEFAULT_TIMEZONE
+
+DEFAULT_WINDOW = datetime.timedelta(hours=1)
+SOURCE_PROPERTY = "meetingSource"
+_WORD = re.compile(r"[a-z][\w']*|\d*[a-z]+\d[\w]*", re.I)  # no bare numbers or times like "3pm"
+# Words that say nothing about which meeting it is: generic meeting words, scheduling talk and dates
+_GENERIC = frozenset(
+    """meeting meetings meet call sync session follow up followup catch check in review demo standup workshop
+    discussion next new quick weekly team again let let's lets we we'll will shall should can could us our you
+    i i'll it the a an with on for of and to re at by about up from please everyone schedule set book
+    today tomorrow morning afternoon evening noon week month day am pm""".split()
+    + [name.lower() for name in calendar.day_name] + [name.lower() for name in calendar.month_name if name]
+    + [name.lower()[:3] for name in calendar.month_name if name]
+)
+
+
+def content_words(text):
+    return frozenset(word for word in _WORD.findall((text or "").lower()) if word not in _GENERIC)
+
+
+def _jaccard(a, b):
+    return len(a & b) / len(a | b) if a and b else None
+
+
+def title_similarity(a, b):
+    """Jaccard similarity of two titles' content words; 0.0 if either is generic ("Follow-up Meeting")."""
+    return _jaccard(content_words(a), content_words(b)) or 0.0
+
+
+def match_score(title_words, description_words, other_title_words, other_description_words, threshold=0.5):
+    """Mean similarity of the texts both events have, or None unless each reaches `threshold`."""
+    scores = [
+        score for score in (_jaccard(title_words, other_title_words), _jaccard(description_words, other_description_words))
+        if score is not None
+    ]
+    if not scores or min(scores) < threshold:
+        return None
+    return sum(scores) / len(scores)
+
+
+def event_source(event):
+    return event.get("extendedProperties", {}).get("private", {}).get(SOURCE_PROPERTY)
+
+
+def event_start(event, tz=DEFAULT_TIMEZONE):
+    """Aware start datetime of a Calendar event body (all-day events start at midnight)."""
+    start = event.get("start", {})
+    if start.get("dateTime"):
+        value = datetime.datetime.fromisoformat(start["dateTime"].replace("Z", "+00:00"))
+        return value if value.tzinfo else value.replace(tzinfo=ZoneInfo(start.get("timeZone") or tz))
+    if start.get("date"):
+        return datetime.datetime.combine(datetime.date.fromisoformat(start["date"]), datetime.time(), ZoneInfo(tz))
+    return None
+
+
+def _is_gone(error):
+    return getattr(getattr(error, "resp", None), "status", None) == 410
+
+
+class SyncStats:
+    def __init__(self, full=False):
+        self.full = full
+        self.pages = 0
+        self.upserted = 0
+        self.removed = 0
+
+    def __str__(self):
+        kind = "full" if self.full else "incremental"
+        return f"{kind} sync: {self.pages} page(s), {self.upserted} upserted, {self.removed} removed"
+
+
+class EventIndex:
+    def __init__(self, path=".calendar_index.json", calendar_id="primary", service=None, lookback_days=30, tz=DEFAULT_TIMEZONE):
+        self.path = path
+        self.calendar_id = calendar_id
+        self._service = service
+        self.lookback_days = lookback_days
+        self.tz = tz
+        self._zone = ZoneInfo(tz)
+        self._lock = threading.RLock()
+        self.sync_token = None
+        self.events = {}     # id -> {"summary", "start", "htmlLink", "description_words", "source"}, as saved
+        self._parsed = {}    # id -> (aware start, title words, description words)
+        self._by_hour = {}   # start truncated to the hour -> set of ids
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                data = json.load(f)
+            if data.get("calendar_id") == calendar_id:
+                self.sync_token = data.get("sync_token")
+                for event_id, entry in data.get("events", {}).items():
+                    self._add(event_id, entry)
+
+    @property
+    def service(self):
+        return self._service or get_calendar_service()
+
+    # ------------- INDEX ------------- #
+    @staticmethod
+    def _hour(start):
+        return start.replace(minute=0, second=0, microsecond=0)
+
+    def _add(self, event_id, entry):
+        self._remove(event_id)
+        start = datetime.datetime.fromisoformat(entry["start"])
+        self.events[event_id] = entry
+        # Index files written before description_words kept a truncated "description" instead
+        description_words = entry.get("description_words")
+        description_words = content_words(entry.get("description")) if description_words is None else frozenset(description_words)
+        self._parsed[event_id] = (start, content_words(entry.get("summary")), description_words)
+        self._by_hour.setdefault(self._hour(start), set()).add(event_id)
+
+    def _remove(self, event_id):
+        if self.events.pop(event_id, None) is None:
+            return False
+        start = self._parsed.pop(event_id)[0]
+        bucket = self._by_hour.get(self._hour(start))
+        if bucket is not None:
+            bucket.discard(event_id)
+            if not bucket:
+                del self._by_hour[self._hour(start)]
+        return True
+
+    def record(self, event):
+        """Adds or updates one API event body; cancelled or undated events are dropped."""
+        with self._lock:
+            if event.get("status") == "cancelled":
+                return self._remove(event["id"])
+            start = event_start(event, self.tz)
+            if start is None:
+                return False
+            start = start.astimezone(self._zone)
+            self._add(event["id"], {
+                "summary": event.get("summary", ""), "start": start.isoformat(), "htmlLink": event.get("htmlLink"),
+                # All of the description's content words, however long it is, so a long summary still matches itself
+                "description_words": sorted(content_words(event.get("description"))), "source": event_source(event),
+            })
+            return True
+
+    def find_duplicate(self, title, start, window=DEFAULT_WINDOW, threshold=0.5, description=None, source=None, event_id=None):
+        """Returns the indexed event that is the same meeting as the new one, or None."""
+        with self._lock:
+            if event_id in self.events:
+                return dict(self.events[event_id], id=event_id)
+            start = start.replace(tzinfo=self._zone) if start.tzinfo is None else start.astimezone(self._zone)
+            best, best_score = None, 0.0
+            title_words, description_words = content_words(title), content_words(description)
+            hour = self._hour(start - window)
+            while hour <= start + window:
+                for other_id in self._by_hour.get(hour, ()):
+                    other_start, other_title_words, other_description_words = self._parsed[other_id]
+                    if abs(other_start - start) > window:
+                        continue
+                    entry = self.events[other_id]
+                    if source and entry.get("source"):
+                        score = 1.0 if entry["source"] == source else None
+                    else:
+                        score = match_score(title_words, description_words, other_title_words, other_description_words, threshold)
+                    if score is not None and score > best_score:
+                        best, best_score = dict(entry, id=other_id), score
+                hour += datetime.timedelta(hours=1)
+        return best
+
+    def __len__(self):
+        return len(self.events)
+
+    # ------------- SYNC ------------- #
+    def sync(self):
+        """Pulls changes since the last sync (everything on the first run) and saves the index."""
+        with self._lock:
+            try:
+                stats = self._pull(self.sync_token)
+            except Exception as e:
+                if not (self.sync_token and _is_gone(e)):
+                    raise
+                # Expired token: start over from a full listing
+                self.events.clear()
+                self._parsed.clear()
+                self._by_hour.clear()
+                stats = self._pull(None)
+            if stats.full or stats.upserted or stats.removed:
+                self.save()
+            return stats
+
+    def _pull(self, sync_token):
+        stats = SyncStats(full=sync_token is None)
+        params = {"calendarId": self.calendar_id, "showDeleted": True, "singleEvents": True, "maxResults": 250}
+        if sync_token:
+            params["syncToken"] = sync_token
+        else:
+            since = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=self.lookback_days)
+            params["timeMin"] = since.isoformat()
+        page_token = None
+        while True:
+            response = self.service.events().list(pageToken=page_token, **params).execute()
+            stats.pages += 1
+            for event in response.get("items", []):
+                if event.get("status") == "cancelled":
+                    stats.removed += self._remove(event["id"])
+                elif self.record(event):
+                    stats.upserted += 1
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                self.sync_token = response.get("nextSyncToken")
+                return stats
+
+    def save(self):
+        with self._lock:
+            data = json.dumps({"calendar_id": self.calendar_id, "sync_token": self.sync_token, "events": self.events})
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
+
+
+@lru_cache(maxsize=None)
+def get_event_index(calendar_id="primary"):
+    return EventIndex(os.getenv("CALENDAR_INDEX_PATH", ".calendar_index.json"), calendar_id)
+
+
+def with_source(event, source):
+    """Copy of `event` tagged with the meeting it came from, so later runs can recognise it."""
+    properties = dict(event.get("extendedProperties", {}))
+    properties["private"] = dict(properties.get("private", {}), **{SOURCE_PROPERTY: source})
+    return dict(event, extendedProperties=properties)
+
+
+def schedule_event(event, event_id=None, calendar_id="primary", index=None, window=DEFAULT_WINDOW, threshold=0.5, source=None):
+    """Inserts `event` unless the calendar already has the same meeting; returns (event, created)."""
+    index = get_event_index(calendar_id) if index is None else index
+    if source:
+        event = with_source(event, source)
+    index.sync()
+    start = event_start(event, index.tz)
+    if start is not None:
+        existing = index.find_duplicate(event.get("summary", ""), start, window, threshold,
+                                        description=event.get("description"), source=source, event_id=event_id)
+        if existing is not None:
+            print(f"Skipping duplicate of '{existing['summary']}' at {existing['start']}")
+            return existing, False
+    created = insert_event(event, event_id=event_id, calendar_id=calendar_id, service=index.service)
+    index.record(created)
+    index.save()
+    return created, True
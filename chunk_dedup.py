@@ -0,0 +1,226 @@
+"""Exact and near-duplicate chunk elimination before embedding.
+
+    docs = splitter.split_documents(all_docs)
+    docs, report = dedup_documents(docs, threshold=0.85)
+    print(report)
+
+Chunks are normalised (case, whitespace) and hashed to drop exact copies.
+The remainder get MinHash signatures over word shingles, and LSH banding
+finds candidate pairs. A pair is collapsed when its estimated Jaccard
+similarity reaches `threshold`. The first chunk of each group is kept, and
+the sources of everything collapsed into it are recorded in its metadata
+as `duplicate_sources` (a JSON string, since vector stores such as Chroma
+only accept scalar metadata) and `duplicate_count`.
+
+With `within="source"` chunks only collapse into chunks with the same
+metadata value. An index that replaces chunks per source needs this: a
+kept chunk must never stand in for another source's text, or deleting
+the first source would lose content the second one still has.
+"""
+import hashlib
+import json
+import re
+from dataclasses import dataclass
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+_WORD = re.compile(r"\w+")
+
+
+def normalize(text):
+    return " ".join(text.lower().split())
+
+
+def shingles(text, size=5):
+    words = _WORD.findall(text.lower())
+    if len(words) <= size:
+        return {" ".join(words)}
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def _hash64(value):
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _integrate(func, low, high, steps=100):
+    width = (high - low) / steps
+    return sum(func(low + (i + 0.5) * width) for i in range(steps)) * width
+
+
+def lsh_params(threshold, num_perm):
+    """Picks (bands, rows) whose S-curve crosses near `threshold`, weighting false negatives and positives equally."""
+    best, best_error = (num_perm, 1), float("inf")
+    for bands in range(1, num_perm + 1):
+        rows = num_perm // bands
+        # Probability that a pair with Jaccard similarity s shares at least one band
+        collide = lambda s: 1 - (1 - s ** rows) ** bands
+        error = _integrate(collide, 0.0, threshold) + _integrate(lambda s: 1 - collide(s), threshold, 1.0)
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+class MinHasher:
+    def __init__(self, num_perm=128, seed=1):
+        import random
+
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        # 32-bit coefficients and inputs keep a * x + b inside 64 bits for the numpy path
+        self.a = [rng.randrange(1, MAX_HASH) for _ in range(num_perm)]
+        self.b = [rng.randrange(0, MAX_HASH) for _ in range(num_perm)]
+        try:
+            import numpy
+        except ImportError:
+            self._np = None
+        else:
+            self._np = numpy
+            self._a = numpy.array(self.a, dtype=numpy.uint64)
+            self._b = numpy.array(self.b, dtype=numpy.uint64)
+
+    def signature(self, shingle_set):
+        hashes = [_hash64(shingle) & MAX_HASH for shingle in shingle_set]
+        if self._np is not None:
+            np = self._np
+            values = np.array(hashes, dtype=np.uint64)[:, None]
+            permuted = (values * self._a + self._b) % np.uint64(MERSENNE_PRIME) & np.uint64(MAX_HASH)
+            return tuple(permuted.min(axis=0).tolist())
+        return tuple(
+            min(((a * h + b) % MERSENNE_PRIME) & MAX_HASH for h in hashes)
+            for a, b in zip(self.a, self.b)
+        )
+
+
+def estimated_jaccard(sig_a, sig_b):
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+
+@dataclass
+class DedupReport:
+    input_chunks: int
+    exact_duplicates: int
+    near_duplicates: int
+    input_chars: int
+    kept_chars: int
+    embedding_dim: int = 1536
+
+    @property
+    def kept(self):
+        return self.input_chunks - self.exact_duplicates - self.near_duplicates
+
+    @property
+    def embedding_calls_saved(self):
+        return self.exact_duplicates + self.near_duplicates
+
+    @property
+    def index_bytes_saved(self):
+        # float32 vector plus stored text for every chunk that is not indexed
+        return self.embedding_calls_saved * self.embedding_dim * 4 + (self.input_chars - self.kept_chars)
+
+    def __str__(self):
+        removed = self.embedding_calls_saved
+        return (
+            f"dedup: {self.input_chunks} -> {self.kept} chunks ({self.exact_duplicates} exact, {self.near_duplicates} near); "
+            f"{removed} embedding calls saved ({100 * removed / max(1, self.input_chunks):.1f}%), "
+            f"~{self.index_bytes_saved / 1024:.0f} KiB index size saved"
+        )
+
+
+def _provenance(doc):
+    meta = doc.metadata or {}
+    return {key: meta[key] for key in ("source", "page", "title") if key in meta}
+
+
+def dedup_documents(docs, threshold=0.85, num_perm=128, shingle_size=5, embedding_dim=1536, within=None):
+    """Returns (kept_docs, DedupReport). Kept documents preserve input order.
+
+    With `within` (a metadata key), only chunks sharing that value are compared.
+    """
+    docs = list(docs)
+    groups = {}
+    for position, doc in enumerate(docs):
+        key = (doc.metadata or {}).get(within) if within else None
+        groups.setdefault(key, []).append(position)
+    kept, exact, near = [], 0, 0
+    for positions in groups.values():
+        group_kept, group_exact, group_near = _dedup_group([docs[p] for p in positions], threshold, num_perm, shingle_size)
+        kept.extend((positions[index], doc) for index, doc in group_kept)
+        exact += group_exact
+        near += group_near
+    kept = [doc for _, doc in sorted(kept, key=lambda item: item[0])]
+
+    report = DedupReport(
+        input_chunks=len(docs),
+        exact_duplicates=exact,
+        near_duplicates=near,
+        input_chars=sum(len(doc.page_content) for doc in docs),
+        kept_chars=sum(len(doc.page_content) for doc in kept),
+        embedding_dim=embedding_dim,
+    )
+    return kept, report
+
+
+def _dedup_group(docs, threshold, num_perm, shingle_size):
+    """Returns ([(input index, kept doc)], exact count, near count)."""
+    exact_copies = {}
+    exact_index = {}
+    exact = near = 0
+
+    # Pass 1: exact duplicates of normalised text
+    unique, positions = [], []
+    for position, doc in enumerate(docs):
+        digest = hashlib.sha256(normalize(doc.page_content).encode("utf-8")).hexdigest()
+        if digest in exact_index:
+            exact_copies.setdefault(exact_index[digest], []).append(doc)
+            exact += 1
+            continue
+        exact_index[digest] = len(unique)
+        unique.append(doc)
+        positions.append(position)
+
+    # Pass 2: MinHash + LSH near duplicates among the unique chunks
+    bands, rows = lsh_params(threshold, num_perm)
+    hasher = MinHasher(bands * rows)
+    buckets = [{} for _ in range(bands)]
+    signatures = []
+    representative = {}
+    for index, doc in enumerate(unique):
+        signature = hasher.signature(shingles(doc.page_content, shingle_size))
+        signatures.append(signature)
+        match = None
+        for band, bucket in enumerate(buckets):
+            key = signature[band * rows:(band + 1) * rows]
+            for candidate in bucket.get(key, ()):
+                if estimated_jaccard(signature, signatures[candidate]) >= threshold:
+                    match = candidate
+                    break
+            if match is not None:
+                break
+        if match is not None:
+            representative[index] = representative[match]
+            near += 1
+            continue
+        representative[index] = index
+        for band, bucket in enumerate(buckets):
+            bucket.setdefault(signature[band * rows:(band + 1) * rows], []).append(index)
+
+    # Every collapsed chunk, exact or near, is credited to its group's first chunk
+    collapsed = {}
+    for index, doc in enumerate(unique):
+        root = representative[index]
+        group = collapsed.setdefault(root, [])
+        if root != index:
+            group.append(doc)
+        group.extend(exact_copies.get(index, ()))
+
+    kept = []
+    for index, doc in enumerate(unique):
+        if representative[index] != index:
+            continue
+        duplicates = collapsed[index]
+        if duplicates:
+            sources = [_provenance(doc)] + [_provenance(dup) for dup in duplicates]
+            metadata = dict(doc.metadata, duplicate_sources=json.dumps(sources), duplicate_count=len(duplicates))
+            doc = type(doc)(page_content=doc.page_content, metadata=metadata)
+        kept.append((positions[index], doc))
+    return kept, exact, near
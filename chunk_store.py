@@ -0,0 +1,130 @@
+"""Compact chunk storage: one text buffer per source, chunks as offsets.
+
+split_documents returns one Document per chunk, each with its own copy of
+the text (overlap included) and its own metadata dict. ChunkStore keeps
+each source's text once. Chunks are (source id, start, end) rows in
+array-backed columns, and metadata dicts are interned, so identical
+metadata is stored once. Documents are built only when asked for, e.g.
+for the k chunks handed to the LLM.
+
+    store = ChunkStore.from_documents(docs, splitter)
+    store.text(i)            # str slice, no Document
+    store.document(i)        # Document materialised on demand
+    store.lazy_documents()   # Sequence view for retrievers
+
+basic_rag_chroma.py keeps its session's chunks this way, for Chroma
+ingest and the --stream keyword index. basic_multi_source_rag.py does
+not: Chroma takes Documents at ingest and keeps the text itself, and
+the script drops its chunk list once they are added, so there is
+nothing for a store to hold.
+"""
+import json
+import sys
+from array import array
+from collections.abc import Sequence
+
+
+class LazyDocuments(Sequence):
+    """Read-only sequence that materialises a Document per index access."""
+
+    def __init__(self, store):
+        self._store = store
+
+    def __len__(self):
+        return len(self._store)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._store.document(i) for i in range(*index.indices(len(self)))]
+        return self._store.document(index)
+
+
+class ChunkStore:
+    def __init__(self):
+        self._buffers = []          # source text, one str per source
+        self._source_metadata = array("I")  # source id -> interned metadata id
+        self._metadata = []         # interned metadata dicts
+        self._metadata_ids = {}
+        self.source_ids = array("I")
+        self.starts = array("I")
+        self.ends = array("I")
+
+    def __len__(self):
+        return len(self.starts)
+
+    def _intern(self, metadata):
+        key = json.dumps(metadata, sort_keys=True, default=str)
+        metadata_id = self._metadata_ids.get(key)
+        if metadata_id is None:
+            metadata_id = self._metadata_ids[key] = len(self._metadata)
+            self._metadata.append(dict(metadata))
+        return metadata_id
+
+    def add_source(self, text, metadata=None):
+        self._buffers.append(text)
+        self._source_metadata.append(self._intern(metadata or {}))
+        return len(self._buffers) - 1
+
+    def add_chunk(self, source_id, start, end):
+        self.source_ids.append(source_id)
+        self.starts.append(start)
+        self.ends.append(end)
+
+    def add_split(self, text, chunks, metadata=None):
+        """Records splitter output for one source, locating each chunk in `text`."""
+        source_id = self.add_source(text, metadata)
+        position = 0
+        for chunk in chunks:
+            start = text.find(chunk, position)
+            if start < 0:
+                # The splitter rewrote this chunk (e.g. joined with a separator), so keep it verbatim
+                self.add_chunk(self.add_source(chunk, metadata), 0, len(chunk))
+                continue
+            self.add_chunk(source_id, start, start + len(chunk))
+            position = start + 1
+        return source_id
+
+    @classmethod
+    def from_documents(cls, docs, splitter):
+        store = cls()
+        for doc in docs:
+            store.add_split(doc.page_content, splitter.split_text(doc.page_content), doc.metadata)
+        return store
+
+    def text(self, index):
+        return self._buffers[self.source_ids[index]][self.starts[index]:self.ends[index]]
+
+    def texts(self):
+        buffers, starts, ends = self._buffers, self.starts, self.ends
+        for source_id, start, end in zip(self.source_ids, starts, ends):
+            yield buffers[source_id][start:end]
+
+    def metadata(self, index):
+        """The shared metadata dict for chunk `index`; copy it before mutating."""
+        return self._metadata[self._source_metadata[self.source_ids[index]]]
+
+    def document(self, index, add_start_index=False):
+        from langchain_core.documents import Document
+
+        metadata = dict(self.metadata(index))
+        if add_start_index:
+            metadata["start_index"] = self.starts[index]
+        return Document(page_content=self.text(index), metadata=metadata)
+
+    def lazy_documents(self):
+        return LazyDocuments(self)
+
+    def text_chars(self):
+        return sum(end - start for start, end in zip(self.starts, self.ends))
+
+    def stats(self):
+        buffer_chars = sum(len(buffer) for buffer in self._buffers)
+        return {
+            "chunks": len(self),
+            "sources": len(self._buffers),
+            "unique_metadata": len(self._metadata),
+            "buffer_chars": buffer_chars,
+            "buffer_bytes": sum(sys.getsizeof(buffer) for buffer in self._buffers),
+            "chunk_chars": self.text_chars(),
+            "column_bytes": sum(column.itemsize * len(column) for column in (self.source_ids, self.starts, self.ends)),
+        }
@@ -0,0 +1,152 @@
+"""In-memory stand-in for the Calendar v3 discovery client.
+
+    service = FakeCalendarService(latency=0.05)
+    index = EventIndex(path, service=service)
+
+It supports the calls the pipelines make: events().list/insert/get/patch/delete(...).execute().
+Behaviour follows the real API where the sync code depends on it:
+- list pages results (maxResults, pageToken) and returns nextSyncToken on
+  the last page.
+- With syncToken, list returns only events changed since then, including
+  deletions as status "cancelled".
+- expire_sync_tokens() makes older tokens fail with 410 Gone.
+- Inserting an existing id fails with 409.
+
+Every request sleeps `latency` seconds and is counted in `requests`.
+"""
+import datetime
+import itertools
+import threading
+import time
+import uuid
+from collections import Counter
+
+
+class FakeHttpError(Exception):
+    """Mimics googleapiclient's HttpError closely enough for `error.resp.status` checks."""
+
+    class _Response:
+        def __init__(self, status):
+            self.status = status
+
+    def __init__(self, status, message):
+        super().__init__(f"<HttpError {status}: {message}>")
+        self.resp = self._Response(status)
+
+
+def _start_of(event):
+    start = event.get("start", {})
+    return start.get("dateTime") or start.get("date") or ""
+
+
+class _Request:
+    def __init__(self, service, method, func):
+        self.service, self.method, self.func = service, method, func
+
+    def execute(self):
+        self.service.requests[self.method] += 1
+        if self.service.latency:
+            time.sleep(self.service.latency)
+        with self.service._lock:
+            return self.func()
+
+
+class _Events:
+    def __init__(self, service):
+        self.service = service
+
+    def list(self, calendarId="primary", syncToken=None, pageToken=None, maxResults=250, showDeleted=False,
+             singleEvents=False, timeMin=None, **kwargs):
+        return _Request(self.service, "list", lambda: self.service._list(syncToken, pageToken, maxResults, showDeleted, timeMin))
+
+    def insert(self, calendarId="primary", body=None, **kwargs):
+        return _Request(self.service, "insert", lambda: self.service._insert(body or {}))
+
+    def get(self, calendarId="primary", eventId=None, **kwargs):
+        return _Request(self.service, "get", lambda: dict(self.service._get(eventId)))
+
+    def patch(self, calendarId="primary", eventId=None, body=None, **kwargs):
+        return _Request(self.service, "patch", lambda: self.service._patch(eventId, body or {}))
+
+    def delete(self, calendarId="primary", eventId=None, **kwargs):
+        return _Request(self.service, "delete", lambda: self.service._delete(eventId))
+
+
+class FakeCalendarService:
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.requests = Counter()
+        self._events = {}            # id -> event, cancelled ones kept as tombstones
+        self._changed_at = {}        # id -> sequence number of its last change
+        self._sequence = itertools.count(1)
+        self._current = 0
+        self._token_epoch = 0
+        self._lock = threading.Lock()
+
+    def events(self):
+        return _Events(self)
+
+    # ------------- STATE CHANGES ------------- #
+    def _touch(self, event_id):
+        self._current = next(self._sequence)
+        self._changed_at[event_id] = self._current
+        self._events[event_id]["updated"] = datetime.datetime.now(datetime.timezone.utc).isoformat()
+
+    def _insert(self, body):
+        event_id = body.get("id") or uuid.uuid4().hex
+        if event_id in self._events and self._events[event_id].get("status") != "cancelled":
+            raise FakeHttpError(409, "The requested identifier already exists.")
+        event = dict(body, id=event_id, status="confirmed", htmlLink=f"https://calendar.fake/event?eid={event_id}")
+        self._events[event_id] = event
+        self._touch(event_id)
+        return dict(event)
+
+    def _get(self, event_id):
+        if event_id not in self._events:
+            raise FakeHttpError(404, "Not Found")
+        return self._events[event_id]
+
+    def _patch(self, event_id, body):
+        event = self._get(event_id)
+        event.update(body)
+        self._touch(event_id)
+        return dict(event)
+
+    def _delete(self, event_id):
+        event = self._get(event_id)
+        if event.get("status") == "cancelled":
+            raise FakeHttpError(410, "Resource has been deleted")
+        event["status"] = "cancelled"
+        self._touch(event_id)
+        return ""
+
+    def expire_sync_tokens(self):
+        """Invalidates every sync token issued so far, as the server does after a while."""
+        self._token_epoch += 1
+
+    # ------------- LISTING ------------- #
+    def _list(self, sync_token, page_token, max_results, show_deleted, time_min):
+        if sync_token is not None:
+            _, epoch, since = sync_token.split("-")
+            since = int(since)
+            if int(epoch) != self._token_epoch:
+                raise FakeHttpError(410, "Sync token is no longer valid, a full sync is required.")
+            items = [self._events[i] for i, seq in self._changed_at.items() if seq > since]
+        else:
+            items = [
+                event for event in self._events.values()
+                if (show_deleted or event.get("status") != "cancelled") and (time_min is None or _start_of(event) >= time_min)
+            ]
+        # Page tokens carry the snapshot sequence so paging is stable while events change
+        if page_token:
+            offset, snapshot = (int(part) for part in page_token.split(":"))
+        else:
+            offset, snapshot = 0, self._current
+        items = sorted((e for e in items if self._changed_at[e["id"]] <= snapshot), key=lambda e: e["id"])
+        page = [dict(event) for event in items[offset:offset + max_results]]
+        response = {"items": page}
+        if offset + max_results < len(items):
+            response["nextPageToken"] = f"{offset + max_results}:{snapshot}"
+        else:
+            response["nextSyncToken"] = f"sync-{self._token_epoch}-{snapshot}"
+        return response
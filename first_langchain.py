@@ -9,13 +9,15 @@ import os
 from langchain.prompts import PromptTemplate
 from langchain.chains import LLMChain
 
+from rate_limiter import RateLimitedChatModel
+
 # Load your .env file
 load_dotenv()
 # Set up your key
 os.environ["GOOGLE_API_KEY"] = os.getenv("GOOGLE_API_KEY")
 
-# Initialize Gemini Pro
-llm = ChatGoogleGenerativeAI(model="gemini-2.0-pro-exp", temperature=0.7)
+# Initialize Gemini Pro, called through the shared rate-limit scheduler
+llm = RateLimitedChatModel(ChatGoogleGenerativeAI(model="gemini-2.0-pro-exp", temperature=0.7), "gemini").as_runnable()
 
 # Define a reusable prompt with a variable
 prompt = PromptTemplate(
@@ -0,0 +1,133 @@
+import os
+from functools import lru_cache
+
+# ------------- GOOGLE AUTH ------------- #
+# Credentials and API clients are built on first use instead of at import
+# time, so `--help` and cache-hit paths never touch OAuth or discovery.
+SCOPES = [
+    'https://www.googleapis.com/auth/drive.file',
+    'https://www.googleapis.com/auth/calendar'
+]
+
+
+@lru_cache(maxsize=None)
+def get_credentials(token_path='token.json', client_secret_path=None):
+    from google.oauth2.credentials import Credentials
+    from google_auth_oauthlib.flow import InstalledAppFlow
+    from google.auth.transport.requests import Request
+
+    client_secret_path = client_secret_path or os.getenv("GOOGLE_CLIENT_SECRET_PATH") or 'credentials.json'
+
+    creds = None
+    if os.path.exists(token_path):
+        creds = Credentials.from_authorized_user_file(token_path, SCOPES)
+    if not creds or not creds.valid:
+        if creds and creds.expired and creds.refresh_token:
+            creds.refresh(Request())
+        else:
+            flow = InstalledAppFlow.from_client_secrets_file(client_secret_path, SCOPES)
+            creds = flow.run_local_server(port=0)
+        with open(token_path, 'w') as token:
+            token.write(creds.to_json())
+    return creds
+
+
+@lru_cache(maxsize=None)
+def get_calendar_service():
+    from googleapiclient.discovery import build
+    return build('calendar', 'v3', credentials=get_credentials(), cache_discovery=False)
+
+
+@lru_cache(maxsize=None)
+def get_drive_service():
+    from googleapiclient.discovery import build
+    return build('drive', 'v3', credentials=get_credentials(), cache_discovery=False)
+
+
+def _is_conflict(error):
+    return getattr(getattr(error, 'resp', None), 'status', None) == 409
+
+
+def insert_event(event, event_id=None, calendar_id='primary', service=None):
+    """Inserts one event and returns it.
+
+    With `event_id` the insert is idempotent: a 409 means an earlier attempt
+    already created it, so the existing event is returned instead.
+    """
+    service = service or get_calendar_service()
+    if event_id:
+        event = dict(event, id=event_id)
+    try:
+        return service.events().insert(calendarId=calendar_id, body=event).execute()
+    except Exception as e:
+        if not (event_id and _is_conflict(e)):
+            raise
+        return service.events().get(calendarId=calendar_id, eventId=event_id).execute()
+
+
+def insert_events(events, calendar_id='primary', batch_size=50):
+    """Inserts many events with batched Calendar requests.
+
+    Returns one (created_event, error) pair per input event, in order.
+    Events that carry an `id` and already exist count as created.
+    """
+    service = get_calendar_service()
+    results = [(None, None)] * len(events)
+    conflicts = []
+
+    def callback(request_id, response, exception):
+        index = int(request_id)
+        if exception is not None and events[index].get('id') and _is_conflict(exception):
+            conflicts.append(index)
+        results[index] = (response, exception)
+
+    # The Calendar API accepts at most 50 calls per batch request
+    for offset in range(0, len(events), batch_size):
+        batch = service.new_batch_http_request(callback=callback)
+        for index in range(offset, min(offset + batch_size, len(events))):
+            batch.add(service.events().insert(calendarId=calendar_id, body=events[index]), request_id=str(index))
+        batch.execute()
+
+    for index in conflicts:
+        try:
+            results[index] = (service.events().get(calendarId=calendar_id, eventId=events[index]['id']).execute(), None)
+        except Exception as e:
+            results[index] = (None, e)
+    return results
+
+
+def find_file(idempotency_key):
+    """Returns the ID of a Drive file previously uploaded with `idempotency_key`, or None."""
+    query = f"appProperties has {{ key='idempotencyKey' and value='{idempotency_key}' }} and trashed = false"
+    files = get_drive_service().files().list(q=query, fields='files(id)', pageSize=1).execute().get('files', [])
+    return files[0]['id'] if files else None
+
+
+def upload_file(file_path, file_name=None, mime_type='text/plain', idempotency_key=None):
+    """Uploads a local file to Drive and returns the new file ID.
+
+    With `idempotency_key` a file already uploaded under that key is reused.
+    """
+    from googleapiclient.http import MediaFileUpload
+
+    if idempotency_key:
+        existing = find_file(idempotency_key)
+        if existing:
+            return existing
+
+    file_metadata = {
+        'name': file_name or os.path.basename(file_path),
+        'mimeType': mime_type
+    }
+    if idempotency_key:
+        file_metadata['appProperties'] = {'idempotencyKey': idempotency_key}
+    media = MediaFileUpload(file_path, mimetype=mime_type)
+    file = get_drive_service().files().create(body=file_metadata, media_body=media, fields='id').execute()
+    return file['id']
+
+
+def upload_text_file(file_name, content, mime_type='text/plain', idempotency_key=None):
+    """Writes `content` to `file_name` and uploads it to Drive, returning the file ID."""
+    with open(file_name, 'w') as f:
+        f.write(content)
+    return upload_file(file_name, mime_type=mime_type, idempotency_key=idempotency_key)
@@ -0,0 +1,169 @@
+import asyncio
+import time
+from collections import deque
+
+# ------------- PROVIDER HEALTH ------------- #
+class CircuitBreaker:
+    """Skips a provider after `failure_threshold` consecutive errors.
+
+    Once `reset_timeout` seconds have passed, a single trial request is let
+    through (half-open); its outcome closes or re-opens the breaker.
+    """
+
+    def __init__(self, failure_threshold=3, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self):
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half-open" and not self.trial_in_flight:
+            self.trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    def release(self):
+        # A cancelled trial says nothing about health; let the next one through
+        self.trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self.trial_in_flight = False
+        if self.failures >= self.failure_threshold or self.opened_at is not None:
+            self.opened_at = time.monotonic()
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies for one provider."""
+
+    def __init__(self, window=200, min_samples=10):
+        self.samples = deque(maxlen=window)
+        self.min_samples = min_samples
+
+    def record(self, seconds):
+        self.samples.append(seconds)
+
+    def percentile(self, p, default=None):
+        if len(self.samples) < self.min_samples:
+            return default
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(p * len(ordered)))
+        return ordered[index]
+
+
+# Breakers and latency history are shared per provider name, so every chain
+# step that uses the same provider sees the same health information.
+_breakers = {}
+_latencies = {}
+
+def get_circuit_breaker(name):
+    if name not in _breakers:
+        _breakers[name] = CircuitBreaker()
+    return _breakers[name]
+
+def get_latency_tracker(name):
+    if name not in _latencies:
+        _latencies[name] = LatencyTracker()
+    return _latencies[name]
+
+
+# ------------- HEDGED MODEL ------------- #
+class AllProvidersFailed(RuntimeError):
+    pass
+
+
+class HedgedChatModel:
+    """Sends a request to the primary provider and hedges to backups.
+
+    `providers` is a list of (name, model) pairs in preference order; each
+    model only needs an `ainvoke` method. If the running provider has not
+    answered by its `hedge_percentile` latency (or `initial_hedge_delay`
+    until enough samples exist), the same request goes to the next healthy
+    provider. The first successful answer wins and the others are cancelled.
+    """
+
+    def __init__(self, providers, hedge_percentile=0.95, initial_hedge_delay=2.0):
+        self.providers = list(providers)
+        self.hedge_percentile = hedge_percentile
+        self.initial_hedge_delay = initial_hedge_delay
+
+    def hedge_delay(self, name):
+        return get_latency_tracker(name).percentile(self.hedge_percentile, default=self.initial_hedge_delay)
+
+    async def _call(self, name, model, input, config):
+        start = time.monotonic()
+        try:
+            result = await model.ainvoke(input, config=config)
+        except asyncio.CancelledError:
+            get_circuit_breaker(name).release()
+            raise
+        except Exception:
+            get_circuit_breaker(name).record_failure()
+            raise
+        get_latency_tracker(name).record(time.monotonic() - start)
+        get_circuit_breaker(name).record_success()
+        return result
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        remaining = list(self.providers)
+        pending = {}
+        last_launched = None
+        last_error = None
+
+        def launch():
+            # Start the next provider whose breaker lets a request through
+            nonlocal last_launched
+            while remaining:
+                name, model = remaining.pop(0)
+                if get_circuit_breaker(name).allow():
+                    pending[asyncio.ensure_future(self._call(name, model, input, config))] = name
+                    last_launched = name
+                    return
+
+        launch()
+        if not pending:
+            raise AllProvidersFailed("Every provider is currently tripped: " + ", ".join(name for name, _ in self.providers))
+        try:
+            while pending:
+                timeout = self.hedge_delay(last_launched) if remaining else None
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # Slower than the provider's usual tail latency: hedge
+                    launch()
+                    continue
+                for task in done:
+                    pending.pop(task)
+                    if task.exception() is None:
+                        return task.result()
+                    last_error = task.exception()
+                if not pending and remaining:
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+        raise AllProvidersFailed(f"All providers failed; last error: {last_error!r}") from last_error
+
+    def invoke(self, input, config=None, **kwargs):
+        return asyncio.run(self.ainvoke(input, config=config))
+
+    def as_runnable(self):
+        """Wraps the hedged model so it can be piped into LCEL chains."""
+        from langchain_core.runnables import RunnableLambda
+        return RunnableLambda(func=self.invoke, afunc=self.ainvoke, name="HedgedChatModel")
@@ -0,0 +1,273 @@
+"""Rolling meeting notes from a transcript that is still being written.
+
+Lines are read as they arrive, from a tailed file or stdin, and grouped into
+segments of about `segment_tokens` tokens. A segment is also closed once
+`max_wait` seconds have passed since its first line, so quiet meetings
+still get updates. A background worker folds each segment into the notes
+with one LLM call. The call sees the current summary, which is capped at
+`max_summary_words`, plus the new segment, and returns the updated summary
+and any new action items and follow-up events. Every call therefore has
+bounded input, and the tokens processed grow linearly with the transcript.
+If segments queue up behind a slow call, they are merged into one update.
+
+When the input ends, only the last partial segment is left to fold in, so
+the final notes are ready one update after the meeting ends. The input
+ends as soon as a line reading END_MARKER ("[END OF MEETING]") arrives,
+at EOF on stdin, or on Ctrl-C (SIGINT), which flushes what has arrived
+so far. The idle timeout is only a fallback for a writer that just
+stops: it adds its full length to the wait for the final notes.
+
+    notes = LiveSummarizer(update).run(follow_lines("meeting.txt", idle_timeout=120))
+    notes = LiveSummarizer(update).run(follow_lines("-"))    # stdin until EOF or the end marker
+
+`update(summary, segment)` returns the model's text in the LIVE_UPDATE_TEMPLATE
+format.
+"""
+import os
+import queue
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+
+from rate_limiter import estimate_tokens
+from temporal import extract_events, format_event, pick_event
+
+LIVE_UPDATE_TEMPLATE = """
+    You are keeping live notes for a meeting that is still in progress.
+
+    Summary so far:
+    {summary}
+
+    New part of the transcript:
+    {transcript}
+
+    Reply with exactly these three sections:
+    SUMMARY:
+    <the summary so far updated with the new part, at most {max_words} words>
+    ACTION ITEMS:
+    - <each new action item from the new part, with its owner; "- none" if there are none>
+    EVENTS:
+    - <each follow-up meeting or deadline mentioned in the new part, with its date and time; "- none" if there are none>
+    """
+
+_SECTION = re.compile(r"^\s*(SUMMARY|ACTION ITEMS|EVENTS):\s*$", re.MULTILINE)
+
+
+def parse_update(text):
+    """Splits an update reply into (summary, action items, events); unformatted replies count as a summary."""
+    parts = _SECTION.split(text)
+    if len(parts) == 1:
+        return text.strip(), [], []
+    sections = dict(zip(parts[1::2], parts[2::2]))
+
+    def bullets(name):
+        items = []
+        for line in sections.get(name, "").splitlines():
+            item = line.strip().lstrip("-*• ").strip()
+            if item and item.lower().rstrip(".") not in ("none", "n/a"):
+                items.append(item)
+        return items
+
+    return sections.get("SUMMARY", "").strip(), bullets("ACTION ITEMS"), bullets("EVENTS")
+
+
+def _normalize(item):
+    return " ".join(re.findall(r"\w+", item.lower()))
+
+
+@dataclass
+class LiveNotes:
+    summary: str = ""
+    action_items: list = field(default_factory=list)
+    events: list = field(default_factory=list)      # free-text events from the model
+    local_events: list = field(default_factory=list)  # events whose date resolved locally
+    segments: int = 0
+    updates: int = 0
+    input_tokens: int = 0
+    transcript_tokens: int = 0
+
+    def add_items(self, target, items):
+        seen = {_normalize(item) for item in target}
+        for item in items:
+            key = _normalize(item)
+            if key and key not in seen:
+                seen.add(key)
+                target.append(item)
+
+    def render(self):
+        """Summary plus bullet-point action items, the format the batch summary prompt produces."""
+        lines = [self.summary.strip(), "", "Action items:"]
+        lines += [f"- {item}" for item in self.action_items] or ["- none"]
+        return "\n".join(lines)
+
+    def calendar_text(self):
+        """The locally resolved follow-up as a Title/Date/Time/Description block, if one clearly wins."""
+        event = pick_event(self.local_events)
+        return format_event(event) if event else None
+
+
+class LiveSummarizer:
+    def __init__(self, update, segment_tokens=600, max_wait=120.0, max_summary_words=250, on_update=None):
+        self.update = update
+        self.segment_tokens = segment_tokens
+        self.max_wait = max_wait
+        self.max_summary_words = max_summary_words
+        self.on_update = on_update
+        self.notes = LiveNotes()
+        self.lines = []           # the whole transcript, for checkpoint keys and the Drive upload
+        self.final_lag = None     # seconds from end of input to final notes
+        self._pending, self._pending_tokens, self._pending_since = [], 0, None
+        self._queue = queue.Queue()
+        self._error = None
+        self._worker = threading.Thread(target=self._work, daemon=True)
+        self._worker.start()
+
+    @property
+    def transcript(self):
+        return "\n".join(self.lines)
+
+    def feed(self, line):
+        """Adds one transcript line; None is an idle tick that only checks the segment timer."""
+        if line is not None:
+            line = line.rstrip("\n")
+            self.lines.append(line)
+            if line.strip():
+                if not self._pending:
+                    self._pending_since = time.monotonic()
+                self._pending.append(line)
+                self._pending_tokens += estimate_tokens(line) + 1
+        if self._pending and (
+            self._pending_tokens >= self.segment_tokens or time.monotonic() - self._pending_since >= self.max_wait
+        ):
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            self._queue.put("\n".join(self._pending))
+            self._pending, self._pending_tokens, self._pending_since = [], 0, None
+
+    def close(self):
+        """Flushes the last partial segment and waits for the notes to catch up."""
+        ended = time.monotonic()
+        self.flush()
+        self._queue.put(None)
+        self._worker.join()
+        self.final_lag = time.monotonic() - ended
+        if self._error is not None:
+            raise self._error
+        return self.notes
+
+    def run(self, lines):
+        try:
+            for line in lines:
+                self.feed(line)
+        except KeyboardInterrupt:
+            print("\nInterrupted; finishing the notes from what has arrived so far.", file=sys.stderr)
+        return self.close()
+
+    def _work(self):
+        done = False
+        while not done:
+            segments = [self._queue.get()]
+            # Merge whatever queued up behind the previous call into a single update
+            while True:
+                try:
+                    segments.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in segments:
+                segments, done = segments[:segments.index(None)], True
+            if segments and self._error is None:
+                try:
+                    self._apply("\n".join(segments), len(segments))
+                except Exception as e:
+                    # Keep draining the queue so close() returns; the error is raised there
+                    self._error = e
+
+    def _apply(self, segment, segment_count):
+        notes = self.notes
+        notes.local_events.extend(
+            event for event in extract_events(segment)
+            if all(event["start"] != known["start"] for known in notes.local_events)
+        )
+        summary, action_items, events = parse_update(self.update(notes.summary or "(nothing yet)", segment))
+        words = summary.split()
+        if len(words) > 2 * self.max_summary_words:
+            # Hard cap so the next call's input stays bounded even if the model ignores the limit
+            summary = " ".join(words[:2 * self.max_summary_words]) + " ..."
+        notes.input_tokens += estimate_tokens(notes.summary) + estimate_tokens(segment)
+        notes.transcript_tokens += estimate_tokens(segment)
+        notes.summary = summary or notes.summary
+        notes.add_items(notes.action_items, action_items)
+        notes.add_items(notes.events, events)
+        notes.segments += segment_count
+        notes.updates += 1
+        if self.on_update:
+            self.on_update(notes)
+
+
+# A transcriber (or a person) appends this line to say the meeting is over
+END_MARKER = "[END OF MEETING]"
+
+
+def follow_lines(source, poll_interval=0.5, idle_timeout=None, from_start=True, end_marker=END_MARKER):
+    """Yields lines from a growing file (or "-" for stdin), and None on every idle poll.
+
+    Either input ends at a line that is just `end_marker`, which is not
+    yielded. Otherwise a file is followed until nothing new has arrived
+    for `idle_timeout` seconds (forever if None), and stdin ends at EOF.
+    """
+    if source == "-":
+        lines = queue.Queue()
+
+        def read_stdin():
+            for line in sys.stdin:
+                lines.put(line)
+            lines.put(None)
+
+        threading.Thread(target=read_stdin, daemon=True).start()
+        while True:
+            try:
+                line = lines.get(timeout=poll_interval)
+            except queue.Empty:
+                yield None
+                continue
+            if line is None or (end_marker and line.strip() == end_marker):
+                return
+            yield line
+
+    with open(source, "r", encoding="utf-8") as f:
+        if not from_start:
+            f.seek(0, os.SEEK_END)
+        partial, last_data = "", time.monotonic()
+        while True:
+            chunk = f.readline()
+            if chunk:
+                last_data = time.monotonic()
+                partial += chunk
+                if partial.endswith("\n"):
+                    if end_marker and partial.strip() == end_marker:
+                        return
+                    yield partial
+                    partial = ""
+                continue
+            if end_marker and partial.strip() == end_marker:
+                return  # written without its newline
+            if idle_timeout is not None and time.monotonic() - last_data >= idle_timeout:
+                if partial:
+                    yield partial
+                return
+            yield None
+            time.sleep(poll_interval)
+
+
+def write_notes(path, notes):
+    """Rewrites `path` with the current notes (write-then-rename, so readers never see half a file)."""
+    events = [f"{event['title']} on {event['start']:%Y-%m-%d %H:%M}" for event in notes.local_events] + notes.events
+    text = notes.render() + "\n\nFollow-ups:\n" + ("\n".join(f"- {e}" for e in events) if events else "- none") + "\n"
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
@@ -0,0 +1,115 @@
+"""Deterministic, offline embeddings and a brute-force index for benchmarks.
+
+HashingEmbeddings maps word unigrams and bigrams (stopwords removed) into
+`dim` buckets with a signed hash (log term frequency, L2-normalised). It
+needs no API key or model download, and the same text always gives the
+same vector, so retrieval benchmarks are reproducible and cost nothing. It implements the
+langchain Embeddings interface and can be handed to Chroma.
+
+InMemoryIndex is an exact cosine top-k over the sparse form of those
+vectors. It stands in for the vector store when a benchmark should measure
+chunking and retrieval rather than the store. It can index a ChunkStore
+directly, so Documents are only built for search results.
+"""
+import hashlib
+import heapq
+import math
+import re
+
+from langchain_core.embeddings import Embeddings
+
+_TOKEN = re.compile(r"\w+")
+# Without IDF weighting, function words would dominate the similarity of short queries
+STOPWORDS = frozenset(
+    "a an and are as at be by did do does for from how in is it many much of on or that the this to "
+    "was were what when where which who why will with".split()
+)
+
+
+def _bucket(token, dim):
+    value = int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+    return value % dim, 1.0 if value >> 63 else -1.0
+
+
+class HashingEmbeddings(Embeddings):
+    def __init__(self, dim=512, bigrams=True):
+        self.dim = dim
+        self.bigrams = bigrams
+        self._buckets = {}
+
+    def sparse(self, text):
+        """Returns the embedding as {index: weight}, already normalised."""
+        words = [word for word in _TOKEN.findall(text.lower()) if word not in STOPWORDS]
+        tokens = words + [f"{a} {b}" for a, b in zip(words, words[1:])] if self.bigrams else words
+        counts = {}
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+        vector = {}
+        for token, count in counts.items():
+            bucket = self._buckets.get(token)
+            if bucket is None:
+                bucket = self._buckets[token] = _bucket(token, self.dim)
+            index, sign = bucket
+            vector[index] = vector.get(index, 0.0) + sign * (1.0 + math.log(count))
+        norm = math.sqrt(sum(weight * weight for weight in vector.values())) or 1.0
+        return {index: weight / norm for index, weight in vector.items()}
+
+    def _dense(self, text):
+        dense = [0.0] * self.dim
+        for index, weight in self.sparse(text).items():
+            dense[index] = weight
+        return dense
+
+    def embed_documents(self, texts):
+        return [self._dense(text) for text in texts]
+
+    def embed_query(self, text):
+        return self._dense(text)
+
+
+class InMemoryIndex:
+    def __init__(self, embeddings=None):
+        self.embeddings = embeddings or HashingEmbeddings()
+        self.documents = []
+        self._vectors = []
+        self._text_chars = 0
+
+    def add_documents(self, docs):
+        for doc in docs:
+            self.documents.append(doc)
+            self._vectors.append(self.embeddings.sparse(doc.page_content))
+            self._text_chars += len(doc.page_content)
+
+    @classmethod
+    def from_chunk_store(cls, store, embeddings=None):
+        """Indexes a chunk_store.ChunkStore; Documents are only built for search results."""
+        index = cls(embeddings)
+        index.documents = store.lazy_documents()
+        for text in store.texts():
+            index._vectors.append(index.embeddings.sparse(text))
+            index._text_chars += len(text)
+        return index
+
+    def _top(self, query_vector, k):
+        scored = (
+            (sum(weight * vector.get(index, 0.0) for index, weight in query_vector.items()), position)
+            for position, vector in enumerate(self._vectors)
+        )
+        return [(self.documents[position], score) for score, position in heapq.nlargest(k, scored)]
+
+    def similarity_search_with_score(self, query, k=4):
+        return self._top(self.embeddings.sparse(query), k)
+
+    def similarity_search(self, query, k=4):
+        return [doc for doc, _ in self.similarity_search_with_score(query, k)]
+
+    def similarity_search_by_vector_with_score(self, embedding, k=4):
+        """Search with a dense query vector as returned by embed_query."""
+        return self._top({index: weight for index, weight in enumerate(embedding) if weight}, k)
+
+    def similarity_search_by_vector(self, embedding, k=4):
+        return [doc for doc, _ in self.similarity_search_by_vector_with_score(embedding, k)]
+
+    def nbytes(self):
+        """Size of the equivalent dense float32 index plus stored text."""
+        return len(self.documents) * self.embeddings.dim * 4 + self._text_chars
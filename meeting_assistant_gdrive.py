@@ -1,37 +1,31 @@
-from langchain_core.prompts import PromptTemplate
-from langchain.chains import LLMChain
-from langchain_openai import ChatOpenAI
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
+from functools import lru_cache
 from dotenv import load_dotenv
-import os
+import argparse
 import datetime
+import logging
+import os
 import re
 
+from calendar_sync import schedule_event
+from google_services import upload_text_file
+from live_summary import END_MARKER, LIVE_UPDATE_TEMPLATE, LiveSummarizer, follow_lines, write_notes
+from meeting_state import StateStore, event_id, transcript_key
+from model_router import Budget, ModelRouter, RoutedLLM
+from temporal import extract_events, format_event, parse_event_datetime, pick_event
+
 
 load_dotenv()
-client_secret_path = os.getenv("GOOGLE_CLIENT_SECRET_PATH")
 
 # ------------- LLM SETUP ------------- #
-llm = ChatOpenAI(model="gpt-4o", temperature=0.3)
-
-summary_prompt = PromptTemplate(
-    input_variables=["transcript"],
-    template="""
+SUMMARY_TEMPLATE = """
     Summarize this meeting transcript:
 
     {transcript}
-    
+
     Provide the summary and bullet point action items.
     """
-)
 
-calendar_prompt = PromptTemplate(
-    input_variables=["transcript"],
-    template="""
+CALENDAR_TEMPLATE = """
     Check this meeting transcript and extract any date and time for follow-up meetings or scheduled events.
     Format the output like this if relevant:
 
@@ -45,39 +39,46 @@ calendar_prompt = PromptTemplate(
 
     If someone says 'let's follow up next week' and no date is given, default to the week after today at 10am."
     """
-)
-
-summary_chain = LLMChain(llm=llm, prompt=summary_prompt)
-calendar_chain = LLMChain(llm=llm, prompt=calendar_prompt)
-
-# ------------- GOOGLE AUTH ------------- #
-SCOPES = [
-    'https://www.googleapis.com/auth/drive.file',
-    'https://www.googleapis.com/auth/calendar'
-]
-
-creds = None
-if os.path.exists('token.json'):
-    creds = Credentials.from_authorized_user_file('token.json', SCOPES)
-if not creds or not creds.valid:
-    if creds and creds.expired and creds.refresh_token:
-        creds.refresh(Request())
-    else:
-        flow = InstalledAppFlow.from_client_secrets_file(client_secret_path, SCOPES)
-        creds = flow.run_local_server(port=0)
-    with open('token.json', 'w') as token:
-        token.write(creds.to_json())
 
-calendar_service = build('calendar', 'v3', credentials=creds)
-drive_service = build('drive', 'v3', credentials=creds)
+
+@lru_cache(maxsize=None)
+def get_chat_model(name):
+    from langchain_openai import ChatOpenAI
+    # RoutedLLM calls it through the rate-limit scheduler, which caps its buckets at the remaining-quota headers
+    return ChatOpenAI(model=name, temperature=0.3, include_response_headers=True)
+
+
+# Model choice is made per call from the transcript's size and the task;
+# ROUTER_POLICY=fixed:gpt-4o restores the old always-gpt-4o behaviour.
+@lru_cache(maxsize=None)
+def get_router():
+    max_latency = os.getenv("ROUTER_MAX_LATENCY_S")
+    max_cost = os.getenv("ROUTER_MAX_COST_USD")
+    router = ModelRouter(
+        policy=os.getenv("ROUTER_POLICY", "balanced"),
+        budget=Budget(float(max_latency) if max_latency else None, float(max_cost) if max_cost else None),
+    )
+    return RoutedLLM(router, get_chat_model)
 
 # ------------- CORE FUNCTIONS ------------- #
+def summarize_transcript(transcript):
+    return get_router().invoke(SUMMARY_TEMPLATE, transcript, task="summary")
+
+def extract_calendar_info(transcript):
+    # A follow-up whose date resolves locally skips the calendar LLM call; ambiguous ones still go to the LLM
+    event = pick_event(extract_events(transcript))
+    if event:
+        return format_event(event)
+    return get_router().invoke(CALENDAR_TEMPLATE, transcript, task="calendar")
+
+def update_live_notes(summary, segment, max_words=250):
+    return get_router().invoke(LIVE_UPDATE_TEMPLATE, segment, task="summary", summary=summary, max_words=max_words)
+
 def analyze_transcript(transcript):
-    summary = summary_chain.invoke({"transcript": transcript})
-    calendar_info = calendar_chain.invoke({"transcript": transcript})
-    return summary['text'], calendar_info['text']
+    return summarize_transcript(transcript), extract_calendar_info(transcript)
 
-def create_calendar_event(event_text):
+def build_event(event_text):
+    """Parses a Title/Date/Time/Description block into a Calendar event body."""
     match = re.search(r"Title: (.*?)\nDate: (.*?)\nTime: (.*?)\nDescription: (.*?)$", event_text, re.DOTALL)
     if match:
         print("Matched Event:")
@@ -88,70 +89,104 @@ def create_calendar_event(event_text):
         return None
 
     title, date_str, time_str, description = match.groups()
-    def parse_event_datetime(date_str, time_str):
-        date_str = date_str.strip()
-        time_str = re.sub(r"\s+", " ", time_str.strip())
-        datetime_formats = [
-            "%Y-%m-%d %I:%M %p",  # e.g., 2025-04-20 10:00 AM
-            "%Y-%m-%d %H:%M"      # e.g., 2025-04-20 14:00
-        ]
-        
-        for fmt in datetime_formats:
-            try:
-                return datetime.datetime.strptime(f"{date_str} {time_str}", fmt)
-            except ValueError:
-                continue
-        raise ValueError(f"Unrecognized date/time format: {date_str} {time_str}")
-    
     event_date = parse_event_datetime(date_str, time_str)
     end_time = event_date + datetime.timedelta(hours=1)
 
-    event = {
+    return {
         'summary': title,
         'description': description,
         'start': {'dateTime': event_date.isoformat(), 'timeZone': 'Asia/Jakarta'},
         'end': {'dateTime': end_time.isoformat(), 'timeZone': 'Asia/Jakarta'}
     }
 
-    created_event = calendar_service.events().insert(calendarId='primary', body=event).execute()
-    return created_event.get('htmlLink')
-
-def upload_to_drive(file_name: str, content: str):
-    # Save content to a temporary file
-    with open(file_name, 'w') as f:
-        f.write(content)
-    
-    # File metadata
-    file_metadata = {
-        'name': file_name,
-        'mimeType': 'text/plain'
-    }
-    
-    # Create a MediaFileUpload object for the file
-    media = MediaFileUpload(file_name, mimetype='text/plain')
-    
-    # Upload the file to Google Drive
-    file = drive_service.files().create(body=file_metadata, media_body=media, fields='id').execute()
-    print(f'File uploaded successfully. File ID: {file["id"]}')
-    return file["id"]
+def create_calendar_event(event_text, event_id=None, source=None):
+    event = build_event(event_text)
+    if event is None:
+        return None
+    # Matched against the synced local event index first, so reruns don't pile up duplicates
+    created_event, _ = schedule_event(event, event_id=event_id, source=source)
+    # The id is what a resumed run needs to find the event again; the link is for people
+    return {'id': created_event.get('id'), 'htmlLink': created_event.get('htmlLink')}
+
+def upload_to_drive(file_name: str, content: str, idempotency_key=None):
+    file_id = upload_text_file(file_name, content, idempotency_key=idempotency_key)
+    print(f'File uploaded successfully. File ID: {file_id}')
+    return file_id
+
+def follow_transcript(source, idle_timeout, segment_tokens, notes_file=None, end_marker=END_MARKER):
+    """Summarizes a transcript while it is being written; returns (transcript, summary, calendar text)."""
+    def show(notes):
+        print(f"\n--- LIVE NOTES (update {notes.updates}, {notes.segments} segment(s)) ---\n")
+        print(notes.render())
+        if notes_file:
+            write_notes(notes_file, notes)
+
+    summarizer = LiveSummarizer(update_live_notes, segment_tokens=segment_tokens, on_update=show)
+    notes = summarizer.run(follow_lines(source, idle_timeout=idle_timeout, end_marker=end_marker))
+    print(f"\nFinal notes ready {summarizer.final_lag:.1f}s after the transcript ended "
+          f"({notes.updates} update(s), {notes.input_tokens} input tokens for {notes.transcript_tokens} transcript tokens)")
+
+    calendar_text = notes.calendar_text()
+    if calendar_text is None and notes.events:
+        # Only the short event candidates go to the calendar prompt, not the whole transcript again
+        calendar_text = get_router().invoke(CALENDAR_TEMPLATE, "\n".join(notes.events), task="calendar")
+    return summarizer.transcript, notes.render(), calendar_text or ""
 
 # ------------- MAIN ------------- #
-if __name__ == "__main__":
-    with open("sample_meeting.txt", "r") as f:
-        transcript = f.read()
-
-    summary_text, calendar_text = analyze_transcript(transcript)
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize a meeting transcript, schedule follow-ups and upload the summary to Drive.")
+    parser.add_argument("transcript", nargs="?", default="sample_meeting.txt", help="Path to the transcript file.")
+    parser.add_argument("--summary-file", default="Meeting Summary.txt", help="Name of the summary file uploaded to Drive.")
+    parser.add_argument("--batch", metavar="DIR_OR_GLOB", help="Process every transcript in a directory or glob in one run.")
+    parser.add_argument("--manifest", default="meeting_manifest.json", help="Per-file results manifest for --batch.")
+    parser.add_argument("--concurrency", type=int, default=4, help="Transcripts analyzed in parallel in --batch mode.")
+    parser.add_argument("--state", default="meeting_state.json", help="Checkpoint file; reruns resume at the first unfinished stage.")
+    parser.add_argument("--follow", action="store_true", help="Summarize the transcript live as it is written ('-' reads stdin).")
+    parser.add_argument("--end-marker", default=END_MARKER,
+                        help="With --follow, a line reading this ends the meeting at once; Ctrl-C does too.")
+    parser.add_argument("--idle-timeout", type=float, default=120.0,
+                        help="With --follow, fallback when no end marker comes: treat the meeting as over after this many idle seconds.")
+    parser.add_argument("--segment-tokens", type=int, default=600, help="With --follow, transcript tokens per live update.")
+    parser.add_argument("--notes-file", help="With --follow, keep the current notes in this file.")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if args.batch:
+        from meeting_batch import run_batch
+        run_batch(args.batch, args.manifest, args.concurrency)
+        return
+
+    store = StateStore(args.state)
+    if args.follow:
+        transcript, summary_text, calendar_text = follow_transcript(
+            args.transcript, args.idle_timeout, args.segment_tokens, args.notes_file, args.end_marker
+        )
+        key = transcript_key(transcript)
+        store.update(key, file=args.transcript)
+        summary_text = store.run_stage(key, "summary", lambda: summary_text)
+        calendar_text = store.run_stage(key, "calendar", lambda: calendar_text)
+    else:
+        with open(args.transcript, "r") as f:
+            transcript = f.read()
+        key = transcript_key(transcript)
+        store.update(key, file=args.transcript)
+        summary_text = store.run_stage(key, "summary", summarize_transcript, transcript)
+        calendar_text = store.run_stage(key, "calendar", extract_calendar_info, transcript)
 
     print("\n--- SUMMARY ---\n")
     print(summary_text)
     print("\n--- CALENDAR EXTRACTION ---\n")
     print(calendar_text)
 
-    event_link = create_calendar_event(calendar_text)
-    if event_link:
-        print("\nEvent created:", event_link)
+    event = store.run_stage(key, "event", create_calendar_event, calendar_text,
+                            event_id=event_id(key, "event"), source=key)
+    if event:
+        print(f"\nEvent created: {event['htmlLink']} (id {event['id']})")
     else:
         print("\nNo event found in transcript.")
 
-    doc_id = upload_to_drive("Meeting Summary.txt", summary_text)
-    print(f"\nSummary uploaded to Google Drive with ID: {doc_id}")
\ No newline at end of file
+    doc_id = store.run_stage(key, "drive_file_id", upload_to_drive, args.summary_file, summary_text, idempotency_key=key)
+    print(f"\nSummary uploaded to Google Drive with ID: {doc_id}")
+
+if __name__ == "__main__":
+    main()
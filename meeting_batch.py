@@ -0,0 +1,121 @@
+"""Directory-scale batch mode for the meeting assistant.
+
+Analyzes every transcript matched by a directory or glob in one process.
+The manifest is a meeting_state.StateStore, so files already marked done
+are skipped and a file that failed part-way resumes at its first
+unfinished stage. Analysis runs in a bounded worker pool. Calendar inserts
+go out as batched requests, and Drive uploads reuse one authorized client
+at the end.
+
+    python meeting_assistant_gdrive.py --batch transcripts/ --concurrency 8
+"""
+import datetime
+import glob
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from calendar_sync import event_start, get_event_index, with_source
+from google_services import insert_events, upload_text_file
+from meeting_assistant_gdrive import build_event, extract_calendar_info, summarize_transcript
+from meeting_state import StateStore, event_id
+
+
+def collect_transcripts(pattern):
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, "*.txt")
+    return sorted(path for path in glob.glob(pattern) if os.path.isfile(path))
+
+
+def content_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def analyze_file(store, digest, path):
+    with open(path, "r") as f:
+        transcript = f.read()
+    store.run_stage(digest, "summary", summarize_transcript, transcript)
+    calendar_text = store.run_stage(digest, "calendar", extract_calendar_info, transcript)
+    return build_event(calendar_text)
+
+
+def run_batch(pattern, manifest_path="meeting_manifest.json", concurrency=4):
+    store = StateStore(manifest_path)
+    pending = {}
+    for path in collect_transcripts(pattern):
+        digest = content_hash(path)
+        if store.entry(digest).get("status") == "done":
+            print(f"Skipping {path} (already processed)")
+            continue
+        pending[digest] = path
+        store.update(digest, file=path, status="pending", error=None)
+    print(f"{len(pending)} transcripts to process")
+
+    # Analysis: LLM-bound, so a thread pool keeps several requests in flight.
+    # Stages finished on an earlier run are replayed from the manifest.
+    events = {}
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = {pool.submit(analyze_file, store, digest, path): digest for digest, path in pending.items()}
+        for future in as_completed(futures):
+            digest = futures[future]
+            path = pending[digest]
+            try:
+                events[digest] = future.result()
+            except Exception as e:
+                store.update(digest, status="failed", error=f"analysis: {e}")
+                print(f"Failed {path}: {e}")
+            else:
+                store.update(digest, status="analyzed", processed_at=datetime.datetime.now().isoformat())
+                print(f"Analyzed {path}")
+
+    # Calendar: one batched request per 50 events instead of one round trip each.
+    # Event IDs derive from the content hash, so a retried insert cannot duplicate.
+    # An event an earlier run made for the same transcript, or one with matching content, is found in the local index and reused.
+    to_insert = []
+    pending_events = [digest for digest, event in events.items() if event and store.get_stage(digest, "event") is None]
+    if pending_events:
+        index = get_event_index()
+        print(index.sync())
+    for digest in pending_events:
+        body = with_source(dict(events[digest], id=event_id(digest, "event")), digest)
+        start = event_start(body)
+        existing = index.find_duplicate(body["summary"], start, description=body.get("description"),
+                                        source=digest, event_id=body["id"]) if start else None
+        if existing:
+            print(f"Skipping duplicate event for {store.entry(digest)['file']}: '{existing['summary']}' at {existing['start']}")
+            store.set_stage(digest, "event", {"id": existing["id"], "htmlLink": existing.get("htmlLink")})
+            continue
+        to_insert.append((digest, body))
+    if to_insert:
+        results = insert_events([body for _, body in to_insert])
+        for (digest, body), (event, error) in zip(to_insert, results):
+            if error:
+                store.update(digest, status="failed", error=f"calendar: {error}")
+            else:
+                index.record(event)
+                store.set_stage(digest, "event", {"id": event["id"], "htmlLink": event.get("htmlLink")})
+        index.save()
+
+    # Drive: media uploads cannot go in a batch request, so they run back to back on one client
+    for digest in events:
+        entry = store.entry(digest)
+        if entry["status"] == "failed":
+            continue
+        stem = os.path.splitext(os.path.basename(entry["file"]))[0]
+        try:
+            store.run_stage(
+                digest, "drive_file_id", upload_text_file,
+                f"{stem} Summary.txt", entry["stages"]["summary"], idempotency_key=digest,
+            )
+        except Exception as e:
+            store.update(digest, status="failed", error=f"drive: {e}")
+            continue
+        store.update(digest, status="done")
+
+    done = sum(1 for digest in pending if store.entry(digest)["status"] == "done")
+    print(f"Done: {done}/{len(pending)} transcripts; manifest written to {manifest_path}")
+    return store
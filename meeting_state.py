@@ -0,0 +1,74 @@
+"""Local checkpoint store for the meeting pipelines.
+
+Each transcript is keyed by its sha256. Every stage output (summary,
+calendar info, event link, Drive file ID) is written as soon as it exists.
+A rerun after a crash replays finished stages from disk and resumes at the
+first missing one. Calendar and Drive writes derive their idempotency keys
+from the same hash, so a retried write finds the earlier one instead of
+duplicating it.
+"""
+import base64
+import hashlib
+import json
+import os
+import threading
+
+
+def transcript_key(transcript):
+    return hashlib.sha256(transcript.encode("utf-8")).hexdigest()
+
+
+def event_id(*parts):
+    """Deterministic Calendar event ID (base32hex: lowercase a-v and 0-9, as the API requires)."""
+    digest = hashlib.sha256("\0".join(str(part) for part in parts).encode("utf-8")).digest()
+    return base64.b32hexencode(digest).decode("ascii").rstrip("=").lower()
+
+
+class StateStore:
+    """JSON file of {transcript_key: {"stages": {...}, ...}}, rewritten atomically on every change."""
+
+    def __init__(self, path="meeting_state.json"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._data = {}
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                self._data = json.load(f)
+
+    def entry(self, key):
+        with self._lock:
+            return self._data.setdefault(key, {"stages": {}})
+
+    def update(self, key, **fields):
+        with self._lock:
+            self._data.setdefault(key, {"stages": {}}).update(fields)
+            self._save()
+
+    def get_stage(self, key, stage, default=None):
+        return self.entry(key)["stages"].get(stage, default)
+
+    def set_stage(self, key, stage, value):
+        with self._lock:
+            self._data.setdefault(key, {"stages": {}})["stages"][stage] = value
+            self._save()
+
+    def run_stage(self, key, stage, func, *args, **kwargs):
+        """Returns the stored output of `stage`, or runs `func` and persists its result."""
+        stages = self.entry(key)["stages"]
+        if stage in stages:
+            print(f"Resuming: '{stage}' already done")
+            return stages[stage]
+        value = func(*args, **kwargs)
+        self.set_stage(key, stage, value)
+        return value
+
+    def items(self):
+        with self._lock:
+            return list(self._data.items())
+
+    def _save(self):
+        # Write-then-rename so a crash mid-write never corrupts earlier checkpoints
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._data, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
@@ -7,6 +7,8 @@ from dotenv import load_dotenv
 import random
 import os
 
+from rate_limiter import scheduler_rate_limiter
+
 load_dotenv()
 os.environ["OPENAI_API_KEY"] = os.getenv("OPENAI_API_KEY")
 
@@ -28,7 +30,7 @@ def get_python_tip(input: str) -> str:
     return f"Here's a Python tip: {random.choice(tips)}"
 
 memory = ConversationBufferMemory(memory_key="chat_history", return_messages=True)
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.3)
+llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.3, rate_limiter=scheduler_rate_limiter("openai"))
 
 agent = initialize_agent(
     tools=[get_python_tip],
@@ -0,0 +1,260 @@
+"""Size- and SLO-aware model routing with a map-reduce fallback.
+
+    router = ModelRouter(budget=Budget(max_latency_s=20, max_cost_usd=0.05))
+    text = RoutedLLM(router, get_chat_model).invoke(SUMMARY_TEMPLATE, transcript, task="summary")
+
+Before each call the router counts the prompt's tokens and picks a model
+from the task's minimum quality tier, the input size and the latency/cost
+budget. Policies:
+  balanced  cheapest model of sufficient tier that fits the budget (default)
+  cheapest  cheapest model that fits the context, ignoring the tier
+  fastest   lowest estimated latency
+  quality   highest tier that fits the budget
+  fixed:<model>  always that model (the scripts' previous behaviour)
+
+If the input is larger than the chosen model's context, the call becomes a
+map-reduce: the text is split into pieces that fit, each piece is mapped
+with the same prompt in parallel, and the partial results are reduced with
+a merge prompt. Every decision is logged to the "model_router" logger and,
+with `log_path` (or ROUTER_LOG), appended as a JSON line.
+"""
+import datetime
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from rate_limiter import INTERACTIVE, RateLimitedChatModel, estimate_tokens
+
+logger = logging.getLogger("model_router")
+
+
+@dataclass(frozen=True)
+class ModelProfile:
+    name: str
+    context_window: int          # tokens, prompt + output
+    input_cost: float            # USD per million input tokens
+    output_cost: float           # USD per million output tokens
+    base_latency: float          # seconds to first token
+    output_tokens_per_s: float
+    input_tokens_per_s: float    # prefill throughput
+    tier: int                    # 1 = small, 2 = frontier
+    provider: str = "openai"     # rate-limit bucket in the shared scheduler
+
+    def estimate_latency(self, input_tokens, output_tokens):
+        return self.base_latency + input_tokens / self.input_tokens_per_s + output_tokens / self.output_tokens_per_s
+
+    def estimate_cost(self, input_tokens, output_tokens):
+        return (input_tokens * self.input_cost + output_tokens * self.output_cost) / 1e6
+
+
+DEFAULT_MODELS = [
+    ModelProfile("gpt-4o-mini", 128_000, 0.15, 0.60, 0.4, 90.0, 20_000.0, 1),
+    ModelProfile("gpt-4o", 128_000, 2.50, 10.00, 0.6, 60.0, 10_000.0, 2),
+]
+
+# Minimum tier and expected output size per task
+TASKS = {
+    "summary": {"tier": 1, "output_tokens": 500},
+    "calendar": {"tier": 1, "output_tokens": 80},
+    "action_items": {"tier": 1, "output_tokens": 300},
+    "analysis": {"tier": 2, "output_tokens": 800},
+}
+
+REDUCE_TEMPLATE = """
+    The following are partial results produced from consecutive parts of one long meeting transcript.
+    Merge them into a single result in the same format, removing duplicates and keeping every distinct item.
+
+    {transcript}
+    """
+
+
+@dataclass
+class Budget:
+    max_latency_s: Optional[float] = None
+    max_cost_usd: Optional[float] = None
+
+    def allows(self, latency, cost):
+        return (self.max_latency_s is None or latency <= self.max_latency_s) and (
+            self.max_cost_usd is None or cost <= self.max_cost_usd
+        )
+
+
+@dataclass
+class RouteDecision:
+    task: str
+    policy: str
+    model: str
+    strategy: str                # "direct" or "map_reduce"
+    input_tokens: int
+    output_tokens: int
+    chunks: int
+    est_latency_s: float
+    est_cost_usd: float
+    within_budget: bool
+    reason: str
+
+
+class ModelRouter:
+    def __init__(self, models=None, policy="balanced", budget=None, context_margin=0.9, log_path=None):
+        self.models = {model.name: model for model in (models or DEFAULT_MODELS)}
+        self.policy = policy
+        self.budget = budget or Budget()
+        self.context_margin = context_margin
+        self.log_path = log_path or os.getenv("ROUTER_LOG")
+        self.decisions = []
+
+    def usable_context(self, model, output_tokens):
+        return int(model.context_window * self.context_margin) - output_tokens
+
+    def _plan(self, model, input_tokens, output_tokens):
+        """Estimated (chunks, latency, cost) of running the input on `model`, map-reducing if needed."""
+        window = self.usable_context(model, output_tokens)
+        if input_tokens <= window:
+            return 1, model.estimate_latency(input_tokens, output_tokens), model.estimate_cost(input_tokens, output_tokens)
+        chunks = -(-input_tokens // window)
+        per_chunk = -(-input_tokens // chunks)
+        # Map calls run in parallel, then one reduce over the partial outputs
+        latency = model.estimate_latency(per_chunk, output_tokens) + model.estimate_latency(chunks * output_tokens, output_tokens)
+        cost = chunks * model.estimate_cost(per_chunk, output_tokens) + model.estimate_cost(chunks * output_tokens, output_tokens)
+        return chunks, latency, cost
+
+    def route(self, prompt, task="summary", policy=None):
+        policy = policy or self.policy
+        spec = TASKS.get(task, TASKS["summary"])
+        input_tokens = estimate_tokens(prompt)
+        output_tokens = spec["output_tokens"]
+
+        options = []
+        for model in self.models.values():
+            chunks, latency, cost = self._plan(model, input_tokens, output_tokens)
+            options.append((model, chunks, latency, cost, self.budget.allows(latency, cost)))
+
+        if policy.startswith("fixed:"):
+            name = policy.split(":", 1)[1]
+            if name not in self.models:
+                raise ValueError(f"Unknown model in routing policy {policy!r}; known models: {', '.join(self.models)}")
+            choice = next(option for option in options if option[0].name == name)
+            reason = "fixed policy"
+        else:
+            eligible = [o for o in options if o[0].tier >= spec["tier"]] if policy in ("balanced", "quality") else options
+            within = [o for o in eligible if o[4]]
+            pool = within or eligible or options
+            if policy == "cheapest" or policy == "balanced":
+                choice = min(pool, key=lambda o: (o[3], o[2]))
+            elif policy == "fastest":
+                choice = min(pool, key=lambda o: (o[2], o[3]))
+            elif policy == "quality":
+                choice = max(pool, key=lambda o: (o[0].tier, -o[3]))
+            else:
+                raise ValueError(f"Unknown routing policy: {policy}")
+            reason = f"{policy}: {len(within)}/{len(options)} models within budget"
+            if not within:
+                reason += "; none fit the budget, closest option taken"
+
+        model, chunks, latency, cost, allowed = choice
+        decision = RouteDecision(
+            task=task, policy=policy, model=model.name, strategy="direct" if chunks == 1 else "map_reduce",
+            input_tokens=input_tokens, output_tokens=output_tokens, chunks=chunks,
+            est_latency_s=round(latency, 3), est_cost_usd=round(cost, 6), within_budget=allowed, reason=reason,
+        )
+        self._log(decision)
+        return decision
+
+    def _log(self, decision):
+        self.decisions.append(decision)
+        logger.info(
+            "route task=%s tokens=%d -> %s (%s, %d chunk(s)) est %.2fs $%.5f [%s]",
+            decision.task, decision.input_tokens, decision.model, decision.strategy, decision.chunks,
+            decision.est_latency_s, decision.est_cost_usd, decision.reason,
+        )
+        if self.log_path:
+            record = dict(asdict(decision), at=datetime.datetime.now().isoformat())
+            with open(self.log_path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+
+
+def split_by_tokens(text, max_tokens, overlap_lines=2):
+    """Splits on line boundaries into pieces of at most ~max_tokens, repeating a few lines of context."""
+    lines = text.splitlines()
+    pieces, current, size = [], [], 0
+    for line in lines:
+        line_tokens = estimate_tokens(line) + 1
+        if current and size + line_tokens > max_tokens:
+            pieces.append("\n".join(current))
+            current = current[-overlap_lines:] if overlap_lines else []
+            size = sum(estimate_tokens(kept) + 1 for kept in current)
+        if line_tokens > max_tokens:
+            # A single giant line: cut it by characters
+            step = max(1, len(line) * max_tokens // line_tokens)
+            for start in range(0, len(line), step):
+                pieces.append(line[start:start + step])
+            current, size = [], 0
+            continue
+        current.append(line)
+        size += line_tokens
+    if current:
+        pieces.append("\n".join(current))
+    return pieces
+
+
+class RoutedLLM:
+    """Calls whichever model the router picks; `model_factory(name)` returns a chat model.
+
+    Every call, map and reduce steps included, goes through the shared
+    rate-limit scheduler under the model's provider, at `priority`. After
+    `max_reduce_rounds` map-reduce rounds, or as soon as a round stops
+    shrinking the text, the partial results are trimmed to fit one final
+    call instead of recursing again.
+    """
+
+    def __init__(self, router, model_factory, max_parallel=4, priority=INTERACTIVE, scheduler=None, max_reduce_rounds=3):
+        self.router = router
+        self.model_factory = model_factory
+        self.max_parallel = max_parallel
+        self.priority = priority
+        self.scheduler = scheduler
+        self.max_reduce_rounds = max_reduce_rounds
+
+    def _call(self, model_name, prompt, output_tokens=256):
+        model = RateLimitedChatModel(
+            self.model_factory(model_name), self.router.models[model_name].provider,
+            priority=self.priority, max_output_tokens=output_tokens, scheduler=self.scheduler,
+        )
+        response = model.invoke(prompt)
+        return getattr(response, "content", response)
+
+    def invoke(self, template, transcript, task="summary", **variables):
+        return self._invoke(template, transcript, task, variables, 0)
+
+    def _invoke(self, template, transcript, task, variables, rounds):
+        prompt = template.format(transcript=transcript, **variables)
+        decision = self.router.route(prompt, task)
+        if decision.strategy == "direct":
+            return self._call(decision.model, prompt, decision.output_tokens)
+
+        model = self.router.models[decision.model]
+        overhead = estimate_tokens(template.format(transcript="", **variables))
+        window = self.router.usable_context(model, decision.output_tokens) - overhead
+        pieces = split_by_tokens(transcript, window)
+
+        def map_piece(piece):
+            return self._call(decision.model, template.format(transcript=piece, **variables), decision.output_tokens)
+
+        with ThreadPoolExecutor(max_workers=self.max_parallel) as pool:
+            partials = list(pool.map(map_piece, pieces))
+        separator = "\n\n---\n\n"
+        merged = separator.join(partials)
+        if rounds + 1 < self.max_reduce_rounds and estimate_tokens(merged) < decision.input_tokens:
+            # The merge step is itself routed, so it can map-reduce again if the partials are still too long
+            return self._invoke(REDUCE_TEMPLATE, merged, task, {}, rounds + 1)
+
+        # Another round would not converge: keep an equal share of every partial so one merge call fits
+        window = self.router.usable_context(model, decision.output_tokens) - estimate_tokens(REDUCE_TEMPLATE)
+        share = max(1, (window - len(partials) * estimate_tokens(separator)) // len(partials))
+        trimmed = [partial[:share * len(partial) // max(1, estimate_tokens(partial))] for partial in partials]
+        logger.warning("map-reduce for task=%s stopped after %d round(s); trimmed %d partials to ~%d tokens each",
+                       task, rounds + 1, len(partials), share)
+        return self._call(decision.model, REDUCE_TEMPLATE.format(transcript=separator.join(trimmed)), decision.output_tokens)
@@ -1,64 +1,101 @@
-from langchain.agents import initialize_agent, AgentType
-from langchain.memory import ConversationBufferMemory
-from langchain_openai import ChatOpenAI
-from langchain.tools import tool
+from functools import lru_cache
+import argparse
 import os
 from dotenv import load_dotenv
 
+from parallel_agent import ParallelToolAgent
+from tool_cache import cached_tool
+
 # Load environment variables
 load_dotenv()
-os.environ["OPENAI_API_KEY"] = os.getenv("OPENAI_API_KEY")
 
-# Initialize LLM
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.3)
+LLM_CONFIG = {"model": "gpt-4o-mini", "temperature": 0.3}
+SUMMARY_PROMPT = "Summarize this meeting: {transcript}"
+TASKS_PROMPT = "Extract key action items from the meeting: {transcript}"
+
+# Initialize LLM on first use
+@lru_cache(maxsize=None)
+def get_llm():
+    from langchain_openai import ChatOpenAI
+    from rate_limiter import scheduler_rate_limiter
+    return ChatOpenAI(**LLM_CONFIG, rate_limiter=scheduler_rate_limiter("openai"))
 
 # Define tools
-@tool
+# The prompt is part of the cache key, so editing it invalidates old results
+@cached_tool(config=dict(LLM_CONFIG, prompt=SUMMARY_PROMPT))
 def summarize_meeting(transcript: str) -> str:
     """Summarize the meeting transcript."""
-    return llm.invoke(f"Summarize this meeting: {transcript}")
+    return get_llm().invoke(SUMMARY_PROMPT.format(transcript=transcript))
 
-@tool
+@cached_tool(config=dict(LLM_CONFIG, prompt=TASKS_PROMPT))
 def extract_tasks(transcript: str) -> str:
     """Extract action items from the meeting transcript."""
-    return llm.invoke(f"Extract key action items from the meeting: {transcript}")
+    return get_llm().invoke(TASKS_PROMPT.format(transcript=transcript))
 
-@tool
 def add_task_to_notion(task: str) -> str:
     """Mock function to simulate adding a task to Notion."""
     return f"✅ Task '{task}' added to Notion (simulated)."
 
-@tool
 def schedule_next_meeting(date: str) -> str:
     """Mock function to simulate scheduling a meeting."""
     return f"📅 Meeting scheduled for {date} (simulated)."
 
-# Initialize memory
-memory = ConversationBufferMemory(memory_key="chat_history", return_messages=True)
+def get_tools():
+    from langchain.tools import tool
+    return [tool(summarize_meeting), tool(extract_tasks), tool(add_task_to_notion), tool(schedule_next_meeting)]
+
+# Independent tool calls from one model turn run concurrently
+@lru_cache(maxsize=None)
+def get_agent():
+    return ParallelToolAgent(get_tools(), get_llm(), serial=("add_task_to_notion",), verbose=True)
+
+# The previous OPENAI_FUNCTIONS executor: one tool call per model turn
+@lru_cache(maxsize=None)
+def get_sequential_agent():
+    from langchain.agents import initialize_agent, AgentType
+    from langchain.memory import ConversationBufferMemory
 
-# Initialize the agent with the tools
-agent = initialize_agent(
-    tools=[summarize_meeting, extract_tasks, add_task_to_notion, schedule_next_meeting],
-    llm=llm,
-    agent=AgentType.OPENAI_FUNCTIONS,
-    memory=memory,
-    verbose=True
-)
+    memory = ConversationBufferMemory(memory_key="chat_history", return_messages=True)
+    return initialize_agent(
+        tools=get_tools(),
+        llm=get_llm(),
+        agent=AgentType.OPENAI_FUNCTIONS,
+        memory=memory,
+        verbose=True
+    )
 
 # Simulate user input
 meeting_transcript = """
 Today we discussed the new marketing campaign. Sarah will design the draft, Tom will review by Friday, and we aim to launch next Monday. Let's follow up on Thursday.
 """
 
-# Agent runs
-print("--- Summarizing Meeting ---")
-agent.invoke(f"Summarize this meeting: {meeting_transcript}")
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Walk the multi-tool agent through a sample meeting.")
+    parser.add_argument("--sequential", action="store_true", help="Use the one-call-per-turn OPENAI_FUNCTIONS agent.")
+    args = parser.parse_args(argv)
+
+    os.environ["OPENAI_API_KEY"] = os.getenv("OPENAI_API_KEY")
+
+    # Agent runs
+    if args.sequential:
+        agent = get_sequential_agent()
+        print("--- Summarizing Meeting ---")
+        agent.invoke(f"Summarize this meeting: {meeting_transcript}")
+
+        print("\n--- Extracting Tasks ---")
+        agent.invoke(f"Extract tasks from this: {meeting_transcript}")
+    else:
+        agent = get_agent()
+        # Both tools read the same transcript, so the model calls them in one turn and they run side by side
+        print("--- Summarizing Meeting and Extracting Tasks ---")
+        result = agent.invoke(f"Summarize this meeting and extract its action items: {meeting_transcript}")
+        print(result["output"])
 
-print("\n--- Extracting Tasks ---")
-agent.invoke(f"Extract tasks from this: {meeting_transcript}")
+    print("\n--- Adding a Task to Notion ---")
+    agent.invoke("Add this task to Notion: Sarah will design the draft")
 
-print("\n--- Adding a Task to Notion ---")
-agent.invoke("Add this task to Notion: Sarah will design the draft")
+    print("\n--- Scheduling Next Meeting ---")
+    agent.invoke("Schedule the next meeting for Thursday at 3PM")
 
-print("\n--- Scheduling Next Meeting ---")
-agent.invoke("Schedule the next meeting for Thursday at 3PM")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -1,79 +1,71 @@
-from langchain.agents import initialize_agent, AgentType
-from langchain_openai import ChatOpenAI
-from langchain.tools import tool
-from langchain.memory import ConversationBufferMemory
+from functools import lru_cache
 from dotenv import load_dotenv
+import argparse
 import os
 
-# Google Drive imports
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
+from google_services import upload_file
+from tool_cache import cached_tool
 
 load_dotenv()
-os.environ["OPENAI_API_KEY"] = os.getenv("OPENAI_API_KEY")
 
-# --- Google Drive Upload Tool ---
-SCOPES = [
-    'https://www.googleapis.com/auth/drive.file',
-    'https://www.googleapis.com/auth/calendar'
-]
+LLM_CONFIG = {"model": "gpt-4o-mini", "temperature": 0.3}
+SUMMARY_PROMPT = "Summarize this: {transcript}"
+TASKS_PROMPT = "Extract tasks: {transcript}"
 
+# --- Google Drive Upload Tool ---
 def upload_to_drive(file_path, file_name, mime_type='application/vnd.google-apps.document'):
-    creds = None
-    if os.path.exists('token.json'):
-        creds = Credentials.from_authorized_user_file('token.json', SCOPES)
-    else:
-        flow = InstalledAppFlow.from_client_secrets_file('credentials.json', SCOPES)
-        creds = flow.run_local_server(port=0)
-        with open('token.json', 'w') as token:
-            token.write(creds.to_json())
-
-    service = build('drive', 'v3', credentials=creds)
-    file_metadata = {
-        'name': file_name,
-        'mimeType': mime_type
-    }
-    media = MediaFileUpload(file_path, mimetype='text/plain')
-
-    file = service.files().create(
-        body=file_metadata,
-        media_body=media,
-        fields='id'
-    ).execute()
-    return f"File uploaded to Google Drive with ID: {file.get('id')}"
+    file_id = upload_file(file_path, file_name, mime_type=mime_type)
+    return f"File uploaded to Google Drive with ID: {file_id}"
 
-@tool
+# The prompt is part of the cache key, so editing it invalidates old results
+@cached_tool(config=dict(LLM_CONFIG, prompt=SUMMARY_PROMPT))
 def summarize_meeting(transcript: str) -> str:
     """Summarize the meeting transcript."""
-    return llm.invoke(f"Summarize this: {transcript}")
+    return get_llm().invoke(SUMMARY_PROMPT.format(transcript=transcript))
 
-@tool
+@cached_tool(config=dict(LLM_CONFIG, prompt=TASKS_PROMPT))
 def extract_tasks(transcript: str) -> str:
     """Extract action items from the meeting transcript."""
-    return llm.invoke(f"Extract tasks: {transcript}")
+    return get_llm().invoke(TASKS_PROMPT.format(transcript=transcript))
 
-# LangChain Tool for uploading
-@tool
 def save_summary_to_drive(summary: str) -> str:
     """Saves the meeting summary to Google Drive."""
     with open("meeting_summary.txt", "w") as f:
         f.write(summary)
     return upload_to_drive("meeting_summary.txt", "Meeting Summary")
 
-# LangChain setup
-memory = ConversationBufferMemory(memory_key="chat_history", return_messages=True)
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.3)
+# LangChain setup, deferred until the agent is first needed
+@lru_cache(maxsize=None)
+def get_llm():
+    from langchain_openai import ChatOpenAI
+    from rate_limiter import scheduler_rate_limiter
+    return ChatOpenAI(**LLM_CONFIG, rate_limiter=scheduler_rate_limiter("openai"))
+
+@lru_cache(maxsize=None)
+def get_agent():
+    from langchain.agents import initialize_agent, AgentType
+    from langchain.tools import tool
+    from langchain.memory import ConversationBufferMemory
+
+    memory = ConversationBufferMemory(memory_key="chat_history", return_messages=True)
+    return initialize_agent(
+        tools=[tool(save_summary_to_drive)],
+        llm=get_llm(),
+        agent=AgentType.OPENAI_FUNCTIONS,
+        memory=memory,
+        verbose=True
+    )
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ask the agent to save a meeting summary to Google Drive.")
+    parser.add_argument("request", nargs="?", default="This is the summary of our meeting. Please save it to Google Drive.")
+    args = parser.parse_args(argv)
+
+    os.environ["OPENAI_API_KEY"] = os.getenv("OPENAI_API_KEY")
 
-agent = initialize_agent(
-    tools=[save_summary_to_drive],
-    llm=llm,
-    agent=AgentType.OPENAI_FUNCTIONS,
-    memory=memory,
-    verbose=True
-)
+    # Run agent
+    response = get_agent().invoke(args.request)
+    print(response)
 
-# Run agent
-response = agent.invoke("This is the summary of our meeting. Please save it to Google Drive.")
-print(response)
+if __name__ == "__main__":
+    main()
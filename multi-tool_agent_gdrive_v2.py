@@ -1,35 +1,21 @@
-from langchain.prompts import PromptTemplate
-from langchain.chains import LLMChain
-from langchain_openai import ChatOpenAI
-from langchain.tools import BaseTool
-from langchain.agents import initialize_agent
-from pydantic import BaseModel, Field
-from typing import Type
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
+from functools import lru_cache
 from dotenv import load_dotenv
-import os
+import argparse
 import datetime
 import re
 
+from calendar_sync import schedule_event
+from google_services import upload_text_file
+from meeting_state import StateStore, event_id, transcript_key
+from temporal import extract_events, format_event, parse_event_datetime, pick_event
+from tool_cache import cached_tool
+from transcript_filter import extract_relevant
+
 # ------------- ENV SETUP ------------- #
 load_dotenv()
-client_secret_path = os.getenv("GOOGLE_CLIENT_SECRET_PATH")
 
 # ------------- LLM SETUP ------------- #
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.3)
-
-summary_prompt = PromptTemplate(
-    input_variables=["transcript"],
-    template="Summarize this meeting transcript:\n{transcript}\nProvide the summary and bullet point action items."
-)
-
-calendar_prompt = PromptTemplate(
-    input_variables=["transcript", "today_date"],
-    template="""
+CALENDAR_TEMPLATE = """
     Extract any follow-up meeting dates and times from this transcript. If a date or time is mentioned indirectly (e.g., "next week"), infer the exact date and time based on today's date ({today_date}). Format the output as:
 
     Title: <title of the meeting>
@@ -40,126 +26,133 @@ calendar_prompt = PromptTemplate(
     Transcript:
     {transcript}
     """
-)
-
-summary_chain = LLMChain(llm=llm, prompt=summary_prompt)
-calendar_chain = LLMChain(llm=llm, prompt=calendar_prompt)
-
-# ------------- GOOGLE API SETUP ------------- #
-SCOPES = [
-    'https://www.googleapis.com/auth/drive.file',
-    'https://www.googleapis.com/auth/calendar'
-]
-
-creds = None
-if os.path.exists('token.json'):
-    creds = Credentials.from_authorized_user_file('token.json', SCOPES)
-if not creds or not creds.valid:
-    if creds and creds.expired and creds.refresh_token:
-        creds.refresh(Request())
-    else:
-        flow = InstalledAppFlow.from_client_secrets_file(client_secret_path, SCOPES)
-        creds = flow.run_local_server(port=0)
-    with open('token.json', 'w') as token:
-        token.write(creds.to_json())
 
-calendar_service = build('calendar', 'v3', credentials=creds)
-drive_service = build('drive', 'v3', credentials=creds)
 
-# ------------- INPUT SCHEMAS ------------- #
-class TextInput(BaseModel):
-    text: str = Field(description="Plain text input")
+SUMMARY_TEMPLATE = "Summarize this meeting transcript:\n{transcript}\nProvide the summary and bullet point action items."
+
+LLM_CONFIG = {"model": "gpt-4o-mini", "temperature": 0.3}
+
+
+@lru_cache(maxsize=None)
+def get_llm():
+    from langchain_openai import ChatOpenAI
+    from rate_limiter import scheduler_rate_limiter
+    return ChatOpenAI(**LLM_CONFIG, rate_limiter=scheduler_rate_limiter("openai"))
+
+
+@lru_cache(maxsize=None)
+def get_chains():
+    from langchain.prompts import PromptTemplate
+    from langchain.chains import LLMChain
+    from langchain_openai import ChatOpenAI
+    from rate_limiter import RateLimitedChatModel
+
+    # The chains call through the scheduler directly, so it sees each prompt's size and retries 429s
+    llm = RateLimitedChatModel(ChatOpenAI(**LLM_CONFIG, include_response_headers=True), "openai").as_runnable()
+    summary_prompt = PromptTemplate(input_variables=["transcript"], template=SUMMARY_TEMPLATE)
+    calendar_prompt = PromptTemplate(input_variables=["transcript", "today_date"], template=CALENDAR_TEMPLATE)
+    return LLMChain(llm=llm, prompt=summary_prompt), LLMChain(llm=llm, prompt=calendar_prompt)
 
 # ------------- TOOL DEFINITIONS ------------- #
-class SummarizationTool(BaseTool):
-    name: str = "Summarization"
-    description: str = "Summarizes a meeting transcript."
-    args_schema: Type[BaseModel] = TextInput
-
-    def _run(self, text: str):
-        print("Summarization Tool Input:", text)  # Debugging
-        return summary_chain.invoke({"transcript": text})['text']
-    
-    def _arun(self, text: str):
-        raise NotImplementedError
-
-class GoogleDriveTool(BaseTool):
-    name: str = "Google Drive"
-    description: str = "Uploads a text file to Google Drive."
-    args_schema: Type[BaseModel] = TextInput
-
-    def _run(self, text: str):
-        file_name = "Meeting Summary.txt"
-        with open(file_name, 'w') as f:
-            f.write(text)
-
-        file_metadata = {
-            'name': file_name,
-            'mimeType': 'text/plain'
-        }
-
-        media = MediaFileUpload(file_name, mimetype='text/plain')
-        file = drive_service.files().create(body=file_metadata, media_body=media, fields='id').execute()
-        return f"File uploaded to Drive with ID: {file['id']}"
-
-    def _arun(self, text: str):
-        raise NotImplementedError
-
-class GoogleCalendarTool(BaseTool):
-    name: str = "Google Calendar"
-    description: str = "Creates a calendar event from structured meeting info."
-    args_schema: Type[BaseModel] = TextInput
-
-    def _run(self, text: str):
-        print("Google Calendar Tool Input:", text)  # Debugging
-        match = re.search(r"Title: (.*?)\nDate: (.*?)\nTime: (.*?)\nDescription: (.*?)$", text, re.DOTALL)
-        if not match:
-            return "No event info found."
-
-        title, date_str, time_str, description = match.groups()
-        
-        # Default to the next week if no date is found
-        if not date_str:
-            date_str = (datetime.datetime.now() + datetime.timedelta(days=7)).strftime("%Y-%m-%d")
-        
-        # Default to 10 AM if no time is found
-        if not time_str:
-            time_str = "10:00 AM"
-        
-        try:
-            start_time = self.parse_event_datetime(date_str, time_str)
-            end_time = start_time + datetime.timedelta(hours=1)
-
-            event = {
-                'summary': title,
-                'description': description,
-                'start': {'dateTime': start_time.isoformat(), 'timeZone': 'Asia/Jakarta'},
-                'end': {'dateTime': end_time.isoformat(), 'timeZone': 'Asia/Jakarta'}
-            }
-
-            created_event = calendar_service.events().insert(calendarId='primary', body=event).execute()
-            return f"Event created: {created_event.get('htmlLink')}"
-        except Exception as e:
-            return f"Error parsing event: {str(e)}"
+@cached_tool(config=dict(LLM_CONFIG, prompt=SUMMARY_TEMPLATE), name="Summarization")
+def summarize_text(text):
+    summary_chain, _ = get_chains()
+    return summary_chain.invoke({"transcript": text})['text']
+
+def build_tools():
+    # Tool classes subclass langchain's BaseTool, so they are defined on
+    # first use to keep langchain and pydantic out of the import path.
+    from langchain.tools import BaseTool
+    from pydantic import BaseModel, Field
+    from typing import Type
+
+    class TextInput(BaseModel):
+        text: str = Field(description="Plain text input")
+
+    class SummarizationTool(BaseTool):
+        name: str = "Summarization"
+        description: str = "Summarizes a meeting transcript."
+        args_schema: Type[BaseModel] = TextInput
+
+        def _run(self, text: str):
+            print("Summarization Tool Input:", text)  # Debugging
+            return summarize_text(text)
+
+        def _arun(self, text: str):
+            raise NotImplementedError
+
+    class GoogleDriveTool(BaseTool):
+        name: str = "Google Drive"
+        description: str = "Uploads a text file to Google Drive."
+        args_schema: Type[BaseModel] = TextInput
+
+        def _run(self, text: str):
+            # Keyed on the content, so a retried upload of the same summary reuses the first file
+            file_id = upload_text_file("Meeting Summary.txt", text, idempotency_key=transcript_key(text))
+            return f"File uploaded to Drive with ID: {file_id}"
+
+        def _arun(self, text: str):
+            raise NotImplementedError
+
+    class GoogleCalendarTool(BaseTool):
+        name: str = "Google Calendar"
+        description: str = "Creates a calendar event from structured meeting info."
+        args_schema: Type[BaseModel] = TextInput
+
+        def _run(self, text: str):
+            print("Google Calendar Tool Input:", text)  # Debugging
+            match = re.search(r"Title: (.*?)\nDate: (.*?)\nTime: (.*?)\nDescription: (.*?)$", text, re.DOTALL)
+            if not match:
+                return "No event info found."
+
+            title, date_str, time_str, description = match.groups()
+
+            # Default to the next week if no date is found
+            if not date_str:
+                date_str = (datetime.datetime.now() + datetime.timedelta(days=7)).strftime("%Y-%m-%d")
+
+            # Default to 10 AM if no time is found
+            if not time_str:
+                time_str = "10:00 AM"
+
+            try:
+                start_time = parse_event_datetime(date_str, time_str)
+                end_time = start_time + datetime.timedelta(hours=1)
+
+                event = {
+                    'summary': title,
+                    'description': description,
+                    'start': {'dateTime': start_time.isoformat(), 'timeZone': 'Asia/Jakarta'},
+                    'end': {'dateTime': end_time.isoformat(), 'timeZone': 'Asia/Jakarta'}
+                }
+
+                created_event, created = schedule_event(event, event_id=event_id(title, start_time.isoformat(), description))
+                if not created:
+                    return f"Event already on the calendar: {created_event.get('htmlLink')}"
+                return f"Event created: {created_event.get('htmlLink')}"
+            except Exception as e:
+                return f"Error parsing event: {str(e)}"
+
+    return [SummarizationTool(), GoogleDriveTool(), GoogleCalendarTool()]
 
 
 # ------------- AGENT SETUP ------------- #
-tools = [SummarizationTool(), GoogleDriveTool(), GoogleCalendarTool()]
-agent = initialize_agent(
-    tools=tools,
-    llm=llm,
-    agent_type="zero-shot-react-description",
-    verbose=True
-)
+@lru_cache(maxsize=None)
+def get_agent():
+    from langchain.agents import initialize_agent
+    return initialize_agent(
+        tools=build_tools(),
+        llm=get_llm(),
+        agent_type="zero-shot-react-description",
+        verbose=True
+    )
 
 # ------------- MAIN PROCESS ------------- #
-def preprocess_transcript(transcript):
-    # Extract lines with  tems or date/time references
-    relevant_lines = []
-    for line in transcript.splitlines():
-        if "next week" in line.lower() or "by" in line.lower() or "date" in line.lower():
-            relevant_lines.append(line)
-    return "\n".join(relevant_lines)
+def preprocess_transcript(transcript, context_lines=1):
+    # Keep only the windows around dates, times, weekdays, relative phrases and assignments
+    relevant, report = extract_relevant(transcript, context_lines)
+    print(report)
+    return relevant
 
 def split_transcript(transcript, max_length=1000):
     lines = transcript.splitlines()
@@ -179,20 +172,29 @@ def split_transcript(transcript, max_length=1000):
     return chunks
 
 def analyze_transcript(transcript):
+    summary_chain, calendar_chain = get_chains()
     summary = summary_chain.invoke({"transcript": transcript})['text']
+    # A follow-up whose date resolves locally skips the calendar LLM call; ambiguous ones still go to the LLM
+    event = pick_event(extract_events(transcript))
+    if event:
+        return summary, format_event(event)
     calendar_info = calendar_chain.invoke({"transcript": transcript, "today_date": datetime.date.today().isoformat()})['text']
     return summary, calendar_info
 
-def process_meeting(transcript):
+def process_meeting(transcript, store=None):
+    # Each stage is checkpointed under the transcript hash; a rerun resumes at the first unfinished one
+    store = store or StateStore()
+    key = transcript_key(transcript)
+
     # Preprocess and split the transcript
     preprocessed_transcript = preprocess_transcript(transcript)
     chunks = split_transcript(preprocessed_transcript)
 
     # Process each chunk
-    for chunk in chunks:
+    for index, chunk in enumerate(chunks):
         print("Processing Chunk:")
         print(chunk)
-        summary_text, calendar_text = analyze_transcript(chunk)
+        summary_text, calendar_text = store.run_stage(key, f"chunk_{index}", analyze_transcript, chunk)
         print("Chunk Summary:", summary_text)
         print("Chunk Calendar Info:", calendar_text)
 
@@ -200,21 +202,27 @@ def process_meeting(transcript):
     print("Agent Input for Summarization:")
     print(transcript)
 
-    summary = agent.run(f"Summarize this meeting transcript:\n{transcript}")
-    calendar_info = agent.run(
-        f"""Check this meeting transcript and extract any date and time for follow-up meetings or scheduled events.
-            Format the output like this if relevant:
+    agent = get_agent()
+    summary = store.run_stage(key, "summary", agent.run, f"Summarize this meeting transcript:\n{transcript}")
+    # Follow-ups whose date resolves locally skip the agent's extraction turn
+    event = pick_event(extract_events(transcript))
+    if event:
+        calendar_info = format_event(event)
+    else:
+        calendar_info = store.run_stage(key, "calendar", agent.run,
+            f"""Check this meeting transcript and extract any date and time for follow-up meetings or scheduled events.
+                Format the output like this if relevant:
 
-            Title: <title of the meeting>
-            Date: <YYYY-MM-DD>
-            Time: <HH:MM>
-            Description: <brief reason for the event>
+                Title: <title of the meeting>
+                Date: <YYYY-MM-DD>
+                Time: <HH:MM>
+                Description: <brief reason for the event>
 
-            Transcript:
-            {transcript}
+                Transcript:
+                {transcript}
 
-            If someone says 'let's follow up next week' and no date is given, default to the week after today at 10am."""
-    )
+                If someone says 'let's follow up next week' and no date is given, default to the week after today at 10am."""
+        )
 
     print("Raw Agent Output for Calendar Info:")
     print(calendar_info)
@@ -223,15 +231,24 @@ def process_meeting(transcript):
     match = re.search(r"Title: (.*?)\nDate: (.*?)\nTime: (.*?)\nDescription: (.*?)$", calendar_info, re.DOTALL)
     if not match:
         raise ValueError("Invalid format in calendar info.")
-    event_link = agent.run(f"Create a Google Calendar event from the following info:\n{calendar_info}")
-    drive_upload = agent.run(f"Upload the meeting summary to Google Drive:\n{summary}")
+    event_link = store.run_stage(key, "event_link", agent.run, f"Create a Google Calendar event from the following info:\n{calendar_info}")
+    drive_upload = store.run_stage(key, "drive_upload", agent.run, f"Upload the meeting summary to Google Drive:\n{summary}")
 
     print(summary)
     print(event_link)
     print(drive_upload)
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the meeting agent over a transcript.")
+    parser.add_argument("transcript", nargs="?", default="sample_meeting.txt", help="Path to the transcript file.")
+    parser.add_argument("--state", default="meeting_state.json", help="Checkpoint file; reruns resume at the first unfinished stage.")
+    args = parser.parse_args(argv)
+
+    with open(args.transcript, "r") as f:
+        transcript = f.read()
+    process_meeting(transcript, StateStore(args.state))
+
 # Example usage
 if __name__ == "__main__":
-    with open("sample_meeting.txt", "r") as f:
-        transcript = f.read()
-    process_meeting(transcript)
+    main()
+
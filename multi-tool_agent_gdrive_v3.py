@@ -1,52 +1,57 @@
 import os
 import re
+import argparse
+from functools import lru_cache
 from dotenv import load_dotenv
 import datetime
-from langchain_google_community.calendar.create_event import CalendarCreateEvent
-from langchain_google_community.calendar.utils import get_google_credentials
-from langchain_googledrive.utilities.google_drive import GoogleDriveAPIWrapper
-from langchain.agents import initialize_agent, AgentType, tool
-from langchain.memory import ConversationBufferMemory
-from langchain.chat_models import ChatOpenAI
 
+from calendar_sync import get_event_index
+from temporal import find_datetime
+from tool_cache import cached_tool
 
 # Ensure the environment variable for Google credentials is set
 load_dotenv()
 client_secret_path = os.getenv("GOOGLE_CLIENT_SECRET_PATH")
 
-# Initialize the language model
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+# Initialize the language model on first use
+LLM_CONFIG = {"model": "gpt-4o-mini", "temperature": 0}
+SUMMARY_PROMPT = "Summarize the following meeting transcript:\n\n{content}"
 
-# Initialize conversation memory
-memory = ConversationBufferMemory(memory_key="chat_history")
+@lru_cache(maxsize=None)
+def get_llm():
+    from langchain.chat_models import ChatOpenAI
+    from rate_limiter import scheduler_rate_limiter
+    return ChatOpenAI(**LLM_CONFIG, rate_limiter=scheduler_rate_limiter("openai"))
 
 # Global variable to store the summary
 summary_text = ""
 
+# Keyed on the file's contents and the prompt, so repeating the command for an unchanged transcript skips the LLM
+@cached_tool(config=dict(LLM_CONFIG, prompt=SUMMARY_PROMPT), file_args=("file_path",))
+def summarize_file(file_path):
+    with open(file_path, 'r') as file:
+        content = file.read()
+    return get_llm().predict(SUMMARY_PROMPT.format(content=content))
+
 # Tool to summarize the meeting transcript
-@tool
 def summarize_meeting(file_path: str) -> str:
     """Summarizes the meeting transcript from the specified file."""
     global summary_text
     try:
-        with open(file_path, 'r') as file:
-            content = file.read()
-        prompt = f"Summarize the following meeting transcript:\n\n{content}"
-        response = llm.predict(prompt)
-        summary_text = response
+        summary_text = summarize_file(file_path)
         print(summary_text)  # Debugging
         return "Meeting summarized successfully."
     except Exception as e:
         return f"Error summarizing meeting: {e}"
 
 # Tool to save the summary to Google Drive
-@tool
 def save_summary_to_drive(filename: str) -> str:
     """Saves the summary to Google Drive with the given filename."""
     global summary_text
     if not summary_text:
         return "No summary available. Please summarize the meeting first."
     try:
+        from langchain_googledrive.utilities.google_drive import GoogleDriveAPIWrapper
         drive_api = GoogleDriveAPIWrapper(scopes=['https://www.googleapis.com/auth/drive.file'])
         # Create a file in Google Drive
         file_metadata = {
@@ -60,7 +65,6 @@ def save_summary_to_drive(filename: str) -> str:
         return f"Error saving to Google Drive: {e}"
 
 # Tool to create a calendar event based on the summary
-@tool
 def create_calendar_event_from_summary() -> str:
     """Creates a calendar event based on the summarized meeting."""
     global summary_text
@@ -68,26 +72,20 @@ def create_calendar_event_from_summary() -> str:
         return "No summary available. Please summarize the meeting first."
     try:
         # Parse the summary_text to find mentions of new meetings or events
-        match_specific = re.search(
-            r"\*\*Next Meeting:\*\*.*?(?P<date>\w+ \d{1,2}, \d{4}).*?(?P<time>\d{1,2}:\d{2} (?:AM|PM))",
-            summary_text,
-            re.IGNORECASE
-        )
-        if match_specific:
-            # Extract specific date and time
-            date_str = match_specific.group("date")
-            time_str = match_specific.group("time")
-            event_datetime = datetime.datetime.strptime(f"{date_str} {time_str}", "%B %d, %Y %I:%M %p")
-        else:
-            # Check for "following week" phrasing
-            match_following_week = re.search(r"\*\*Next Meeting", summary_text, re.IGNORECASE)
-            if not match_following_week:
-                return "No mention of a new meeting or event found in the summary."
-
-            # Infer the date and time for the next meeting
-            today = datetime.date.today()
-            next_week = today + datetime.timedelta(weeks=1)
-            event_datetime = datetime.datetime.combine(next_week, datetime.time(10, 0))  # Default to 10:00 AM
+        match_next = re.search(r"\*\*Next Meeting[^\n]*(?:\n[^\n]*){0,2}", summary_text, re.IGNORECASE)
+        if not match_next:
+            return "No mention of a new meeting or event found in the summary."
+
+        # Resolve the date locally; with no usable date, default to next week at 10:00 AM
+        event_datetime = find_datetime(match_next.group(0)) or find_datetime("next week")
+
+        # Skip if the synced local event index already has this follow-up
+        index = get_event_index()
+        index.sync()
+        # The title is always generic, so only an event with this same summary as description matches
+        existing = index.find_duplicate("Follow-up Meeting", event_datetime, description=summary_text)
+        if existing:
+            return f"Follow-up already on the calendar at {existing['start']}: {existing.get('htmlLink')}"
 
         # Set default duration (1 hour)
         end_datetime = event_datetime + datetime.timedelta(hours=1)
@@ -108,6 +106,8 @@ def create_calendar_event_from_summary() -> str:
         print("Payload for Calendar Event:", payload)  # Debugging
 
         # Create the calendar event
+        from langchain_google_community.calendar.create_event import CalendarCreateEvent
+        from langchain_google_community.calendar.utils import get_google_credentials
         credentials = get_google_credentials(
             token_file="token.json",
             client_secrets_file=client_secret_path,
@@ -117,23 +117,33 @@ def create_calendar_event_from_summary() -> str:
         )
         result = calendar_tool.run(payload)
         print("API Response:", result)  # Debugging
+        index.sync()
         return f"Calendar event created: {result}"
     except Exception as e:
         print(f"Error details: {e}")  # Debugging
         return f"Error creating calendar event: {e}"
 
-# Initialize the agent with the defined tools
-tools = [summarize_meeting, save_summary_to_drive, create_calendar_event_from_summary]
-agent = initialize_agent(
-    tools,
-    llm,
-    agent=AgentType.OPENAI_FUNCTIONS,
-    verbose=True,
-    memory=memory
-)
+# Initialize the agent with the defined tools on the first command
+@lru_cache(maxsize=None)
+def get_agent():
+    from langchain.agents import initialize_agent, AgentType, tool
+    from langchain.memory import ConversationBufferMemory
+
+    memory = ConversationBufferMemory(memory_key="chat_history")
+    tools = [tool(summarize_meeting), tool(save_summary_to_drive), tool(create_calendar_event_from_summary)]
+    return initialize_agent(
+        tools,
+        get_llm(),
+        agent=AgentType.OPENAI_FUNCTIONS,
+        verbose=True,
+        memory=memory
+    )
 
 # Command-line interface loop
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Interactive meeting assistant backed by Google Drive and Calendar.")
+    parser.parse_args(argv)
+
     print("Welcome to the Meeting Assistant!")
     print("Available commands:")
     print("- Summarize the meeting from sample_meeting.txt")
@@ -146,7 +156,7 @@ def main():
         if user_input.lower() in ["exit", "quit"]:
             print("Goodbye!")
             break
-        response = agent.run(user_input)
+        response = get_agent().run(user_input)
         print(f"\n{response}")
 
 if __name__ == "__main__":
@@ -0,0 +1,93 @@
+"""Tool-calling agent that runs a turn's tool calls concurrently.
+
+    agent = ParallelToolAgent([tool(summarize_meeting), tool(extract_tasks)], llm, verbose=True)
+    agent.invoke("Summarize this meeting and list its action items: ...")["output"]
+
+The OPENAI_FUNCTIONS AgentExecutor handles one function call per model
+turn. Work needing two independent tools therefore costs two LLM round
+trips plus both tools' run times, back to back. This agent binds the
+tools with the chat model's native tool calling, which lets the model ask
+for several tools in one turn. Those calls cannot depend on each other,
+because none of their results exist yet. So they run together in a
+bounded thread pool, and every result goes back to the model as one batch
+of ToolMessages before the next turn. Tools listed in `serial` never run
+concurrently with themselves, e.g. writes to a rate-limited API. A failing
+tool returns its error to the model instead of aborting the run.
+
+With `memory=True` the user inputs and final answers are kept as chat
+history across invoke() calls, like ConversationBufferMemory.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ParallelToolAgent:
+    def __init__(self, tools, llm, max_workers=4, max_iterations=8, serial=(), memory=True, verbose=False,
+                 system_prompt="You are a helpful assistant. When several tools are needed and they do not depend on "
+                               "each other's results, call them all in the same turn."):
+        self.tools = {t.name: t for t in tools}
+        self.llm = llm.bind_tools(tools)
+        self.max_workers = max_workers
+        self.max_iterations = max_iterations
+        self.locks = {name: threading.Lock() for name in serial}
+        self.memory = memory
+        self.verbose = verbose
+        self.system_prompt = system_prompt
+        self.chat_history = []
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+
+    def _run_tool(self, call):
+        tool = self.tools.get(call["name"])
+        start = time.perf_counter()
+        if tool is None:
+            content, status = f"Error: unknown tool '{call['name']}'. Available: {', '.join(self.tools)}", "error"
+        else:
+            try:
+                lock = self.locks.get(call["name"])
+                if lock:
+                    with lock:
+                        result = tool.invoke(call["args"])
+                else:
+                    result = tool.invoke(call["args"])
+                content, status = str(getattr(result, "content", result)), "success"
+            except Exception as e:
+                content, status = f"Error: {type(e).__name__}: {e}", "error"
+        if self.verbose:
+            print(f"  ← {call['name']} ({time.perf_counter() - start:.2f}s): {content[:200]}")
+        return content, status
+
+    def invoke(self, input):
+        from langchain_core.messages import HumanMessage, SystemMessage, ToolMessage
+
+        if isinstance(input, dict):
+            input = input["input"]
+        human = HumanMessage(input)
+        messages = [SystemMessage(self.system_prompt), *self.chat_history, human]
+        llm_calls = tool_calls = 0
+        output = "Agent stopped after reaching the iteration limit."
+        for _ in range(self.max_iterations):
+            response = self.llm.invoke(messages)
+            llm_calls += 1
+            messages.append(response)
+            if not response.tool_calls:
+                output = response.content
+                if self.memory:
+                    self.chat_history += [human, response]
+                break
+            calls = response.tool_calls
+            tool_calls += len(calls)
+            if self.verbose:
+                print(f"→ {len(calls)} tool call(s): {', '.join(call['name'] for call in calls)}")
+            # Calls from one turn are independent by construction; their results go back together
+            results = list(self._pool.map(self._run_tool, calls))
+            messages.extend(
+                ToolMessage(content=content, tool_call_id=call["id"], name=call["name"], status=status)
+                for call, (content, status) in zip(calls, results)
+            )
+        if self.verbose:
+            print(f"Finished in {llm_calls} model call(s), {tool_calls} tool call(s).")
+        return {"input": input, "output": output, "llm_calls": llm_calls, "tool_calls": tool_calls}
+
+    def run(self, input):
+        return self.invoke(input)["output"]
@@ -0,0 +1,138 @@
+"""Page-parallel PDF extraction with a per-page text cache.
+
+ParallelPDFLoader stands in for PyMuPDFLoader(path).load(). Page ranges are
+extracted in a process pool, and Documents are yielded in page order as
+soon as each range finishes. Extracted text is stored in sqlite keyed by
+(file sha256, page number), so re-ingesting an unchanged file never opens
+it in MuPDF. Metadata matches PyMuPDFLoader's (source, file_path, page,
+total_pages plus the document info fields).
+
+    docs = ParallelPDFLoader("logic_test_hc.pdf").load()
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+DEFAULT_CACHE_PATH = ".pdf_cache.sqlite"
+
+
+def _open_pdf(path):
+    try:
+        import pymupdf
+    except ImportError:
+        import fitz as pymupdf  # PyMuPDF < 1.24
+    return pymupdf.open(path)
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _document_info(path):
+    with _open_pdf(path) as doc:
+        info = {key: value for key, value in (doc.metadata or {}).items() if isinstance(value, (str, int, float))}
+        return doc.page_count, info
+
+
+def _extract_range(path, pages):
+    # Runs in a worker process: one open per range amortises parsing the xref table
+    with _open_pdf(path) as doc:
+        return [(page, doc[page].get_text()) for page in pages]
+
+
+class PageCache:
+    def __init__(self, path=DEFAULT_CACHE_PATH):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages (file_hash TEXT, page INTEGER, text TEXT, PRIMARY KEY (file_hash, page))"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS files (file_hash TEXT PRIMARY KEY, page_count INTEGER, info TEXT)")
+        self._conn.commit()
+
+    def get_file(self, file_hash):
+        with self._lock:
+            row = self._conn.execute("SELECT page_count, info FROM files WHERE file_hash = ?", (file_hash,)).fetchone()
+        return (row[0], json.loads(row[1])) if row else None
+
+    def put_file(self, file_hash, page_count, info):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?)", (file_hash, page_count, json.dumps(info)))
+            self._conn.commit()
+
+    def get_pages(self, file_hash):
+        with self._lock:
+            return dict(self._conn.execute("SELECT page, text FROM pages WHERE file_hash = ?", (file_hash,)))
+
+    def put_pages(self, file_hash, pages):
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?)", [(file_hash, page, text) for page, text in pages]
+            )
+            self._conn.commit()
+
+
+class ParallelPDFLoader:
+    def __init__(self, path, workers=None, pages_per_task=32, cache_path=DEFAULT_CACHE_PATH):
+        self.path = path
+        self.workers = workers or os.cpu_count() or 1
+        self.pages_per_task = pages_per_task
+        self.cache = PageCache(cache_path) if cache_path else None
+        self.extracted_pages = 0
+        self.cached_pages = 0
+
+    def _metadata(self, page, page_count, info):
+        return dict(info, source=self.path, file_path=self.path, page=page, total_pages=page_count)
+
+    def lazy_load(self):
+        from langchain_core.documents import Document
+
+        file_hash = file_sha256(self.path)
+        known = self.cache.get_file(file_hash) if self.cache else None
+        if known is None:
+            page_count, info = _document_info(self.path)
+            if self.cache:
+                self.cache.put_file(file_hash, page_count, info)
+        else:
+            page_count, info = known
+        cached = self.cache.get_pages(file_hash) if self.cache else {}
+
+        missing = [page for page in range(page_count) if page not in cached]
+        ranges = [missing[i:i + self.pages_per_task] for i in range(0, len(missing), self.pages_per_task)]
+        pool = ProcessPoolExecutor(max_workers=self.workers) if len(ranges) > 1 and self.workers > 1 else None
+        try:
+            if pool:
+                results = pool.map(_extract_range, [self.path] * len(ranges), ranges)
+            else:
+                results = (_extract_range(self.path, pages) for pages in ranges)
+
+            # Walk pages in order, pulling the next extracted range only when the cache runs out
+            next_page = 0
+            for extracted in results:
+                if self.cache:
+                    self.cache.put_pages(file_hash, extracted)
+                self.extracted_pages += len(extracted)
+                for page, text in extracted:
+                    while next_page < page:
+                        self.cached_pages += 1
+                        yield Document(page_content=cached[next_page], metadata=self._metadata(next_page, page_count, info))
+                        next_page += 1
+                    yield Document(page_content=text, metadata=self._metadata(page, page_count, info))
+                    next_page += 1
+            while next_page < page_count:
+                self.cached_pages += 1
+                yield Document(page_content=cached[next_page], metadata=self._metadata(next_page, page_count, info))
+                next_page += 1
+        finally:
+            if pool:
+                pool.shutdown(cancel_futures=True)
+
+    def load(self):
+        return list(self.lazy_load())
@@ -0,0 +1,386 @@
+import asyncio
+import functools
+import heapq
+import itertools
+import os
+import random
+import re
+import threading
+import time
+
+# ------------- TOKEN ESTIMATION ------------- #
+@functools.lru_cache(maxsize=None)
+def _encoding():
+    # Resolved once: a failed import is retried on every call otherwise
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    return tiktoken.get_encoding("cl100k_base")
+
+
+def estimate_tokens(text):
+    """Counts prompt tokens with tiktoken when it is installed, else ~4 chars per token."""
+    if hasattr(text, "to_string"):
+        text = text.to_string()  # LangChain PromptValue
+    text = text if isinstance(text, str) else str(text)
+    encoding = _encoding()
+    if encoding is None:
+        return max(1, len(text) // 4)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+# ------------- BUCKETS ------------- #
+class TokenBucket:
+    """Refills `rate` units every `per` seconds, up to a burst of `rate`."""
+
+    def __init__(self, rate, per=60.0):
+        self.capacity = float(rate)
+        self.rate = float(rate)
+        self.per = per
+        self.tokens = float(rate)
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate / self.per)
+        self.updated = now
+
+    def wait_time(self, amount):
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) * self.per / self.rate
+
+    def consume(self, amount):
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+    def cap(self, remaining):
+        # The server knows better: never believe we have more than it reports
+        self._refill()
+        self.tokens = min(self.tokens, float(remaining))
+
+    def scale(self, factor, ceiling):
+        self.rate = max(1.0, min(ceiling, self.rate * factor))
+
+
+class ProviderLimits:
+    def __init__(self, rpm, tpm, window=60.0):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.window = window
+
+
+# Conservative defaults; override per deployment with e.g. OPENAI_RPM / OPENAI_TPM
+DEFAULT_LIMITS = {
+    "openai": (500, 200_000),
+    "anthropic": (50, 40_000),
+    "gemini": (60, 1_000_000),
+}
+
+def limits_from_env():
+    limits = {}
+    for provider, (rpm, tpm) in DEFAULT_LIMITS.items():
+        prefix = provider.upper()
+        limits[provider] = ProviderLimits(
+            int(os.getenv(f"{prefix}_RPM", rpm)),
+            int(os.getenv(f"{prefix}_TPM", tpm)),
+        )
+    return limits
+
+
+# ------------- RATE-LIMIT SIGNALS ------------- #
+INTERACTIVE = 0
+BATCH = 10
+
+def _parse_duration(value):
+    """Parses header durations such as '20', '1.5s', '6m0s' or '250ms' into seconds."""
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    total = 0.0
+    for amount, unit in re.findall(r"([\d.]+)(ms|s|m|h)", value):
+        total += float(amount) * {"ms": 0.001, "s": 1, "m": 60, "h": 3600}[unit]
+    return total or None
+
+def _lower_headers(headers):
+    return {str(k).lower(): v for k, v in dict(headers or {}).items()}
+
+def is_rate_limit_error(exc):
+    if getattr(exc, "status_code", None) == 429 or getattr(exc, "code", None) == 429:
+        return True
+    return type(exc).__name__ in ("RateLimitError", "ResourceExhausted")
+
+def error_headers(exc):
+    response = getattr(exc, "response", None)
+    return _lower_headers(getattr(exc, "headers", None) or getattr(response, "headers", None))
+
+def response_headers(result):
+    # Only ChatOpenAI fills this, and only when built with include_response_headers=True
+    metadata = getattr(result, "response_metadata", None) or {}
+    return _lower_headers(metadata.get("headers") if isinstance(metadata, dict) else None)
+
+
+# ------------- SCHEDULER ------------- #
+class _ProviderState:
+    def __init__(self, limits):
+        self.limits = limits
+        self.requests = TokenBucket(limits.rpm, limits.window)
+        self.tokens = TokenBucket(limits.tpm, limits.window)
+        self.queue = []
+        self.blocked_until = 0.0
+        self.consecutive_429 = 0
+        self.wakeup = None
+        self.dispatcher = None
+
+
+class RateLimitedScheduler:
+    """Shared gate for model calls, with request and token buckets per provider.
+
+    Callers `submit` a coroutine factory together with the prompt text. The
+    request waits in a per-provider priority queue (INTERACTIVE before BATCH)
+    until both buckets have room for it. 429s and rate-limit headers feed
+    back into the buckets: `retry-after` pauses the provider, repeated 429s
+    back off exponentially and shrink the rate, and successes grow it back.
+    Successful responses carry x-ratelimit-remaining-* headers only from a
+    ChatOpenAI built with include_response_headers=True; for the other
+    providers the buckets and the 429s are all there is.
+
+    All bookkeeping lives on one background event loop, so callers on any
+    thread or loop (including LangChain's batch thread pool) share it safely.
+    """
+
+    def __init__(self, limits=None, max_retries=5, base_backoff=1.0):
+        self.limits = limits or limits_from_env()
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.states = {}
+        self.counter = itertools.count()
+        self.stats = {"requests": 0, "rate_limited": 0, "tokens": 0}
+        self.loop = None
+        self.lock = threading.Lock()
+
+    def _ensure_loop(self):
+        with self.lock:
+            if self.loop is None:
+                self.loop = asyncio.new_event_loop()
+                threading.Thread(target=self.loop.run_forever, name="rate-limiter", daemon=True).start()
+        return self.loop
+
+    def close(self):
+        """Stops the dispatchers and the background loop."""
+        if self.loop is None:
+            return
+
+        async def shutdown():
+            dispatchers = [state.dispatcher for state in self.states.values() if state.dispatcher]
+            for task in dispatchers:
+                task.cancel()
+            await asyncio.gather(*dispatchers, return_exceptions=True)
+
+        asyncio.run_coroutine_threadsafe(shutdown(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.loop = None
+
+    def _state(self, provider):
+        state = self.states.get(provider)
+        if state is None:
+            limits = self.limits.get(provider) or ProviderLimits(*DEFAULT_LIMITS.get(provider, (60, 100_000)))
+            state = self.states[provider] = _ProviderState(limits)
+        if state.dispatcher is None or state.dispatcher.done():
+            state.wakeup = asyncio.Event()
+            state.dispatcher = asyncio.ensure_future(self._dispatch(state))
+        return state
+
+    async def _dispatch(self, state):
+        while True:
+            if not state.queue:
+                state.wakeup.clear()
+                await state.wakeup.wait()
+                continue
+            priority, seq, tokens, granted = state.queue[0]
+            if granted.cancelled():
+                heapq.heappop(state.queue)
+                continue
+            wait = max(
+                state.blocked_until - time.monotonic(),
+                state.requests.wait_time(1),
+                state.tokens.wait_time(tokens),
+            )
+            if wait > 0:
+                # Sleep, but wake early if a higher-priority request arrives
+                state.wakeup.clear()
+                try:
+                    await asyncio.wait_for(state.wakeup.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            heapq.heappop(state.queue)
+            state.requests.consume(1)
+            state.tokens.consume(tokens)
+            granted.set_result(None)
+
+    async def _acquire(self, provider, tokens, priority):
+        state = self._state(provider)
+        granted = asyncio.get_running_loop().create_future()
+        heapq.heappush(state.queue, (priority, next(self.counter), tokens, granted))
+        state.wakeup.set()
+        await granted
+        return state
+
+    def observe(self, provider, headers):
+        """Aligns the buckets with rate-limit headers from a provider response."""
+        state = self.states.get(provider)
+        if state is None or not headers:
+            return
+        for key in ("x-ratelimit-remaining-requests", "anthropic-ratelimit-requests-remaining"):
+            if key in headers:
+                state.requests.cap(headers[key])
+        for key in ("x-ratelimit-remaining-tokens", "anthropic-ratelimit-tokens-remaining"):
+            if key in headers:
+                state.tokens.cap(headers[key])
+
+    def _backoff(self, state, headers):
+        state.consecutive_429 += 1
+        delay = _parse_duration(headers.get("retry-after")) or _parse_duration(headers.get("x-ratelimit-reset-requests"))
+        if delay is None:
+            delay = self.base_backoff * 2 ** (state.consecutive_429 - 1) * random.uniform(0.5, 1.0)
+            # No hint from the server: our idea of the quota is too generous.
+            # Multiplicative decrease; successes add the rate back slowly.
+            state.requests.scale(0.8, state.limits.rpm)
+            state.tokens.scale(0.8, state.limits.tpm)
+        state.blocked_until = max(state.blocked_until, time.monotonic() + delay)
+
+    def _recover(self, state):
+        state.consecutive_429 = 0
+        state.requests.scale(1.02, state.limits.rpm)
+        state.tokens.scale(1.02, state.limits.tpm)
+
+    async def submit(self, provider, call, prompt="", priority=BATCH, max_output_tokens=256):
+        """Runs `await call()` once the provider's buckets allow it, retrying 429s.
+
+        `call` is a coroutine factory; it is awaited on the scheduler's loop.
+        """
+        future = asyncio.run_coroutine_threadsafe(
+            self._submit(provider, call, prompt, priority, max_output_tokens), self._ensure_loop()
+        )
+        return await asyncio.wrap_future(future)
+
+    def submit_sync(self, provider, call, prompt="", priority=BATCH, max_output_tokens=256):
+        future = asyncio.run_coroutine_threadsafe(
+            self._submit(provider, call, prompt, priority, max_output_tokens), self._ensure_loop()
+        )
+        return future.result()
+
+    async def _submit(self, provider, call, prompt, priority, max_output_tokens):
+        tokens = estimate_tokens(prompt) + max_output_tokens
+        for attempt in range(self.max_retries + 1):
+            state = await self._acquire(provider, tokens, priority)
+            self.stats["requests"] += 1
+            try:
+                result = await call()
+            except Exception as exc:
+                if not is_rate_limit_error(exc) or attempt == self.max_retries:
+                    raise
+                self.stats["rate_limited"] += 1
+                self._backoff(state, error_headers(exc))
+                continue
+            self.stats["tokens"] += tokens
+            self._recover(state)
+            self.observe(provider, response_headers(result))
+            return result
+
+
+_scheduler = None
+
+def get_scheduler():
+    """The process-wide scheduler every wrapped model call goes through."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = RateLimitedScheduler()
+    return _scheduler
+
+
+class RateLimitedChatModel:
+    """Routes a chat model's calls through the shared scheduler."""
+
+    def __init__(self, model, provider, priority=INTERACTIVE, max_output_tokens=256, scheduler=None):
+        self.model = model
+        self.provider = provider
+        self.priority = priority
+        self.max_output_tokens = max_output_tokens
+        self.scheduler = scheduler
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        scheduler = self.scheduler or get_scheduler()
+        return await scheduler.submit(
+            self.provider,
+            lambda: self.model.ainvoke(input, config=config, **kwargs),
+            prompt=input,
+            priority=self.priority,
+            max_output_tokens=self.max_output_tokens,
+        )
+
+    def invoke(self, input, config=None, **kwargs):
+        scheduler = self.scheduler or get_scheduler()
+        return scheduler.submit_sync(
+            self.provider,
+            lambda: self.model.ainvoke(input, config=config, **kwargs),
+            prompt=input,
+            priority=self.priority,
+            max_output_tokens=self.max_output_tokens,
+        )
+
+    def as_runnable(self):
+        from langchain_core.runnables import RunnableLambda
+        return RunnableLambda(func=self.invoke, afunc=self.ainvoke, name=f"RateLimited[{self.provider}]")
+
+
+async def _granted():
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def _scheduler_rate_limiter_class():
+    # Subclasses langchain_core's BaseRateLimiter, so it is defined on first use
+    from langchain_core.rate_limiters import BaseRateLimiter
+
+    class SchedulerRateLimiter(BaseRateLimiter):
+        def __init__(self, provider, priority, max_output_tokens, scheduler):
+            self.provider = provider
+            self.priority = priority
+            self.max_output_tokens = max_output_tokens
+            self.scheduler = scheduler
+
+        def acquire(self, *, blocking=True):
+            (self.scheduler or get_scheduler()).submit_sync(
+                self.provider, _granted, priority=self.priority, max_output_tokens=self.max_output_tokens
+            )
+            return True
+
+        async def aacquire(self, *, blocking=True):
+            await (self.scheduler or get_scheduler()).submit(
+                self.provider, _granted, priority=self.priority, max_output_tokens=self.max_output_tokens
+            )
+            return True
+
+    return SchedulerRateLimiter
+
+
+def scheduler_rate_limiter(provider, priority=INTERACTIVE, max_output_tokens=1024, scheduler=None):
+    """A LangChain rate limiter that takes its slots from the shared scheduler.
+
+    For models LangChain has to own, such as agents and RetrievalQA: pass it
+    as the chat model's `rate_limiter=`. The model then queues in the same
+    buckets as RateLimitedChatModel calls. The limiter never sees the prompt,
+    so each request reserves `max_output_tokens`, and 429s are left to the
+    model's own retries. It always waits for a slot, even with
+    blocking=False.
+    """
+    return _scheduler_rate_limiter_class()(provider, priority, max_output_tokens, scheduler)
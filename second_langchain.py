@@ -1,41 +1,68 @@
-from langchain_core.prompts import PromptTemplate
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.runnables import RunnableSequence, RunnableLambda
+from functools import lru_cache
 from dotenv import load_dotenv
+import argparse
 import os
 
+from batch_runner import add_batch_arguments, run_from_args
+
 # Load your Gemini API Key from .env
 load_dotenv()
-os.environ["GOOGLE_API_KEY"] = os.getenv("GOOGLE_API_KEY")
 
-# Load Gemini model
-llm = ChatGoogleGenerativeAI(model="gemini-2.0-pro-exp", temperature=0.7)
+# Load Gemini model on first use
+@lru_cache(maxsize=None)
+def get_llm():
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    os.environ["GOOGLE_API_KEY"] = os.getenv("GOOGLE_API_KEY")
+    return ChatGoogleGenerativeAI(model="gemini-2.0-pro-exp", temperature=0.7)
+
+@lru_cache(maxsize=None)
+def build_chain(batch=False):
+    from langchain_core.prompts import PromptTemplate
+    from langchain_core.runnables import RunnableSequence, RunnableLambda
+
+    from rate_limiter import BATCH, INTERACTIVE, RateLimitedChatModel
+
+    # Every call goes through the shared per-provider rate-limit scheduler
+    llm = RateLimitedChatModel(get_llm(), "gemini", priority=BATCH if batch else INTERACTIVE).as_runnable()
+
+    # First prompt: generate a startup idea
+    startup_prompt = PromptTemplate(
+        input_variables=["product"],
+        template="Give me a creative startup idea for a product that sells {product}."
+    )
+
+    # Second prompt: generate a slogan from the idea
+    slogan_prompt = PromptTemplate(
+        input_variables=["idea"],
+        template="Create a catchy slogan for this startup idea: {idea}"
+    )
+
+    # Step 1: startup idea (product -> idea)
+    step_1 = startup_prompt | llm
 
-# First prompt: generate a startup idea
-startup_prompt = PromptTemplate(
-    input_variables=["product"],
-    template="Give me a creative startup idea for a product that sells {product}."
-)
+    # Step 2: map output from step_1 to input for step_2
+    extract_idea = RunnableLambda(lambda output: {"idea": output.content.strip()})
 
-# Second prompt: generate a slogan from the idea
-slogan_prompt = PromptTemplate(
-    input_variables=["idea"],
-    template="Create a catchy slogan for this startup idea: {idea}"
-)
+    step_2 = slogan_prompt | llm
 
-# Step 1: startup idea (product -> idea)
-step_1 = startup_prompt | llm
+    # Combine into a full chain
+    return RunnableSequence(first=step_1, middle=[extract_idea], last=step_2)
 
-# Step 2: map output from step_1 to input for step_2
-extract_idea = RunnableLambda(lambda output: {"idea": output.content.strip()})
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a startup idea and a slogan for it.")
+    add_batch_arguments(parser)
+    parser.add_argument("--product", default="self-driving cars")
+    args = parser.parse_args(argv)
 
-step_2 = slogan_prompt | llm
+    if args.batch:
+        run_from_args(build_chain(batch=True), args)
+        return
 
-# Combine into a full chain
-full_chain = RunnableSequence(first=step_1, middle=[extract_idea], last=step_2)
+    # Run the chain
+    result = build_chain().invoke({"product": args.product})
 
-# Run the chain
-result = full_chain.invoke({"product": "self-driving cars"})
+    # Access the content of the AIMessage object
+    print(result.content)
 
-# Access the content of the AIMessage object
-print(result.content)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""Sharded vector index with parallel fan-out search.
+
+    store = ShardedVectorStore(make_shard, num_shards=4, embeddings=embeddings)
+    store.add_documents(chunks)                 # each shard ingests its part in parallel
+    store.similarity_search("question", k=3)    # query embedded once, all shards searched in parallel
+    store.rebuild_shard(2, chunks)              # only shard 2 is dropped and re-indexed
+    retriever = ShardedRetriever(store=store, k=3)
+
+`make_shard(shard_id)` returns an empty vector store, e.g. a Chroma
+collection per shard. Chunks go to a shard by a stable hash of their
+`source` metadata (by="source", so one source's chunks stay together and
+updating a source touches a single shard) or of their text (by="hash",
+for an even spread). Every shard returns its own top-k for the query
+vector, and the lists are merged into the global top-k. Since each shard
+search is exact over its part, the merged result is the same as one big
+index would return.
+
+With workers="thread" the shards live in this process. That suits stores
+that release the GIL (Chroma's hnswlib, remote stores) and embedding API
+calls during ingest. workers="process" gives every shard its own worker
+process, so pure-Python or CPU-bound indexes scale across cores. The
+factory must then be picklable, i.e. a module-level function or a
+functools.partial of one.
+"""
+import hashlib
+import heapq
+import multiprocessing
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from langchain_core.retrievers import BaseRetriever
+
+
+def shard_key(doc, by="source"):
+    if by == "source":
+        return str(doc.metadata.get("source", ""))
+    return doc.page_content
+
+
+def shard_for(key, num_shards):
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") % num_shards
+
+
+class LocalShard:
+    """One shard's store in this process. Scores are normalised so that higher is better."""
+
+    def __init__(self, factory, shard_id, scores="distance"):
+        self.factory = factory
+        self.shard_id = shard_id
+        self.scores = scores
+        self.store = factory(shard_id)
+
+    def add(self, docs):
+        if docs:
+            self.store.add_documents(docs)
+        return len(docs)
+
+    def search(self, vector, k):
+        if self.scores == "distance":
+            # Chroma reports distances here despite the method's name
+            hits = self.store.similarity_search_by_vector_with_relevance_scores(vector, k)
+            return [(-distance, doc) for doc, distance in hits]
+        return [(score, doc) for doc, score in self.store.similarity_search_by_vector_with_score(vector, k)]
+
+    def delete_source(self, source):
+        ids = self.store.get(where={"source": source})["ids"]
+        if ids:
+            self.store.delete(ids)
+        return len(ids)
+
+    def reset(self):
+        if hasattr(self.store, "delete_collection"):
+            self.store.delete_collection()
+        self.store = self.factory(self.shard_id)
+
+    def close(self):
+        pass
+
+
+def _shard_worker(connection, factory, shard_id, scores):
+    shard = LocalShard(factory, shard_id, scores)
+    while True:
+        method, args = connection.recv()
+        if method == "close":
+            break
+        try:
+            connection.send((True, getattr(shard, method)(*args)))
+        except Exception as e:
+            connection.send((False, e))
+    connection.close()
+
+
+class ProcessShard:
+    """A LocalShard running in its own worker process; calls block until the worker replies."""
+
+    def __init__(self, factory, shard_id, scores="distance", mp_context=None):
+        context = multiprocessing.get_context(mp_context)
+        self.shard_id = shard_id
+        self._lock = threading.Lock()  # one request in flight per pipe
+        self._connection, child = context.Pipe()
+        self._process = context.Process(target=_shard_worker, args=(child, factory, shard_id, scores), daemon=True)
+        self._process.start()
+        child.close()
+
+    def _call(self, method, *args):
+        with self._lock:
+            self._connection.send((method, args))
+            ok, value = self._connection.recv()
+        if not ok:
+            raise value
+        return value
+
+    def add(self, docs):
+        return self._call("add", docs)
+
+    def search(self, vector, k):
+        return self._call("search", vector, k)
+
+    def delete_source(self, source):
+        return self._call("delete_source", source)
+
+    def reset(self):
+        return self._call("reset")
+
+    def close(self):
+        if self._process.is_alive():
+            with self._lock:
+                self._connection.send(("close", ()))
+            self._process.join(timeout=5)
+        self._connection.close()
+
+
+class ShardedVectorStore:
+    def __init__(self, factory, num_shards, embeddings, by="source", workers="thread", scores="distance", mp_context=None):
+        if by not in ("source", "hash"):
+            raise ValueError(f"Unknown shard key: {by}")
+        self.embeddings = embeddings
+        self.num_shards = num_shards
+        self.by = by
+        if workers == "process":
+            self.shards = [ProcessShard(factory, i, scores, mp_context) for i in range(num_shards)]
+        elif workers == "thread":
+            self.shards = [LocalShard(factory, i, scores) for i in range(num_shards)]
+        else:
+            raise ValueError(f"Unknown worker type: {workers}")
+        self._pool = ThreadPoolExecutor(max_workers=num_shards)
+
+    def shard_of(self, doc):
+        return shard_for(shard_key(doc, self.by), self.num_shards)
+
+    def partition(self, docs):
+        parts = [[] for _ in range(self.num_shards)]
+        for doc in docs:
+            parts[self.shard_of(doc)].append(doc)
+        return parts
+
+    def add_documents(self, docs):
+        parts = self.partition(docs)
+        return sum(self._pool.map(lambda shard, part: shard.add(part), self.shards, parts))
+
+    def similarity_search_with_score(self, query, k=4):
+        vector = self.embeddings.embed_query(query)
+        per_shard = self._pool.map(lambda shard: shard.search(vector, k), self.shards)
+        best = heapq.nlargest(k, (hit for hits in per_shard for hit in hits), key=lambda hit: hit[0])
+        return [(doc, score) for score, doc in best]
+
+    def similarity_search(self, query, k=4):
+        return [doc for doc, _ in self.similarity_search_with_score(query, k)]
+
+    def delete_source(self, source):
+        """Removes a source's chunks; with by="source" only its own shard is touched."""
+        if self.by == "source":
+            return self.shards[shard_for(source, self.num_shards)].delete_source(source)
+        return sum(self._pool.map(lambda shard: shard.delete_source(source), self.shards))
+
+    def rebuild_shard(self, shard_id, docs):
+        """Drops one shard and re-indexes the chunks of `docs` that belong to it; other shards keep serving."""
+        shard = self.shards[shard_id]
+        shard.reset()
+        return shard.add([doc for doc in docs if self.shard_of(doc) == shard_id])
+
+    def close(self):
+        for shard in self.shards:
+            shard.close()
+        self._pool.shutdown()
+
+
+class ShardedRetriever(BaseRetriever):
+    """Retriever over a ShardedVectorStore, usable wherever `vectorstore.as_retriever()` was."""
+
+    store: Any
+    k: int = 4
+
+    def _get_relevant_documents(self, query, *, run_manager=None):
+        return self.store.similarity_search(query, self.k)
@@ -0,0 +1,255 @@
+import calendar
+import datetime
+import re
+from zoneinfo import ZoneInfo
+
+DEFAULT_TIMEZONE = "Asia/Jakarta"
+DEFAULT_TIME = datetime.time(10, 0)
+
+MONTHS = {name: index for index, name in enumerate(calendar.month_name) if name}
+MONTHS.update({name[:3]: index for name, index in list(MONTHS.items())})
+MONTHS["sept"] = 9
+MONTHS = {name.lower(): index for name, index in MONTHS.items()}
+WEEKDAYS = {name.lower(): index for index, name in enumerate(calendar.day_name)}
+NUMBERS = {"a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7}
+
+# A lowercase "may" is the verb ("I may 3D print it"), so only "May"/"MAY" count as the month
+_MONTH = "|".join(sorted(MONTHS, key=len, reverse=True)).replace("may", "(?-i:May|MAY)")
+_WEEKDAY = "|".join(WEEKDAYS)
+_ORDINAL = r"(?:st|nd|rd|th)?"
+
+# ------------- PATTERNS ------------- #
+WEEKDAY_PATTERN = re.compile(rf"\b(?:(this|next|coming)\s+)?({_WEEKDAY})\b", re.I)
+
+DATE_PATTERNS = [
+    ("iso", re.compile(r"\b(\d{4})[-/](\d{1,2})[-/](\d{1,2})\b")),
+    ("month_day", re.compile(rf"\b({_MONTH})\.?\s+(\d{{1,2}}){_ORDINAL}(?:,?\s+(\d{{4}}))?\b", re.I)),
+    ("day_month", re.compile(rf"\b(\d{{1,2}}){_ORDINAL}\s+(?:of\s+)?({_MONTH})\.?(?:,?\s+(\d{{4}}))?\b", re.I)),
+    ("relative_day", re.compile(r"\b(day after tomorrow|today|tonight|tomorrow)\b", re.I)),
+    ("in_n", re.compile(rf"\bin\s+({'|'.join(NUMBERS)}|\d+)\s+(day|week|month)s?\b", re.I)),
+    ("weekday", WEEKDAY_PATTERN),
+    ("next_period", re.compile(r"\b(?:next|following|coming)\s+(week|month)\b|\bweek after next\b", re.I)),
+    ("end_of", re.compile(r"\bend\s+of\s+(?:the\s+)?(week|month)\b", re.I)),
+]
+
+TIME_PATTERNS = [
+    ("ampm", re.compile(r"(?<![:.\d])\b(1[0-2]|0?[1-9])(?:[:.]([0-5]\d))?\s*([ap])\.?m\.?(?![a-z])", re.I)),
+    # "10.30" is only a time after "at" ("at 10.30"); otherwise it is a decimal ("grew 1.25 percent")
+    ("hhmm", re.compile(r"(?<![:.\d])\b([01]?\d|2[0-3]):([0-5]\d)\b(?![:.]\d|\s*[ap]\.?m|\s*(?:%|percent))", re.I)),
+    ("at_hhmm", re.compile(r"\bat\s+([01]?\d|2[0-3])\.([0-5]\d)\b(?![.]\d|\s*[ap]\.?m|\s*(?:%|percent))", re.I)),
+    ("named", re.compile(r"\b(noon|midday|midnight|eod|end of (?:the )?day|morning|afternoon|evening|tonight)\b", re.I)),
+    ("at_hour", re.compile(r"\bat\s+(\d{1,2})\b(?![:.]\d|\s*[ap]\.?m|\s*(?:%|percent))", re.I)),
+]
+
+NAMED_TIMES = {
+    "noon": (12, 0), "midday": (12, 0), "midnight": (0, 0), "eod": (17, 0), "end of day": (17, 0),
+    "end of the day": (17, 0), "morning": (9, 0), "afternoon": (14, 0), "evening": (18, 0), "tonight": (19, 0),
+}
+
+
+def _add_months(date, months):
+    month = date.month - 1 + months
+    year = date.year + month // 12
+    month = month % 12 + 1
+    return date.replace(year=year, month=month, day=min(date.day, calendar.monthrange(year, month)[1]))
+
+
+def _upcoming(date, today):
+    """Dates given without a year mean the next time that day comes round."""
+    return date if date >= today else date.replace(year=date.year + 1)
+
+
+def _resolve_date(kind, match, today, next_week_mentioned):
+    if kind == "iso":
+        return datetime.date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+    if kind in ("month_day", "day_month"):
+        month_text, day_text = (match.group(1), match.group(2)) if kind == "month_day" else (match.group(2), match.group(1))
+        year = match.group(3)
+        date = datetime.date(int(year) if year else today.year, MONTHS[month_text.lower()], int(day_text))
+        return date if year else _upcoming(date, today)
+    if kind == "relative_day":
+        word = match.group(1).lower()
+        return today + datetime.timedelta(days={"today": 0, "tonight": 0, "tomorrow": 1}.get(word, 2))
+    if kind == "in_n":
+        amount = match.group(1).lower()
+        amount = NUMBERS.get(amount) or int(amount)
+        unit = match.group(2).lower()
+        if unit == "month":
+            return _add_months(today, amount)
+        return today + datetime.timedelta(days=amount * (7 if unit == "week" else 1))
+    if kind == "weekday":
+        qualifier = (match.group(1) or "").lower()
+        target = WEEKDAYS[match.group(2).lower()]
+        if qualifier == "next" or (not qualifier and next_week_mentioned):
+            # The given weekday in the week after this one
+            monday = today - datetime.timedelta(days=today.weekday()) + datetime.timedelta(weeks=1)
+            return monday + datetime.timedelta(days=target)
+        ahead = (target - today.weekday()) % 7
+        if ahead == 0 and qualifier != "this":
+            ahead = 7
+        return today + datetime.timedelta(days=ahead)
+    if kind == "next_period":
+        if match.group(0).lower().startswith("week after"):
+            return today + datetime.timedelta(weeks=2)
+        if match.group(1).lower() == "month":
+            return _add_months(today, 1)
+        return today + datetime.timedelta(weeks=1)
+    if kind == "end_of":
+        if match.group(1).lower() == "month":
+            return today.replace(day=calendar.monthrange(today.year, today.month)[1])
+        return today + datetime.timedelta(days=(4 - today.weekday()) % 7)  # Friday
+    raise ValueError(kind)
+
+
+def _resolve_time(kind, match):
+    if kind == "ampm":
+        hour, minute = int(match.group(1)) % 12, int(match.group(2) or 0)
+        if match.group(3).lower() == "p":
+            hour += 12
+        return datetime.time(hour, minute)
+    if kind in ("hhmm", "at_hhmm"):
+        return datetime.time(int(match.group(1)), int(match.group(2)))
+    if kind == "named":
+        return datetime.time(*NAMED_TIMES[re.sub(r"\s+", " ", match.group(1).lower())])
+    if kind == "at_hour":
+        hour = int(match.group(1))
+        if hour > 23:
+            return None
+        # "at 3" in a meeting means the afternoon, not 3 in the morning
+        return datetime.time(hour + 12 if 1 <= hour < 8 else hour, 0)
+    raise ValueError(kind)
+
+
+def _earliest(patterns, text):
+    best = None
+    for kind, pattern in patterns:
+        match = pattern.search(text)
+        if match and (best is None or match.start() < best[1].start()):
+            best = (kind, match)
+    return best
+
+
+# ------------- PUBLIC API ------------- #
+def reference_now(tz=DEFAULT_TIMEZONE):
+    return datetime.datetime.now(ZoneInfo(tz))
+
+
+def find_datetime(text, reference=None, tz=DEFAULT_TIMEZONE, default_time=DEFAULT_TIME):
+    """Resolves the first date (and time) expression in `text`.
+
+    Handles ISO and written dates, relative phrases ("tomorrow", "next week",
+    "in 3 days", "end of the month") and weekdays ("Thursday", "next
+    Monday"), anchored on `reference` (default: now in `tz`). Returns a
+    timezone-aware datetime, or None when the text contains no date.
+    """
+    zone = ZoneInfo(tz)
+    reference = reference or reference_now(tz)
+    if reference.tzinfo is None:
+        reference = reference.replace(tzinfo=zone)
+    today = reference.astimezone(zone).date()
+
+    date_hit = _earliest(DATE_PATTERNS, text)
+    if date_hit is None:
+        return None
+    next_week_mentioned = bool(re.search(r"\bnext week\b", text, re.I))
+    if date_hit[0] == "next_period" and next_week_mentioned:
+        # "next week on Thursday": the weekday pins the day within that week
+        weekday_match = WEEKDAY_PATTERN.search(text)
+        if weekday_match:
+            date_hit = ("weekday", weekday_match)
+    try:
+        date = _resolve_date(date_hit[0], date_hit[1], today, next_week_mentioned)
+    except (ValueError, OverflowError):
+        return None  # e.g. "February 30", "in 99999999 days"
+
+    time_hit = _earliest(TIME_PATTERNS, text)
+    try:
+        event_time = _resolve_time(*time_hit) if time_hit else None
+    except ValueError:
+        event_time = None  # e.g. "15pm"; keep the date
+    return datetime.datetime.combine(date, event_time or default_time, tzinfo=zone)
+
+
+def parse_event_datetime(date_str, time_str, reference=None, tz=DEFAULT_TIMEZONE):
+    """Drop-in for the old two-format strptime helper; accepts any phrase find_datetime does."""
+    time_str = re.sub(r"\s+", " ", time_str.strip())
+    resolved = find_datetime(f"{date_str.strip()} {time_str}", reference, tz)
+    if resolved is None:
+        raise ValueError(f"Unrecognized date/time format: {date_str} {time_str}")
+    return resolved
+
+
+# ------------- EVENT EXTRACTION ------------- #
+MEETING_CUE = re.compile(
+    r"\b(follow[- ]?up|meet(?:ing)?|sync|call|catch[- ]up|check[- ]in|review session|demo|standup|stand-up|workshop)\b",
+    re.I,
+)
+# The sentence has to plan something, not describe a meeting that is happening or already happened
+FORWARD_CUE = re.compile(
+    r"\b(let'?s|we'?ll|i'?ll|will|shall|going to|gonna|plan(?:ning)? to|schedule|set up|book|reconvene|again"
+    r"|follow[- ]?up|next|tomorrow|should|need to|(?:can|could) we|how about|see you)\b",
+    re.I,
+)
+NOT_FORWARD = re.compile(
+    r"\b(?:today'?s|this|last|previous|yesterday'?s?)\s+(?:meeting|call|sync|session|catch[- ]up|check[- ]in|demo|standup)\b"
+    r"|\b(?:was|were|had|did|met|joined|held|went|discussed|yesterday|last\s+(?:week|time|month))\b",
+    re.I,
+)
+# A break after . ! ? only when the next word is not lowercase, so "3 p.m. on Thursday" stays whole
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+(?![a-z])|\n+")
+CUE_TITLES = {"call": "Follow-up Call", "sync": "Sync", "catch-up": "Catch-up", "check-in": "Check-in",
+              "review session": "Review Session", "demo": "Demo", "standup": "Standup", "workshop": "Workshop"}
+
+
+def _title(cue):
+    cue = re.sub(r"[- ]+", "-", cue.lower()).replace("review-session", "review session").replace("stand-up", "standup")
+    return CUE_TITLES.get(cue, "Follow-up Meeting")
+
+
+def extract_events(transcript, reference=None, tz=DEFAULT_TIMEZONE):
+    """Finds follow-up meetings whose date resolves locally.
+
+    A sentence counts when it mentions a meeting cue and a date expression,
+    looks ahead ("let's", "we'll", "next ...") and is not about the current
+    or a past meeting. Returns dicts with title, start (aware datetime),
+    description and timed (whether the sentence gave a time).
+    """
+    events = []
+    seen = set()
+    for sentence in _SENTENCE_BREAK.split(transcript):
+        sentence = sentence.strip()
+        cue = MEETING_CUE.search(sentence)
+        if not cue or not FORWARD_CUE.search(sentence) or NOT_FORWARD.search(sentence):
+            continue
+        start = find_datetime(sentence, reference, tz)
+        if start is None or start in seen:
+            continue
+        seen.add(start)
+        events.append({"title": _title(cue.group(1)), "start": start, "description": sentence,
+                       "timed": _earliest(TIME_PATTERNS, sentence) is not None})
+    return events
+
+
+def pick_event(events):
+    """The follow-up to schedule, or None when no candidate clearly wins.
+
+    Sentences that say "follow up" and give a time rank first; a tie at the
+    top is left to the calendar LLM rather than guessed.
+    """
+    if not events:
+        return None
+    rank = lambda event: (event["title"] == "Follow-up Meeting" or event["title"] == "Follow-up Call", event["timed"])
+    ranked = sorted(events, key=rank, reverse=True)
+    if len(ranked) > 1 and rank(ranked[0]) == rank(ranked[1]):
+        return None
+    return ranked[0]
+
+
+def format_event(event):
+    """Renders an event in the Title/Date/Time/Description block the calendar prompts produce."""
+    return (
+        f"Title: {event['title']}\n"
+        f"Date: {event['start'].strftime('%Y-%m-%d')}\n"
+        f"Time: {event['start'].strftime('%H:%M')}\n"
+        f"Description: {event['description']}"
+    )
@@ -0,0 +1,167 @@
+"""Persistent result cache for deterministic agent tools.
+
+    @cached_tool(config=LLM_CONFIG)
+    def summarize_meeting(transcript: str) -> str: ...
+
+The key hashes the tool name, the argument values (or, for `file_args`,
+the contents of the named files) and the model config, so an identical
+transcript summarized by the same model is served from disk on every
+later call and in every later run. Results live in a sqlite file with
+least-recently-used eviction past `max_entries` / `max_bytes`.
+
+Only pure computations should be decorated. A hit skips the function
+entirely, so tools with side effects (uploads, calendar writes, setting
+globals) must stay undecorated. Put everything else that shapes the result,
+such as the prompt template, into `config`. Exceptions are never cached.
+
+Environment: TOOL_CACHE_PATH (default tool_cache.sqlite),
+TOOL_CACHE_MAX_ENTRIES, TOOL_CACHE_MAX_MB, TOOL_CACHE=off to bypass.
+"""
+import functools
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    tool TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL
+)
+"""
+
+
+class ToolCache:
+    def __init__(self, path="tool_cache.sqlite", max_entries=1000, max_bytes=64 * 1024 * 1024):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(SCHEMA)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+        self._conn.commit()
+
+    def get(self, key):
+        """Returns (True, value) on a hit and (False, None) on a miss."""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return False, None
+            self._conn.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            self.hits += 1
+        return True, pickle.loads(row[0])
+
+    def set(self, key, tool, value):
+        blob = pickle.dumps(value)
+        if len(blob) > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, tool, value, size, created, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, tool, blob, len(blob), now, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        # Drop least recently used rows until both limits hold
+        for key, size in self._conn.execute("SELECT key, size FROM results ORDER BY last_used").fetchall():
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+            count -= 1
+            total -= size
+
+    def clear(self, tool=None):
+        with self._lock:
+            if tool is None:
+                self._conn.execute("DELETE FROM results")
+            else:
+                self._conn.execute("DELETE FROM results WHERE tool = ?", (tool,))
+            self._conn.commit()
+
+    def stats(self):
+        with self._lock:
+            count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        return {"entries": count, "bytes": total, "hits": self.hits, "misses": self.misses}
+
+
+@functools.lru_cache(maxsize=None)
+def get_tool_cache():
+    return ToolCache(
+        path=os.getenv("TOOL_CACHE_PATH", "tool_cache.sqlite"),
+        max_entries=int(os.getenv("TOOL_CACHE_MAX_ENTRIES", "1000")),
+        max_bytes=int(float(os.getenv("TOOL_CACHE_MAX_MB", "64")) * 1024 * 1024),
+    )
+
+
+def _file_digest(path):
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    except OSError:
+        return None  # Let the tool itself report the missing file
+    return digest.hexdigest()
+
+
+def cache_key(tool, arguments, config=None):
+    payload = json.dumps({"tool": tool, "args": arguments, "config": config}, sort_keys=True, default=repr)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def cached_tool(config=None, name=None, file_args=(), cache=None):
+    """Caches a tool's return value by name, argument content and model `config`.
+
+    `file_args` names path arguments whose file contents, not paths, go in
+    the key.
+    """
+    def decorator(func):
+        tool_name = name or func.__name__
+        signature = inspect.signature(func)
+        missing = set(file_args) - set(signature.parameters)
+        if missing:
+            raise ValueError(f"{tool_name} has no arguments {sorted(missing)}")
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if os.getenv("TOOL_CACHE", "on").lower() == "off":
+                return func(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            for arg in file_args:
+                digest = _file_digest(arguments[arg])
+                if digest is None:
+                    return func(*args, **kwargs)
+                arguments[arg] = {"sha256": digest}
+
+            store = cache or get_tool_cache()
+            key = cache_key(tool_name, arguments, config)
+            hit, value = store.get(key)
+            if hit:
+                return value
+            value = func(*args, **kwargs)
+            store.set(key, tool_name, value)
+            return value
+
+        return wrapper
+
+    return decorator
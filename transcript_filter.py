@@ -0,0 +1,233 @@
+import os
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from rate_limiter import estimate_tokens
+
+# ------------- PATTERNS ------------- #
+_MONTH = r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)"
+# Full names only: "sat", "sun" and "wed" are too common as ordinary words
+_WEEKDAY = r"(?:(?:mon|tues|wednes|thurs|fri|satur|sun)day|tues|thurs)"
+
+PATTERNS = {
+    "date": (
+        r"\b\d{4}-\d{1,2}-\d{1,2}\b"
+        r"|\b\d{1,2}/\d{1,2}(?:/\d{2,4})?\b"
+        rf"|\b{_MONTH}\.?\s+\d{{1,2}}(?:st|nd|rd|th)?\b"
+        rf"|\b\d{{1,2}}(?:st|nd|rd|th)?\s+(?:of\s+)?{_MONTH}\b"
+    ),
+    "time": (
+        r"\b\d{1,2}(?::\d{2})?\s*(?:[ap]\.?m\.?)(?![a-z])"
+        r"|\b\d{1,2}:\d{2}\b"
+        r"|\b(?:noon|midnight|eod|end of (?:the )?day)\b"
+    ),
+    "weekday": rf"\b{_WEEKDAY}\b",
+    "relative": (
+        r"\b(?:today|tomorrow|tonight|yesterday)\b"
+        r"|\b(?:next|this|coming|following)\s+(?:week|month|quarter|sprint|year|" + _WEEKDAY + r")\b"
+        r"|\bin\s+(?:a|an|one|two|three|\d+)\s+(?:days?|weeks?|months?)\b"
+        r"|\b(?:end|beginning|start)\s+of\s+(?:the\s+)?(?:week|month|quarter)\b"
+        r"|\bfollow[- ]?up\b|\bdeadline\b|\bdue\b|\breschedul\w*|\bschedul\w*"
+    ),
+    "assignment": (
+        r"\baction items?\b|\bassign(?:ed|ing)?\s+to\b|\bowner\b|\bresponsible\b|\bto-?do\b"
+        r"|\b(?:will|to)\s+(?:review|send|draft|prepare|finish|share|update|write|design|follow|check|deliver|present)\b"
+        r"|\bby\s+(?:then|eod|" + _WEEKDAY + r"|tomorrow|next|the\s+end|end|" + _MONTH + r"|\d)"
+    ),
+}
+
+# One alternation with a named group per category, so each hit reports
+# which kind of reference it is.
+RELEVANCE_RE = re.compile(
+    "|".join(f"(?P<{name}>{pattern})" for name, pattern in PATTERNS.items()),
+    re.IGNORECASE,
+)
+
+# Leading "[00:01:23]", "00:01:23.456 -->", "(01:23)" timestamps and "Speaker 2:" / "Alice:" labels
+PREFIX_RE = re.compile(
+    r"[ \t]*(?P<stamp>[\[(]?\d{1,2}(?::\d{2}){1,2}(?:[.,]\d{1,3})?[\])]?(?:[ \t]*-->[^\n]*?\d{2}(?:[.,]\d{1,3})?)?)?"
+    r"[ \t]*(?:-[ \t]*)?(?P<speaker>[A-Z][\w.'-]*(?: [\w.'-]+){0,3}:(?=[ \t]))?"
+)
+
+_VERBS = ("review", "send", "draft", "prepare", "finish", "share", "update", "write", "design", "follow",
+          "check", "deliver", "present")
+_BY_OBJECTS = ("then", "eod", "mon", "tue", "wed", "thu", "fri", "sat", "sun", "tomorrow", "next", "the end", "end",
+               "jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec", "0")
+_PERIOD_BEFORE = ("next ", "this ", "coming ", "following ", "of ", "of the ", " a ", " an ", "one ", "two ", "three ",
+                  "0 ")
+
+# Searched in the folded text (ASCII lowercased, every digit turned into "0"),
+# so ten digit anchors collapse into one. Every pattern above contains at
+# least one anchor. str.find scans for each at C speed, and the much slower
+# alternation only runs on the few lines that contain one. Common words are
+# only anchors next to what the pattern needs around them, which a C-level
+# startswith/endswith(tuple) checks before a line becomes a candidate:
+# (anchor, one of these must follow, one of these must precede).
+ANCHORS = (
+    ("0", None, None), ("day", None, None), ("tues", None, None), ("thurs", None, None),
+    ("night", None, None), ("noon", None, None), ("eod", None, None),
+    ("follow", None, None), ("deadline", None, None), ("due", None, None), ("schedul", None, None),
+    ("action item", None, None), ("assign", None, None), ("owner", None, None), ("responsib", None, None),
+    ("to", ("morrow", "night", "do", "-do") + tuple(" " + verb for verb in _VERBS), None),
+    ("will ", _VERBS, None), ("by ", _BY_OBJECTS, None),
+    ("week", None, _PERIOD_BEFORE), ("month", None, _PERIOD_BEFORE), ("quarter", None, _PERIOD_BEFORE),
+    ("sprint", None, _PERIOD_BEFORE), ("year", None, _PERIOD_BEFORE),
+)
+
+_FOLD = str.maketrans(
+    {**{chr(c): chr(c + 32) for c in range(ord("A"), ord("Z") + 1)}, **{str(d): "0" for d in range(10)}, "\r": " ", "\t": " "}
+)
+PARALLEL_MIN_CHARS = 16 * 1024 * 1024
+
+
+def _fold(text):
+    # One pass; every mapping is one character, so positions match the original
+    return text.translate(_FOLD)
+
+
+def _blank_prefix_columns(transcript, folded, sample_lines=400):
+    """Blanks timestamp/speaker prefixes that start most lines, so they cannot be anchor hits.
+
+    After folding, every "[00:01:23]" is the same literal, so one
+    position-preserving str.replace per prefix shape clears the whole column.
+    """
+    sample = transcript[:200 * sample_lines].split("\n")[:sample_lines]
+    if not sample:
+        return folded
+    shapes = Counter()
+    for line in sample:
+        match = PREFIX_RE.match(line)
+        if match.group("stamp") or match.group("speaker"):
+            shapes[_fold(line[:match.end()])] += 1
+    for shape, count in shapes.items():
+        # Only shapes that recur as a column, and only if they could hit an anchor
+        if count < max(3, len(sample) // 20) or not any(anchor in shape for anchor, _, _ in ANCHORS):
+            continue
+        blank = " " * len(shape)
+        folded = folded.replace("\n" + shape, "\n" + blank)
+        if folded.startswith(shape):
+            folded = blank + folded[len(shape):]
+    return folded
+
+
+def _candidate_lines(transcript):
+    """Returns the start of every line that contains an anchor, in order."""
+    folded = _blank_prefix_columns(transcript, _fold(transcript))
+    starts = set()
+    for anchor, after, before in ANCHORS:
+        position = folded.find(anchor)
+        while position != -1:
+            if (after is None or folded.startswith(after, position + len(anchor))) and (
+                    before is None or folded.endswith(before, 0, position)):
+                starts.add(folded.rfind("\n", 0, position) + 1)
+                # The rest of the line is a candidate already
+                position = folded.find("\n", position)
+                if position == -1:
+                    break
+            position = folded.find(anchor, position + 1)
+    return sorted(starts)
+
+
+def find_hits(transcript, offset=0):
+    """Returns (start, end, category) for every reference outside the line prefixes."""
+    hits = []
+    for line_start in _candidate_lines(transcript):
+        line_end = transcript.find("\n", line_start)
+        line_end = len(transcript) if line_end == -1 else line_end
+        prefix = PREFIX_RE.match(transcript, line_start, line_end)
+        body_start = prefix.end()
+        # "Monday:" or "Deadline:" opening a line is content, not a speaker
+        if prefix.group("speaker") and RELEVANCE_RE.search(prefix.group("speaker")):
+            body_start = prefix.start("speaker")
+        for match in RELEVANCE_RE.finditer(transcript, body_start, line_end):
+            hits.append((offset + match.start(), offset + match.end(), match.lastgroup))
+    return hits
+
+
+def _find_hits_parallel(transcript, workers):
+    """Splits at line boundaries and scans the pieces in a process pool."""
+    size = -(-len(transcript) // (workers * 4))
+    pieces, start = [], 0
+    while start < len(transcript):
+        end = transcript.find("\n", start + size)
+        end = len(transcript) if end == -1 else end + 1
+        pieces.append((start, end))
+        start = end
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(find_hits, [transcript[s:e] for s, e in pieces], [s for s, _ in pieces])
+        return [hit for hits in results for hit in hits]
+
+
+# ------------- WINDOWS ------------- #
+def find_windows(transcript, context_lines=1, workers=None):
+    """Returns merged (start, end) character spans around every relevant hit.
+
+    Each span covers the matching line plus `context_lines` lines on either
+    side. Hits are counted per category in the returned dict. Leading
+    timestamps and speaker labels are ignored. Transcripts over
+    PARALLEL_MIN_CHARS are scanned in `workers` processes (default: all cores).
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(transcript) >= PARALLEL_MIN_CHARS:
+        hits = _find_hits_parallel(transcript, workers)
+    else:
+        hits = find_hits(transcript)
+    spans = []
+    counts = dict.fromkeys(PATTERNS, 0)
+    covered_until = -1
+    for position, match_end, category in hits:
+        counts[category] += 1
+        if position < covered_until:
+            continue
+        start = transcript.rfind("\n", 0, position) + 1
+        for _ in range(context_lines):
+            if start == 0:
+                break
+            start = transcript.rfind("\n", 0, start - 1) + 1
+        end = transcript.find("\n", match_end)
+        for _ in range(context_lines):
+            if end == -1:
+                break
+            end = transcript.find("\n", end + 1)
+        end = len(transcript) if end == -1 else end
+        if spans and start <= spans[-1][1] + 1:
+            spans[-1] = (spans[-1][0], end)
+        else:
+            spans.append((start, end))
+        covered_until = end
+    return spans, counts
+
+
+class FilterReport:
+    def __init__(self, transcript, kept, spans, counts):
+        self.original_chars = len(transcript)
+        self.kept_chars = len(kept)
+        self.windows = len(spans)
+        self.counts = counts
+        self.original_tokens = estimate_tokens(transcript)
+        self.kept_tokens = estimate_tokens(kept) if kept else 0
+
+    @property
+    def token_reduction(self):
+        if not self.original_tokens:
+            return 0.0
+        return 1 - self.kept_tokens / self.original_tokens
+
+    def __str__(self):
+        hits = ", ".join(f"{name}={count}" for name, count in self.counts.items())
+        return (
+            f"Kept {self.windows} windows, {self.kept_tokens}/{self.original_tokens} prompt tokens "
+            f"({self.token_reduction:.0%} reduction); hits: {hits}"
+        )
+
+
+def extract_relevant(transcript, context_lines=1, separator="\n...\n", workers=None):
+    """Keeps only the windows around dates, times and assignments.
+
+    Returns the reduced transcript and a FilterReport with the hit counts and
+    the prompt-token reduction.
+    """
+    spans, counts = find_windows(transcript, context_lines, workers)
+    kept = separator.join(transcript[start:end] for start, end in spans)
+    return kept, FilterReport(transcript, kept, spans, counts)
@@ -1,43 +1,69 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.prompts import PromptTemplate
-from langchain_core.runnables import RunnableLambda, RunnableSequence
+from functools import lru_cache
 from dotenv import load_dotenv
+import argparse
 import os
 
+from batch_runner import add_batch_arguments, run_from_args
+
 load_dotenv()
-os.environ["GOOGLE_API_KEY"] = os.getenv("GOOGLE_API_KEY")
 
-llm = ChatGoogleGenerativeAI(
-    model="gemini-2.0-pro-exp",
-    temperature=0.5
-)
+@lru_cache(maxsize=None)
+def get_llm():
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    os.environ["GOOGLE_API_KEY"] = os.getenv("GOOGLE_API_KEY")
+    return ChatGoogleGenerativeAI(
+        model="gemini-2.0-pro-exp",
+        temperature=0.5
+    )
+
+@lru_cache(maxsize=None)
+def build_chain(batch=False):
+    from langchain_core.prompts import PromptTemplate
+    from langchain_core.runnables import RunnableLambda, RunnableSequence
+
+    from rate_limiter import BATCH, INTERACTIVE, RateLimitedChatModel
+
+    # Every call goes through the shared per-provider rate-limit scheduler
+    llm = RateLimitedChatModel(get_llm(), "gemini", priority=BATCH if batch else INTERACTIVE).as_runnable()
+
+    fun_fact_prompt = PromptTemplate(
+        input_variables=["weather"],
+        template="Tell me a fun and surprising fact about the weather today: {weather}."
+    )
 
-fun_fact_prompt = PromptTemplate(
-    input_variables=["weather"],
-    template="Tell me a fun and surprising fact about the weather today: {weather}."
-)
+    story_prompt = PromptTemplate(
+        input_variables=["fact"],
+        template="Write a historical story based on this fact: {fact}"
+    )
 
-story_prompt = PromptTemplate(
-    input_variables=["fact"],
-    template="Write a historical story based on this fact: {fact}"
-)
+    tweet_prompt = PromptTemplate(
+        input_variables=["story"],
+        template="Turn the following story into a fun, concise tweet:\n\n{story}"
+    )
 
-tweet_prompt = PromptTemplate(
-    input_variables=["story"],
-    template="Turn the following story into a fun, concise tweet:\n\n{story}"
-)
+    step_1 = fun_fact_prompt | llm
+    step_2 = RunnableLambda(lambda output: {"fact": output.content.strip()}) | story_prompt | llm
+    step_3 = RunnableLambda(lambda output: {"story": output.content.strip()}) | tweet_prompt | llm
 
-step_1 = fun_fact_prompt | llm
-step_2 = RunnableLambda(lambda output: {"fact": output.content.strip()}) | story_prompt | llm
-step_3 = RunnableLambda(lambda output: {"story": output.content.strip()}) | tweet_prompt | llm
+    return RunnableSequence(
+        first=step_1,
+        middle=[step_2],
+        last=step_3
+    )
 
-full_chain = RunnableSequence(
-    first=step_1,
-    middle=[step_2],
-    last=step_3
-)
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Turn a weather fact into a historical story and then a tweet.")
+    add_batch_arguments(parser)
+    parser.add_argument("--weather", default="rainy day")
+    args = parser.parse_args(argv)
 
-result = full_chain.invoke({"weather": "rainy day"})
-print(result.content)
+    if args.batch:
+        run_from_args(build_chain(batch=True), args)
+        return
 
+    full_chain = build_chain()
+    result = full_chain.invoke({"weather": args.weather})
+    print(result.content)
 
+if __name__ == "__main__":
+    main()
@@ -1,71 +1,123 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_openai import ChatOpenAI
-from langchain_anthropic import ChatAnthropic
-from langchain_core.prompts import PromptTemplate
-from langchain_core.runnables import RunnableLambda, RunnableSequence
+from functools import lru_cache
 from dotenv import load_dotenv
+import argparse
 import os
 
+from batch_runner import add_batch_arguments, run_from_args
+
 load_dotenv()
 
-llm_gemini = ChatGoogleGenerativeAI(
-    model="gemini-2.0-pro-exp",
-    temperature=0.7,
-    google_api_key=os.getenv("GOOGLE_API_KEY")
-)
+# Each provider SDK is imported only when its model is first requested
+@lru_cache(maxsize=None)
+def get_llm_gemini():
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    return ChatGoogleGenerativeAI(
+        model="gemini-2.0-pro-exp",
+        temperature=0.7,
+        google_api_key=os.getenv("GOOGLE_API_KEY")
+    )
+
+@lru_cache(maxsize=None)
+def get_llm_gpt4o_mini():
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(
+        model="gpt-4o-mini",
+        temperature=0.7,
+        api_key=os.getenv("OPENAI_API_KEY"),
+        include_response_headers=True,  # the scheduler caps its buckets at the x-ratelimit-remaining-* values
+    )
+
+@lru_cache(maxsize=None)
+def get_llm_claude():
+    from langchain_anthropic import ChatAnthropic
+    return ChatAnthropic(
+        model="claude-3.7-sonnet",
+        temperature=0.7,
+        api_key=os.getenv("ANTHROPIC_API_KEY")
+    )
+
+PROVIDERS = {
+    "gemini": get_llm_gemini,
+    "openai": get_llm_gpt4o_mini,
+    "anthropic": get_llm_claude,
+}
 
-llm_gpt4o_mini = ChatOpenAI(
-    model="gpt-4o-mini",
-    temperature=0.7,
-    api_key=os.getenv("OPENAI_API_KEY")
-)
+def scheduled(provider, batch=False):
+    """The provider's model, gated by the shared per-provider rate-limit scheduler."""
+    from rate_limiter import BATCH, INTERACTIVE, RateLimitedChatModel
+    return RateLimitedChatModel(PROVIDERS[provider](), provider, priority=BATCH if batch else INTERACTIVE)
 
-llm_claude = ChatAnthropic(
-    model="claude-3.7-sonnet",
-    temperature=0.7,
-    api_key=os.getenv("ANTHROPIC_API_KEY")
-)
+def hedged(primary, backup, hedge_percentile, batch=False):
+    """Primary provider for a step, hedged to a backup when it runs slow or keeps failing."""
+    from hedging import HedgedChatModel
+    return HedgedChatModel(
+        [(primary, scheduled(primary, batch)), (backup, scheduled(backup, batch))],
+        hedge_percentile=hedge_percentile,
+    ).as_runnable()
 
 # Define prompt templates
-fun_fact_prompt = PromptTemplate(
-    input_variables=["weather"],
-    template="Tell me a fun and surprising fact about the weather today: {weather}."
-)
-
-story_prompt = PromptTemplate(
-    input_variables=["fact"],
-    template="Write a historical story based on this fact: {fact}"
-)
-
-tweet_prompt = PromptTemplate(
-    input_variables=["story"],
-    template="Turn the following story into a fun, concise tweet:\n\n{story}"
-)
-
-# Step 1: Generate a fun fact using Gemini
-step_1 = fun_fact_prompt | llm_gemini
-
-# Step 2: Create a story using GPT-4o Mini
-step_2 = (
-    RunnableLambda(lambda output: {"fact": output.content.strip()})
-    | story_prompt
-    | llm_gpt4o_mini
-)
-
-# Step 3: Generate a tweet using Claude
-step_3 = (
-    RunnableLambda(lambda output: {"story": output.content.strip()})
-    | tweet_prompt
-    | llm_claude
-)
-
-# Combine steps into a sequence
-full_chain = RunnableSequence(
-    first=step_1,
-    middle=[step_2],
-    last=step_3
-)
-
-# Execute the chain
-result = full_chain.invoke({"weather": "rainy day"})
-print(result.content)
+FUN_FACT_TEMPLATE = "Tell me a fun and surprising fact about the weather today: {weather}."
+STORY_TEMPLATE = "Write a historical story based on this fact: {fact}"
+TWEET_TEMPLATE = "Turn the following story into a fun, concise tweet:\n\n{story}"
+
+@lru_cache(maxsize=None)
+def build_chain(hedge=True, hedge_percentile=0.95, batch=False):
+    from langchain_core.prompts import PromptTemplate
+    from langchain_core.runnables import RunnableLambda, RunnableSequence
+
+    fun_fact_prompt = PromptTemplate(input_variables=["weather"], template=FUN_FACT_TEMPLATE)
+    story_prompt = PromptTemplate(input_variables=["fact"], template=STORY_TEMPLATE)
+    tweet_prompt = PromptTemplate(input_variables=["story"], template=TWEET_TEMPLATE)
+
+    if hedge:
+        fact_llm = hedged("gemini", "openai", hedge_percentile, batch)
+        story_llm = hedged("openai", "anthropic", hedge_percentile, batch)
+        tweet_llm = hedged("anthropic", "gemini", hedge_percentile, batch)
+    else:
+        fact_llm, story_llm, tweet_llm = (
+            scheduled(provider, batch).as_runnable() for provider in ("gemini", "openai", "anthropic")
+        )
+
+    # Step 1: Generate a fun fact using Gemini
+    step_1 = fun_fact_prompt | fact_llm
+
+    # Step 2: Create a story using GPT-4o Mini
+    step_2 = (
+        RunnableLambda(lambda output: {"fact": output.content.strip()})
+        | story_prompt
+        | story_llm
+    )
+
+    # Step 3: Generate a tweet using Claude
+    step_3 = (
+        RunnableLambda(lambda output: {"story": output.content.strip()})
+        | tweet_prompt
+        | tweet_llm
+    )
+
+    # Combine steps into a sequence
+    return RunnableSequence(
+        first=step_1,
+        middle=[step_2],
+        last=step_3
+    )
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fact -> story -> tweet chain spread across Gemini, GPT-4o Mini and Claude.")
+    add_batch_arguments(parser)
+    parser.add_argument("--weather", default="rainy day")
+    parser.add_argument("--no-hedge", action="store_true", help="Pin each step to its single provider.")
+    parser.add_argument("--hedge-percentile", type=float, default=0.95,
+                        help="Latency percentile of the primary after which the backup is also asked.")
+    args = parser.parse_args(argv)
+
+    if args.batch:
+        run_from_args(build_chain(not args.no_hedge, args.hedge_percentile, batch=True), args)
+        return
+
+    # Execute the chain
+    result = build_chain(not args.no_hedge, args.hedge_percentile).invoke({"weather": args.weather})
+    print(result.content)
+
+if __name__ == "__main__":
+    main()
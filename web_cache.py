@@ -0,0 +1,187 @@
+"""Conditional-GET disk cache for web ingestion.
+
+CachedWebLoader is a drop-in for WebBaseLoader(urls).load(). For every URL
+it keeps the raw body, the parsed text and the validators (ETag,
+Last-Modified) under `cache_dir`. Later runs send If-None-Match /
+If-Modified-Since. On a 304 the stored text is reused without downloading
+or parsing, and `changed` stays False, so callers can skip re-embedding.
+With offline=True the network is never touched.
+
+    loader = CachedWebLoader(WEB_URLS)
+    docs = loader.load()
+    print(loader.stats)
+"""
+import datetime
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+
+DEFAULT_CACHE_DIR = ".web_cache"
+USER_AGENT = "langchain-notebook-web-cache/1.0"
+
+
+class _TextExtractor(HTMLParser):
+    """Stdlib fallback for BeautifulSoup(...).get_text() when bs4 is not installed."""
+
+    SKIP = {"script", "style", "noscript", "template"}
+
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+        self.title = ""
+        self._skipping = 0
+        self._in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP:
+            self._skipping += 1
+        elif tag == "title":
+            self._in_title = True
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP and self._skipping:
+            self._skipping -= 1
+        elif tag == "title":
+            self._in_title = False
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+        if not self._skipping:
+            self.parts.append(data)
+
+
+def html_to_text(html):
+    """Returns (text, title) the way WebBaseLoader extracts them."""
+    try:
+        from bs4 import BeautifulSoup
+    except ImportError:
+        parser = _TextExtractor()
+        parser.feed(html)
+        return "".join(parser.parts), parser.title.strip()
+    soup = BeautifulSoup(html, "html.parser")
+    title = soup.title.get_text().strip() if soup.title else ""
+    return soup.get_text(), title
+
+
+@dataclass
+class FetchResult:
+    url: str
+    text: str
+    title: str
+    status: str  # "fetched", "not_modified" or "offline"
+    bytes_downloaded: int = 0
+
+    @property
+    def changed(self):
+        return self.status == "fetched"
+
+
+@dataclass
+class CacheStats:
+    fetched: int = 0
+    not_modified: int = 0
+    offline: int = 0
+    bytes_downloaded: int = 0
+    results: list = field(default_factory=list)
+
+    def __str__(self):
+        return (
+            f"{self.fetched} fetched, {self.not_modified} not modified, {self.offline} served offline, "
+            f"{self.bytes_downloaded / 1024:.1f} KiB downloaded"
+        )
+
+
+class CachedWebLoader:
+    def __init__(self, urls, cache_dir=DEFAULT_CACHE_DIR, offline=False, timeout=30, session=None):
+        self.urls = [urls] if isinstance(urls, str) else list(urls)
+        self.cache_dir = cache_dir
+        self.offline = offline
+        self.timeout = timeout
+        self._session = session
+        self.stats = CacheStats()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @property
+    def session(self):
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+            self._session.headers["User-Agent"] = USER_AGENT
+        return self._session
+
+    def _paths(self, url):
+        stem = os.path.join(self.cache_dir, hashlib.sha256(url.encode("utf-8")).hexdigest()[:32])
+        return stem + ".json", stem + ".html", stem + ".txt"
+
+    def _read_cached(self, url):
+        meta_path, _, text_path = self._paths(url)
+        if not (os.path.exists(meta_path) and os.path.exists(text_path)):
+            return None, None
+        with open(meta_path, "r") as f:
+            meta = json.load(f)
+        with open(text_path, "r", encoding="utf-8") as f:
+            return meta, f.read()
+
+    def _write(self, path, content, mode="w"):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, mode, **({} if "b" in mode else {"encoding": "utf-8"})) as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    def fetch(self, url):
+        meta, text = self._read_cached(url)
+        if self.offline:
+            if meta is None:
+                raise FileNotFoundError(f"{url} is not in the web cache and offline mode is on")
+            return self._record(FetchResult(url, text, meta.get("title", ""), "offline"))
+
+        headers = {}
+        if meta:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+
+        if response.status_code == 304 and meta is not None:
+            meta["validated_at"] = datetime.datetime.now(datetime.timezone.utc).isoformat()
+            self._write(self._paths(url)[0], json.dumps(meta, indent=2))
+            return self._record(FetchResult(url, text, meta.get("title", ""), "not_modified"))
+        response.raise_for_status()
+
+        body = response.content
+        text, title = html_to_text(response.text)
+        meta_path, body_path, text_path = self._paths(url)
+        self._write(body_path, body, "wb")
+        self._write(text_path, text)
+        now = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        self._write(meta_path, json.dumps({
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "title": title,
+            "text_sha256": hashlib.sha256(text.encode("utf-8")).hexdigest(),
+            "fetched_at": now,
+            "validated_at": now,
+        }, indent=2))
+        return self._record(FetchResult(url, text, title, "fetched", len(body)))
+
+    def _record(self, result):
+        setattr(self.stats, result.status, getattr(self.stats, result.status) + 1)
+        self.stats.bytes_downloaded += result.bytes_downloaded
+        self.stats.results.append(result)
+        return result
+
+    def fetch_all(self):
+        return [self.fetch(url) for url in self.urls]
+
+    def load(self):
+        from langchain_core.documents import Document
+
+        return [
+            Document(page_content=result.text, metadata={"source": result.url, "title": result.title})
+            for result in self.fetch_all()
+        ]